@@ -0,0 +1,110 @@
+import argparse
+import random
+import time
+
+from game_cards import CardRenderer
+
+
+def render_team_panel_fstring(team):
+    return f"""
+        <div style='background: linear-gradient(135deg, {team['colors'][0]}, {team['colors'][1]}); border-radius: 10px; padding: 10px;'>
+            <h3>{team['name']}</h3>
+            <img src="{team['logo']}" width="100" />
+            <p style='font-size: 36px; margin: 10px 0;'>{team['score']}</p>
+        </div>
+    """
+
+
+def render_mlb_fstring(info):
+    first = 'active' if info.get('onFirst') else ''
+    second = 'active' if info.get('onSecond') else ''
+    third = 'active' if info.get('onThird') else ''
+    return f"""
+        <div class='info-box'>
+            ⚾ <strong>Inning:</strong> {info.get('inning', '')}<br/>
+            🧢 <strong>At Bat:</strong> {info.get('at_bat', 'N/A')}<br/>
+            🥎 <strong>Pitcher:</strong> {info.get('pitcher', 'N/A')}<br/>
+            🎯 <strong>Count:</strong> {info.get('balls', 0)} Balls, {info.get('strikes', 0)} Strikes
+            <div class='diamond'>
+                <div class='base second {second}'></div>
+                <div class='base third {third}'></div>
+                <div class='base first {first}'></div>
+                <div class='base mound'></div>
+            </div>
+        </div>
+    """
+
+
+def rerun_fstring(games):
+    # the previous tab loop: three markdown elements (plus a columns container) per game
+    elements = []
+    for game in games:
+        elements.append(render_team_panel_fstring(game["away_team"]))
+        elements.append(render_mlb_fstring(game["info"]))
+        elements.append(render_team_panel_fstring(game["home_team"]))
+    return elements
+
+
+def team(rng, i):
+    return {
+        "name": f"Team {i:02d}",
+        "score": str(rng.randint(0, 9)),
+        "colors": ["#123456", "#abcdef"],
+        "logo": f"https://a.espncdn.com/i/teamlogos/mlb/500/t{i:02d}.png",
+    }
+
+
+def mlb_slate(n_games, seed=5):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(400000 + i),
+            "sport": "mlb",
+            "away_team": team(rng, 2 * i),
+            "home_team": team(rng, 2 * i + 1),
+            "info": {
+                "inning": f"Top {rng.randint(1, 9)}th", "at_bat": "Batter", "pitcher": "Pitcher",
+                "onFirst": False, "onSecond": True, "onThird": False, "balls": 1, "strikes": 2,
+            },
+        }
+        for i in range(n_games)
+    ]
+
+
+def tick(games, rng, changed):
+    # between two polls only a few games actually change
+    for game in rng.sample(games, changed):
+        game["info"] = dict(game["info"], balls=rng.randint(0, 3), strikes=rng.randint(0, 2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark game card rendering per rerun")
+    parser.add_argument("--games", type=int, default=15)
+    parser.add_argument("--reruns", type=int, default=2000)
+    parser.add_argument("--changed", type=int, default=3, help="games that change between reruns")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    games = mlb_slate(args.games)
+    renderer = CardRenderer()
+
+    start = time.perf_counter()
+    for _ in range(args.reruns):
+        tick(games, rng, args.changed)
+        old = rerun_fstring(games)
+    old_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.reruns):
+        tick(games, rng, args.changed)
+        new = renderer.league_block("MLB", games)
+    new_seconds = time.perf_counter() - start
+
+    print(f"{args.games} MLB games, {args.changed} changing per rerun, {args.reruns} reruns")
+    print(f"f-strings:  {old_seconds / args.reruns * 1e6:.0f} us/rerun, {len(old) + args.games} elements, {sum(len(h.encode()) for h in old)} bytes")
+    print(f"card layer: {new_seconds / args.reruns * 1e6:.0f} us/rerun, 1 element, {len(new.encode())} bytes")
+    print(f"renders: {renderer.renders}, cache hits: {renderer.hits}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from persistence import BETTING_SCHEMA, Database
+
+LEAGUES = ["mlb", "nba", "nfl", "nhl", "wnba"]
+
+
+def synthetic_merged(league, n_rows, seed):
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    rows = []
+    for i in range(n_rows):
+        rows.append({
+            "league": league,
+            "date": (start + timedelta(days=i // 15)).isoformat(),
+            "home": f"{league.upper()} Home {i % 15:02d}",
+            "away": f"{league.upper()} Away {i % 15:02d}",
+            "elo_home": rng.randint(1300, 1700),
+            "elo_away": rng.randint(1300, 1700),
+            "market_ml_home": rng.choice([-150, -120, 110, 140]),
+            "market_ml_away": rng.choice([-150, -120, 110, 140]),
+            "spread": rng.choice([-3.5, -1.5, 1.5, 3.5]),
+            "total": rng.choice([7.5, 45.5, 220.5]),
+            "value_edge_home": round(rng.uniform(-10, 10), 2),
+            "value_edge_away": round(rng.uniform(-10, 10), 2),
+        })
+    return rows
+
+
+class RemoteCursor:
+    # SQLite runs in-process; charge one network round trip per statement like a remote server would
+    def __init__(self, cursor, rtt):
+        self._cursor = cursor
+        self._rtt = rtt
+
+    def execute(self, *args):
+        time.sleep(self._rtt)
+        return self._cursor.execute(*args)
+
+    def executemany(self, *args):
+        time.sleep(self._rtt)
+        return self._cursor.executemany(*args)
+
+    def close(self):
+        self._cursor.close()
+
+
+class RemoteConnection:
+    def __init__(self, path, rtt, connect_cost):
+        time.sleep(connect_cost)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._rtt = rtt
+
+    def cursor(self):
+        return RemoteCursor(self._conn.cursor(), self._rtt)
+
+    def commit(self):
+        time.sleep(self._rtt)
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def save_row_by_row(connect, data):
+    # what save_betting_data did per league: new connection, DDL, one INSERT per row
+    conn = connect()
+    cur = conn.cursor()
+    cur.execute(BETTING_SCHEMA["sqlite"][0])
+    for g in data:
+        cur.execute("""
+            INSERT INTO betting_odds
+            (game_date, league, home_team, away_team, elo_home, elo_away,
+             market_ml_home, market_ml_away, spread, total, value_home, value_away)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            g["date"], g["league"], g["home"], g["away"],
+            g["elo_home"], g["elo_away"],
+            g["market_ml_home"], g["market_ml_away"],
+            g["spread"], g["total"],
+            g["value_edge_home"], g["value_edge_away"]
+        ))
+    conn.commit()
+    cur.close()
+    conn.close()
+
+
+def timed(fn, batches):
+    start = time.perf_counter()
+    for data in batches:
+        fn(data)
+    return time.perf_counter() - start
+
+
+def count_rows(path):
+    conn = sqlite3.connect(path)
+    count = conn.execute("SELECT COUNT(*) FROM betting_odds").fetchone()[0]
+    conn.close()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark betting_odds writes against SQLite")
+    parser.add_argument("--rows", type=int, default=2_000, help="rows per league")
+    parser.add_argument("--refreshes", type=int, default=3)
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="simulated round trip per statement")
+    parser.add_argument("--connect-ms", type=float, default=30.0, help="simulated connection setup")
+    args = parser.parse_args()
+
+    batches = [synthetic_merged(league, args.rows, i) for i, league in enumerate(LEAGUES)] * args.refreshes
+    total = len(batches) * args.rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = str(Path(tmp) / "legacy.db")
+        bulk_path = str(Path(tmp) / "bulk.db")
+
+        rtt = args.rtt_ms / 1000
+        connect_cost = args.connect_ms / 1000
+        legacy_seconds = timed(lambda data: save_row_by_row(lambda: RemoteConnection(legacy_path, rtt, connect_cost), data), batches)
+        db = Database("sqlite", lambda: RemoteConnection(bulk_path, rtt, connect_cost))
+        bulk_seconds = timed(db.upsert_betting_odds, batches)
+
+        print(f"{total} rows over {len(batches)} league refreshes, {args.rtt_ms} ms per round trip")
+        print(f"row-by-row insert: {legacy_seconds:.3f}s, {count_rows(legacy_path)} rows stored")
+        print(f"bulk upsert:       {bulk_seconds:.3f}s, {count_rows(bulk_path)} rows stored ({legacy_seconds / bulk_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
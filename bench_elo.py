@@ -0,0 +1,70 @@
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from elo import EloRating
+from elo_vectorized import BatchElo, index_teams
+
+
+def synthetic_schedule(n_games, n_teams=30, seed=7):
+    rng = random.Random(seed)
+    teams = [f"Team {i:02d}" for i in range(n_teams)]
+    start = date(2000, 1, 1)
+    games = []
+    for i in range(n_games):
+        home, away = rng.sample(teams, 2)
+        games.append({
+            "game_date": start + timedelta(days=i * 2 // n_teams),
+            "home_team": home,
+            "away_team": away,
+            "home_score": rng.randint(0, 10),
+            "away_score": rng.randint(0, 10),
+        })
+    return games
+
+
+def run_class(games):
+    elo = EloRating()
+    rows = []
+    for g in sorted(games, key=lambda x: x["game_date"]):
+        home, away = g["home_team"], g["away_team"]
+        home_before, away_before = elo.get_rating(home), elo.get_rating(away)
+        elo.update_ratings(home, away, 1 if g["home_score"] > g["away_score"] else 0)
+        rows.append((home_before, away_before, elo.get_rating(home), elo.get_rating(away)))
+    return rows
+
+
+def run_batch(games):
+    games = sorted(games, key=lambda x: x["game_date"])
+    names, home_idx, away_idx = index_teams([g["home_team"] for g in games], [g["away_team"] for g in games])
+    home_win = np.fromiter((g["home_score"] > g["away_score"] for g in games), dtype=bool, count=len(games))
+    return BatchElo().run(home_idx, away_idx, home_win, len(names))[1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare EloRating with the batch Elo engine")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--teams", type=int, default=30)
+    args = parser.parse_args()
+
+    games = synthetic_schedule(args.games, args.teams)
+
+    start = time.perf_counter()
+    expected = np.array(run_class(games))
+    class_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = np.column_stack(run_batch(games))
+    batch_seconds = time.perf_counter() - start
+
+    print(f"{args.games} games, {args.teams} teams")
+    print(f"EloRating: {class_seconds:.3f}s")
+    print(f"BatchElo:  {batch_seconds:.3f}s ({class_seconds / batch_seconds:.1f}x)")
+    print(f"max abs diff: {np.abs(expected - actual).max():.3e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from elo_utils import merge_market_frame, value_side
+from team_mapping import get_team_mapping
+
+
+def merge_row_by_row(league, market_games, elo_data, mapping):
+    # the per-game implementation merge_market_with_elo used before the columnar path
+    merged = []
+    for g in market_games:
+        home = mapping.get(g["home"], g["home"])
+        away = mapping.get(g["away"], g["away"])
+        elo_home = elo_data.get(home, 1500)
+        elo_away = elo_data.get(away, 1500)
+        prob_home = 1 / (1 + 10 ** ((elo_away - elo_home) / 400))
+        prob_away = 1 - prob_home
+        fair_ml_home = -100 * prob_home / (1 - prob_home) if prob_home >= 0.5 else 100 * (1 - prob_home) / prob_home
+        fair_ml_away = -100 * prob_away / (1 - prob_away) if prob_away >= 0.5 else 100 * (1 - prob_away) / prob_away
+        edge_home = round(prob_home - g["ml_home_prob"], 4) * 100
+        edge_away = round(prob_away - g["ml_away_prob"], 4) * 100
+        merged.append({
+            "league": league,
+            "date": g["date"],
+            "home": home,
+            "away": away,
+            "elo_home": elo_home,
+            "elo_away": elo_away,
+            "prob_home": round(prob_home, 4),
+            "prob_away": round(prob_away, 4),
+            "fair_ml_home": round(fair_ml_home),
+            "fair_ml_away": round(fair_ml_away),
+            "market_ml_home": g["ml_home"],
+            "market_ml_away": g["ml_away"],
+            "spread": g["spread"],
+            "total": g["total"],
+            "value_edge_home": edge_home,
+            "value_edge_away": edge_away
+        })
+    return merged
+
+
+def synthetic_market(n_rows, n_teams=120, seed=3):
+    rng = random.Random(seed)
+    teams = [f"Team {i:03d}" for i in range(n_teams)] + list(get_team_mapping("mlb"))
+    games = []
+    for _ in range(n_rows):
+        home, away = rng.sample(teams, 2)
+        ml_home = rng.choice([-250, -180, -140, -110, 105, 130, 165, 220])
+        ml_away = rng.choice([-250, -180, -140, -110, 105, 130, 165, 220])
+        games.append({
+            "date": "2025-06-25",
+            "home": home,
+            "away": away,
+            "ml_home": ml_home,
+            "ml_away": ml_away,
+            "spread": rng.choice([-1.5, 1.5]),
+            "total": rng.choice([7.5, 8.5, 9.5]),
+            "ml_home_prob": round(100 / (ml_home + 100) if ml_home > 0 else -ml_home / (-ml_home + 100), 4),
+            "ml_away_prob": round(100 / (ml_away + 100) if ml_away > 0 else -ml_away / (-ml_away + 100), 4),
+        })
+    # a mix of int and float ratings, and some teams without one
+    elo_data = {t: (1500 + rng.randint(-200, 200)) if i % 3 else round(rng.uniform(1300, 1700), 2) for i, t in enumerate(teams) if i % 10}
+    return games, elo_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the market/Elo merge")
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    games, elo_data = synthetic_market(args.rows)
+    mapping = get_team_mapping("mlb")
+
+    start = time.perf_counter()
+    expected = merge_row_by_row("mlb", games, elo_data, mapping)
+    df = pd.DataFrame(expected)
+    df["Value On"] = df.apply(lambda x: "HOME" if x["value_edge_home"] > x["value_edge_away"] else "AWAY", axis=1)
+    row_seconds = time.perf_counter() - start
+
+    market = pd.DataFrame(games)
+    start = time.perf_counter()
+    frame = merge_market_frame("mlb", market, elo_data, mapping)
+    frame["Value On"] = value_side(frame)
+    column_seconds = time.perf_counter() - start
+
+    actual = frame.drop(columns="Value On").to_dict("records")
+    mismatches = sum(1 for a, b in zip(actual, expected) if a != b)
+    value_mismatches = int((frame["Value On"] != df["Value On"]).sum())
+    print(f"{args.rows} market rows")
+    print(f"row by row + df.apply: {row_seconds * 1000:.1f} ms")
+    print(f"columnar:              {column_seconds * 1000:.1f} ms ({row_seconds / column_seconds:.1f}x)")
+    print(f"rows differing: {mismatches}, value side differing: {value_mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from schedule_parser import parse_date, parse_schedule
+
+FIXTURES = Path(__file__).parent / "fixtures" / "sports_reference"
+LEAGUES = ["NBA", "WNBA", "MLB", "NFL", "NHL"]
+
+
+def parse_with_soup(league, html):
+    # the BeautifulSoup implementation fetch_game_data used before schedule_parser
+    soup = BeautifulSoup(html, "html.parser")
+    tables = soup.find_all("table")
+    if not tables:
+        return []
+    games = []
+    table = tables[0]
+    rows = table.find("tbody").find_all("tr")
+    for row in rows:
+        if 'class' in row.attrs and 'thead' in row['class']:
+            continue
+        cols = row.find_all("td")
+        if not cols or len(cols) < 5:
+            continue
+        try:
+            date_str = row.find("th").text.strip()
+            date = datetime.strptime(date_str, "%a, %b %d, %Y").date() if league != "NFL" else datetime.strptime(date_str, "%Y-%m-%d").date()
+            away_team = cols[0].text.strip()
+            home_team = cols[1].text.strip()
+            away_score = int(cols[2].text.strip())
+            home_score = int(cols[3].text.strip())
+            games.append({
+                "game_date": date,
+                "home_team": home_team,
+                "away_team": away_team,
+                "home_score": home_score,
+                "away_score": away_score
+            })
+        except Exception:
+            continue
+    return games
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark schedule page parsing")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for league in LEAGUES:
+        path = args.fixtures / f"{league.lower()}.html"
+        if not path.exists():
+            print(f"{league}: no fixture at {path}")
+            continue
+        html = path.read_text(encoding="utf-8")
+        soup_seconds, expected = best_of(lambda: parse_with_soup(league, html), args.repeat)
+        parse_date.cache_clear()
+        fast_seconds, actual = best_of(lambda: parse_schedule(league, html), args.repeat)
+        status = "match" if actual == expected else "MISMATCH"
+        print(
+            f"{league:5} {len(html) / 1024:7.0f} KiB {len(actual):5} games  "
+            f"soup {soup_seconds * 1000:7.1f} ms  fast {fast_seconds * 1000:6.1f} ms  "
+            f"{soup_seconds / fast_seconds:5.1f}x  {status}"
+        )
+
+
+if __name__ == "__main__":
+    main()
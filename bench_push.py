@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from game_cards import CardRenderer
+from live_push import PushServer
+from scoreboard_poller import POLL_INTERVAL, ScoreboardPoller
+
+ROOT = Path(__file__).resolve().parent
+
+
+async def sse_client(port, duration, stats):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n")
+    await writer.drain()
+    start = time.monotonic()
+    deadline = start + duration
+    try:
+        while True:
+            line = await asyncio.wait_for(reader.readline(), max(0.01, deadline - time.monotonic()))
+            if not line:
+                break
+            stats["bytes"] += len(line)
+            if line.startswith(b"event: snapshot"):
+                stats["snapshots"] += 1
+                stats["connect"].append(time.monotonic() - start)
+            elif line.startswith(b"event: delta"):
+                stats["deltas"] += 1
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_clients(port, clients, duration):
+    stats = {"bytes": 0, "snapshots": 0, "deltas": 0, "connect": []}
+    await asyncio.gather(*(sse_client(port, duration, stats) for _ in range(clients)))
+    connect = sorted(stats.pop("connect")) or [0.0]
+    stats["connect_p50"] = connect[len(connect) // 2]
+    stats["connect_p99"] = connect[int(len(connect) * 0.99)]
+    return stats
+
+
+def client_worker(port, clients, duration):
+    # the clients run in their own process so they don't share the server's CPU time
+    print(json.dumps(asyncio.run(run_clients(port, clients, duration))))
+
+
+def start_stub(games, tick):
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "espn_stub.py"), "--port", "0", "--games", str(games), "--tick", str(tick)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    url = proc.stdout.readline().strip().split("=", 1)[1]
+    return proc, url
+
+
+def measure_push(clients, duration, base_url, interval):
+    poller = ScoreboardPoller(interval=interval, base_url=base_url).start()
+    poller.wait_for_first_poll(timeout=15)
+    server = PushServer(poller.store, CardRenderer(), host="127.0.0.1", port=0).start()
+    try:
+        cpu = time.process_time()
+        proc = subprocess.run(
+            [sys.executable, __file__, "--client-worker", "--port", str(server.port), "--clients", str(clients), "--duration", str(duration)],
+            cwd=ROOT, capture_output=True, text=True, timeout=duration + 120,
+        )
+        cpu = time.process_time() - cpu
+        lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+        if not lines:
+            raise RuntimeError(proc.stderr[-2000:])
+        result = json.loads(lines[-1])
+        result.update(server_cpu=cpu, bytes_sent=server.bytes_sent, messages_sent=server.messages_sent, store_version=poller.store.version)
+        return result
+    finally:
+        server.stop()
+        poller.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test live push with many SSE clients against a local ESPN stub")
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds each client stays connected")
+    parser.add_argument("--games", type=int, default=8, help="live games per league on the stub")
+    parser.add_argument("--tick", type=float, default=2.0, help="seconds between stub game updates")
+    parser.add_argument("--interval", type=float, default=2.0, help="poller interval")
+    parser.add_argument("--rerun-samples", type=int, default=10, help="reruns measured for the autorefresh estimate; 0 skips it")
+    parser.add_argument("--json", help="write the result to this file")
+    parser.add_argument("--client-worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.client_worker:
+        client_worker(args.port, args.clients, args.duration)
+        return
+
+    stub, base_url = start_stub(args.games, args.tick)
+    try:
+        push = measure_push(args.clients, args.duration, base_url, args.interval)
+        rerun = None
+        if args.rerun_samples:
+            from bench_startup import measure
+            rerun = measure(str(ROOT / "live_scores_dashboard.py"), args.rerun_samples, base_url)["rerun"]
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    per_client = push["bytes"] / max(1, args.clients)
+    print(f"{args.clients} clients for {args.duration:.0f}s, stub tick {args.tick}s, poller every {args.interval}s")
+    print(f"push: {push['messages_sent']} messages, {push['bytes_sent'] / 1e6:.2f} MB sent ({per_client / 1024:.1f} KB per client)")
+    print(f"  clients saw {push['snapshots']} snapshots and {push['deltas']} deltas; "
+          f"first snapshot p50 {push['connect_p50'] * 1000:.0f} ms, p99 {push['connect_p99'] * 1000:.0f} ms")
+    print(f"  server CPU (poller + push): {push['server_cpu']:.2f} s ({push['server_cpu'] / args.duration * 100:.1f}% of one core)")
+    if rerun is not None:
+        # every session reruns the whole script once per poll interval under autorefresh
+        reruns = args.clients * args.duration / POLL_INTERVAL
+        print(f"autorefresh every {POLL_INTERVAL}s: {reruns:.0f} reruns x {rerun * 1000:.1f} ms = {reruns * rerun:.2f} s of script time")
+    if args.json:
+        push["rerun"] = rerun
+        Path(args.json).write_text(json.dumps(push, indent=2))
+
+
+if __name__ == "__main__":
+    main()
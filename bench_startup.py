@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from espn_stub import StubServer
+
+ROOT = Path(__file__).resolve().parent
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+HEAVY = ["pandas", "numpy", "bs4", "selenium", "psycopg2", "pyodbc", "dotenv", "refresh_jobs", "elo_utils"]
+
+
+def worker(script, reruns):
+    # runs inside a fresh interpreter started with -X importtime
+    from streamlit.testing.v1 import AppTest
+
+    baseline = sorted(sys.modules)
+    at = AppTest.from_file(script, default_timeout=60)
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    print(json.dumps({
+        "baseline": baseline,
+        "first_run": first,
+        "rerun": sorted(times)[len(times) // 2] if times else None,
+        "exception": [str(e.value) for e in at.exception],
+        "heavy": [m for m in HEAVY if m in sys.modules],
+        "tabs": [t.label for t in at.tabs],
+    }))
+
+
+def parse_importtime(stderr, baseline):
+    baseline = set(baseline)
+    by_package = {}
+    for line in stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if not m or m.group(3) in baseline:
+            continue
+        package = m.group(3).split(".")[0]
+        by_package[package] = by_package.get(package, 0) + int(m.group(1))
+    return by_package
+
+
+def measure(script, reruns, base_url):
+    env = dict(os.environ, ESPN_BASE_URL=base_url, PYTHONPATH=str(ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", __file__, "--worker", "--script", script, "--reruns", str(reruns)],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=600,
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        raise RuntimeError(proc.stderr[-2000:])
+    result = json.loads(lines[-1])
+    result["imports"] = parse_importtime(proc.stderr, result.pop("baseline"))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure dashboard cold start and per-rerun cost")
+    parser.add_argument("--script", default=str(ROOT / "live_scores_dashboard.py"))
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--json", help="write the result to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.script, args.reruns)
+        return
+
+    server = StubServer(games_per_league=8).start()
+    try:
+        result = measure(args.script, args.reruns, server.url)
+    finally:
+        server.stop()
+
+    imports = result["imports"]
+    print(f"script: {args.script}")
+    print(f"app imports: {sum(imports.values()) / 1000:.1f} ms across {len(imports)} packages")
+    for package, us in sorted(imports.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {package:<28} {us / 1000:8.1f} ms")
+    print(f"heavy modules loaded: {', '.join(result['heavy']) or 'none'}")
+    print(f"first run: {result['first_run'] * 1000:.0f} ms, median rerun: {result['rerun'] * 1000:.1f} ms")
+    if result["exception"]:
+        print(f"exceptions: {result['exception']}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
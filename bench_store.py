@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from elo_columnar import LEAGUES, RatingHistory, day_date
+
+
+def synthetic_history(n_records, n_teams=150, seed=11):
+    rng = np.random.default_rng(seed)
+    days = np.sort(rng.integers(0, 365 * 20, n_records)) + 10957
+    teams = rng.integers(0, n_teams, n_records)
+    ratings = 1500 + rng.normal(0, 120, n_records)
+    return days, teams, ratings
+
+
+def write_json_history(path, days, teams, ratings):
+    # what the history would look like in the current indented-JSON style
+    names = [f"Team {t:03d}" for t in teams.tolist()]
+    records = [
+        {"date": day_date(d).isoformat(), "league": LEAGUES[1 + t % 5], "team": n, "rating": r}
+        for d, t, n, r in zip(days.tolist(), teams.tolist(), names, ratings.tolist())
+    ]
+    with open(path, "w") as f:
+        json.dump(records, f, indent=2)
+
+
+def write_columnar_history(root, days, teams, ratings):
+    history = RatingHistory(root)
+    league_of = teams % 5
+    for code in range(5):
+        mask = league_of == code
+        history.append(LEAGUES[1 + code], days[mask], [f"Team {t:03d}" for t in teams[mask].tolist()], ratings[mask])
+    return history
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def load_json_latest(path):
+    with open(path) as f:
+        records = json.load(f)
+    latest = {}
+    for r in records:
+        latest[r["team"]] = r["rating"]
+    return latest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON vs columnar Elo history loads")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    days, teams, ratings = synthetic_history(args.records)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "history.json")
+        write_json_history(json_path, days, teams, ratings)
+        write_columnar_history(os.path.join(tmp, "store"), days, teams, ratings)
+
+        _, json_seconds, json_peak = measure(lambda: load_json_latest(json_path))
+        history, open_seconds, open_peak = measure(lambda: RatingHistory(os.path.join(tmp, "store")).history())
+        _, latest_seconds, latest_peak = measure(lambda: RatingHistory(os.path.join(tmp, "store")).latest_ratings())
+
+        print(f"{args.records} rating records")
+        print(f"json:     {os.path.getsize(json_path) / 1e6:.1f} MB, latest ratings in {json_seconds:.2f}s, peak {json_peak / 1e6:.1f} MB")
+        print(f"columnar: {os.path.getsize(history.filename) / 1e6:.1f} MB, full history opened in {open_seconds * 1000:.2f} ms, peak {open_peak / 1e3:.1f} KB")
+        print(f"columnar: latest ratings in {latest_seconds * 1000:.2f} ms, peak {latest_peak / 1e3:.1f} KB")
+        del history
+
+
+if __name__ == "__main__":
+    main()
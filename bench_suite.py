@@ -0,0 +1,260 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+FIXTURES = ROOT / "fixtures"
+RESULTS_DIR = ROOT / "bench_results"
+LEAGUES = ["mlb", "nba", "nfl", "nhl", "wnba"]
+DEFAULT_THRESHOLD = 0.15
+
+# every hot path runs against recorded pages served locally, so runs are comparable across machines and days
+
+
+def load_espn_fixtures(root=FIXTURES / "espn", today=None):
+    # recorded scoreboards are re-dated to today; the scoreboard only keeps games dated today
+    today = today or date.today().isoformat()
+    payloads = {}
+    for path in sorted(root.glob("*.json")):
+        data = json.loads(path.read_text())
+        if "day" in data:
+            data["day"]["date"] = today
+        for event in data.get("events", []):
+            event["date"] = today + event["date"][10:]
+            for competition in event.get("competitions", []):
+                competition["date"] = today + competition.get("date", "")[10:]
+        payloads[path.stem] = data
+    return payloads
+
+
+class FixtureServer:
+    # /espn/<sport>/<league>/scoreboard, /sports_reference/<league>.html and /betiq/<league>/game-predictions/
+    def __init__(self, fixtures=FIXTURES):
+        from espn_client import SPORTS
+
+        self.routes = {}
+        for league, data in load_espn_fixtures(fixtures / "espn").items():
+            sport_path = next(s for s in SPORTS if s.endswith("/" + league))
+            self.routes[f"/espn/{sport_path}/scoreboard"] = (json.dumps(data).encode(), "application/json")
+        for path in sorted((fixtures / "sports_reference").glob("*.html")):
+            self.routes[f"/sports_reference/{path.name}"] = (path.read_bytes(), "text/html")
+        for path in sorted((fixtures / "betiq").glob("*.html")):
+            self.routes[f"/betiq/{path.stem}/game-predictions/"] = (path.read_bytes(), "text/html; charset=utf-8")
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+
+    def _handler(self):
+        routes = self.routes
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body, content_type = routes.get(self.path.split("?", 1)[0], (None, None))
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def make_benchmarks(server):
+    # name -> (setup, fn); setup runs before every timed call and is not counted
+    import espn_client
+    from betiq_scraper import scrape_betiq_odds
+    from elo_batch_processor import parse_game_data, run_elo
+    from elo_utils import merge_market_with_elo
+    from game_cards import CardRenderer
+    from page_cache import HostLimiter, PageCache, fetch_page
+    from scoreboard import fetch_espn_scores, normalize_events
+
+    espn_url = server.url + "/espn"
+    betiq_url = server.url + "/betiq"
+    today = date.today().isoformat()
+    payloads = load_espn_fixtures(FIXTURES / "espn", today)
+    pages = {league: (FIXTURES / "sports_reference" / f"{league}.html").read_text(encoding="utf-8") for league in LEAGUES}
+    page_cache = PageCache(tempfile.mkdtemp(prefix="bench-pages-"))
+    limiter = HostLimiter(concurrency=4, min_interval=0)
+
+    schedules = {league: parse_game_data(league.upper(), html) for league, html in pages.items()}
+    elo_rows = {league: run_elo(games) for league, games in schedules.items()}
+    # latest rating per team, the shape elo_history.json holds
+    elo_data = {}
+    for rows in elo_rows.values():
+        for _, home, away, _, _, _, _, home_after, away_after, _ in rows:
+            elo_data[home] = home_after
+            elo_data[away] = away_after
+    market = {league: scrape_betiq_odds(league, base_url=betiq_url) for league in LEAGUES}
+    games = {league: normalize_events(league, payloads[league], today) for league in LEAGUES}
+    warm = CardRenderer()
+
+    def clear_espn_cache():
+        # otherwise an identical body skips the JSON parse
+        with espn_client._cache_lock:
+            espn_client._cache.clear()
+
+    def fetch_schedules():
+        return {
+            league: parse_game_data(league.upper(), fetch_page(f"{server.url}/sports_reference/{league}.html", cache=page_cache, limiter=limiter))
+            for league in LEAGUES
+        }
+
+    def render_all(renderer):
+        return [renderer.league_block(league, games[league]) for league in LEAGUES]
+
+    return {
+        "espn_fetch_normalize": (clear_espn_cache, lambda: fetch_espn_scores(espn_url)),
+        "espn_normalize": (None, lambda: [normalize_events(league, payloads[league], today) for league in LEAGUES]),
+        "schedule_fetch_parse": (None, fetch_schedules),
+        "schedule_parse": (None, lambda: [parse_game_data(league.upper(), html) for league, html in pages.items()]),
+        "run_elo": (None, lambda: [run_elo(g) for g in schedules.values()]),
+        "betiq_scrape_static": (None, lambda: [scrape_betiq_odds(league, base_url=betiq_url) for league in LEAGUES]),
+        "merge_market_with_elo": (None, lambda: [merge_market_with_elo(league, market[league], elo_data) for league in LEAGUES]),
+        "cards_cold": (None, lambda: render_all(CardRenderer())),
+        "cards_warm": (None, lambda: render_all(warm)),
+    }
+
+
+def time_benchmark(setup, fn, repeat, warmup=1):
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(times),
+        "min": min(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "repeat": repeat,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_suite(repeat, only=None):
+    server = FixtureServer().start()
+    try:
+        benchmarks = make_benchmarks(server)
+        results = {}
+        for name, (setup, fn) in benchmarks.items():
+            if only and name not in only:
+                continue
+            results[name] = time_benchmark(setup, fn, repeat)
+            print(f"{name:24} median {results[name]['median'] * 1000:9.3f} ms   min {results[name]['min'] * 1000:9.3f} ms")
+    finally:
+        server.stop()
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    # best-of times are compared; medians move with whatever else the machine is doing
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if not before:
+            print(f"{name:24} (not in baseline)")
+            continue
+        change = result["min"] / before["min"] - 1
+        flag = "REGRESSION" if change > threshold else "improved" if change < -threshold else ""
+        print(f"{name:24} {before['min'] * 1000:9.3f} -> {result['min'] * 1000:9.3f} ms  {change:+7.1%}  {flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def record_espn(base_url, root=FIXTURES / "espn"):
+    # refreshes the scoreboard fixtures from the live API
+    from espn_client import SPORTS, fetch_json
+
+    root.mkdir(parents=True, exist_ok=True)
+    for sport_path in SPORTS:
+        data = fetch_json(f"{base_url}/{sport_path}/scoreboard")
+        if data is None:
+            print(f"Failed to record {sport_path}")
+            continue
+        (root / f"{sport_path.split('/')[1]}.json").write_text(json.dumps(data))
+        print(f"Recorded {sport_path}: {len(data.get('events', []))} events")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every hot path against recorded fixtures served locally")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--only", help="comma-separated benchmark names")
+    parser.add_argument("--out", type=Path, help="results file (default: bench_results/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown before flagging, e.g. 0.15 for 15%%")
+    parser.add_argument("--record-espn", metavar="BASE_URL", nargs="?", const="https://site.api.espn.com/apis/site/v2/sports",
+                        help="re-record the ESPN scoreboard fixtures and exit")
+    args = parser.parse_args()
+
+    if args.record_espn:
+        record_espn(args.record_espn)
+        return
+
+    result = run_suite(args.repeat, set(args.only.split(",")) if args.only else None)
+    out = args.out or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2))
+    print(f"results written to {out}")
+
+    if args.baseline:
+        regressions = compare(result, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
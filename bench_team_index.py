@@ -0,0 +1,109 @@
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+
+from all_team_logos import team_logos as TEAM_LOGOS
+from schedule_parser import parse_schedule
+from team_index import TeamIndex, city, nickname
+
+LEAGUES = ["mlb", "nba", "nfl", "nhl", "wnba"]
+FIXTURES = Path(__file__).parent / "fixtures"
+MATCHUP_RE = re.compile(r"<td class=\"matchup\">(.*?) vs (.*?)</td>")
+
+# (league, spelling, expected display name) for spellings seen in the wild that rules can't derive
+KNOWN_VARIANTS = [
+    ("mlb", "NY Yankees", "New York Yankees"), ("mlb", "LA Dodgers", "Los Angeles Dodgers"), ("mlb", "CWS", "Chicago White Sox"),
+    ("mlb", "KCR", "Kansas City Royals"), ("mlb", "SFG", "San Francisco Giants"), ("mlb", "Athletics", "Oakland Athletics"),
+    ("mlb", "St Louis Cardinals", "St. Louis Cardinals"), ("mlb", "Cleveland Indians", "Cleveland Guardians"),
+    ("nba", "LA Clippers", "Los Angeles Clippers"), ("nba", "BRK", "Brooklyn Nets"), ("nba", "PHO", "Phoenix Suns"),
+    ("nba", "Philly 76ers", "Philadelphia 76ers"), ("nba", "GSW", "Golden State Warriors"), ("nba", "New Orleans Hornets", "New Orleans Pelicans"),
+    ("nfl", "GNB", "Green Bay Packers"), ("nfl", "Washington Football Team", "Washington Commanders"), ("nfl", "Oakland Raiders", "Las Vegas Raiders"),
+    ("nfl", "NY Giants", "New York Giants"), ("nfl", "SFO", "San Francisco 49ers"), ("nfl", "LA Chargers", "Los Angeles Chargers"),
+    ("nhl", "Montréal Canadiens", "Montreal Canadiens"), ("nhl", "TBL", "Tampa Bay Lightning"), ("nhl", "St Louis Blues", "St. Louis Blues"),
+    ("nhl", "VEG", "Vegas Golden Knights"), ("nhl", "NJD", "New Jersey Devils"), ("nhl", "LA Kings", "Los Angeles Kings"),
+    ("wnba", "LA Sparks", "Los Angeles Sparks"), ("wnba", "CONN", "Connecticut Sun"), ("wnba", "NY Liberty", "New York Liberty"),
+    ("wnba", "Las Vegas", "Las Vegas Aces"), ("wnba", "Washington", "Washington Mystics"),
+]
+
+
+def typo(name, rng):
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1:]
+
+
+def variants(index, rng):
+    # every spelling source the pipeline sees, plus generated noise, as (source, league, spelling, expected)
+    cases = []
+    for league in LEAGUES:
+        fixture = FIXTURES / "sports_reference" / f"{league}.html"
+        if fixture.exists():
+            for g in parse_schedule(league.upper(), fixture.read_text()):
+                cases.append(("sports-reference", league, g["home_team"], g["home_team"]))
+        betiq = FIXTURES / "betiq" / f"{league}.html"
+        if betiq.exists():
+            for away, home in MATCHUP_RE.findall(betiq.read_text()):
+                cases += [("betiq", league, away, away), ("betiq", league, home, home)]
+        for team in index.league_teams(league):
+            name = team["name"]
+            cases += [
+                ("espn display", league, name, name),
+                ("espn abbreviation", league, team["abbreviation"], name),
+                ("case/punctuation", league, name.upper().replace(".", ""), name),
+                ("nickname", league, nickname(name), name),
+                ("typo", league, typo(name, rng), name),
+            ]
+            if city(name):
+                cases.append(("city", league, city(name).title(), name))
+    cases += [("known variants", league, spelling, expected) for league, spelling, expected in KNOWN_VARIANTS]
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure team name resolution across leagues and sources")
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = TeamIndex()
+    build_ms = (time.perf_counter() - start) * 1000
+    cases = variants(index, random.Random(4))
+
+    by_source = {}
+    wrong = []
+    for source, league, spelling, expected in cases:
+        team = index.resolve(league, spelling)
+        ok = team is not None and team["name"] == expected
+        # the previous lookups were exact display-name dict hits
+        exact = spelling in TEAM_LOGOS and spelling == expected
+        stats = by_source.setdefault(source, [0, 0, 0])
+        stats[0] += 1
+        stats[1] += ok
+        stats[2] += exact
+        if team is not None and not ok:
+            wrong.append((league, spelling, team["name"], expected))
+
+    print(f"index built in {build_ms:.1f} ms, {len(index.teams)} teams")
+    print(f"{'source':<20} {'cases':>6} {'resolved':>9} {'exact dict':>11}")
+    total = [0, 0, 0]
+    for source, (n, ok, exact) in by_source.items():
+        print(f"{source:<20} {n:>6} {ok / n:>9.1%} {exact / n:>11.1%}")
+        total = [t + v for t, v in zip(total, (n, ok, exact))]
+    print(f"{'all':<20} {total[0]:>6} {total[1] / total[0]:>9.1%} {total[2] / total[0]:>11.1%}")
+    print(f"misresolved: {len(wrong)}")
+    for league, spelling, got, expected in wrong[:10]:
+        print(f"  {league}: {spelling!r} -> {got!r}, expected {expected!r}")
+
+    sample = [(league, spelling) for _, league, spelling, _ in cases]
+    rng = random.Random(9)
+    lookups = [rng.choice(sample) for _ in range(args.lookups)]
+    start = time.perf_counter()
+    for league, spelling in lookups:
+        index.resolve(league, spelling)
+    seconds = time.perf_counter() - start
+    print(f"{args.lookups} resolves: {seconds / args.lookups * 1e6:.2f} us each")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,151 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
+import atexit
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date
 
-def scrape_betiq_odds(league):
-    url_map = {
-        "mlb": "https://betiq.teamrankings.com/mlb/game-predictions/",
-        "nba": "https://betiq.teamrankings.com/nba/game-predictions/",
-        "nfl": "https://betiq.teamrankings.com/nfl/game-predictions/",
-        "nhl": "https://betiq.teamrankings.com/nhl/game-predictions/",
-        "wnba": "https://betiq.teamrankings.com/wnba/game-predictions/"
-    }
-    url = url_map[league]
+import requests
+from bs4 import BeautifulSoup
+
+import metrics
+
+BASE_URL = os.getenv("BETIQ_BASE_URL", "https://betiq.teamrankings.com")
+LEAGUES = ["mlb", "nba", "nfl", "nhl", "wnba"]
+
+POOL_SIZE = 3
+MAX_PAGES_PER_WORKER = 50
+PAGE_TIMEOUT = 30
+STATIC_TIMEOUT = 15
+
+
+def league_url(league, base_url=None):
+    return f"{base_url or BASE_URL}/{league}/game-predictions/"
+
+
+def new_chrome_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     chrome_options = Options()
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
     driver = webdriver.Chrome(options=chrome_options)
-    driver.get(url)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    driver.quit()
+    driver.set_page_load_timeout(PAGE_TIMEOUT)
+    return driver
+
+
+class BrowserWorker:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+    def page_source(self, url):
+        self.driver.get(url)
+        self.pages += 1
+        metrics.inc("betiq_pages_total")
+        return self.driver.page_source
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    # long-lived headless browsers shared across leagues and refreshes
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_WORKER, driver_factory=new_chrome_driver):
+        self.size = size
+        self.max_pages = max_pages
+        self.driver_factory = driver_factory
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._workers = set()
+        self.started = 0
+        self.recycled = 0
 
+    @contextmanager
+    def worker(self):
+        self._slots.acquire()
+        try:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = BrowserWorker(self.driver_factory())
+                with self._lock:
+                    self._workers.add(worker)
+                    self.started += 1
+            try:
+                yield worker
+            except Exception:
+                # a crashed or wedged browser is never reused
+                self._retire(worker)
+                raise
+            if worker.pages >= self.max_pages:
+                self._retire(worker)
+            else:
+                self._idle.put(worker)
+        finally:
+            self._slots.release()
+
+    def _retire(self, worker):
+        worker.quit()
+        with self._lock:
+            self._workers.discard(worker)
+            self.recycled += 1
+
+    def page_source(self, url):
+        with self.worker() as worker:
+            return worker.page_source(url)
+
+    def close(self):
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.quit()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+            metrics.register_collector(lambda: [
+                ("betiq_browsers_started_total", {}, _pool.started),
+                ("betiq_browsers_recycled_total", {}, _pool.recycled),
+            ])
+    return _pool
+
+
+def parse_betiq_html(html):
+    soup = BeautifulSoup(html, "html.parser")
     results = []
     rows = soup.select("table tr")[1:]
     for row in rows:
         cells = row.find_all("td")
         if len(cells) < 6:
             continue
-        teams = cells[0].text.strip().split(" vs ")
-        home = teams[1].strip()
-        away = teams[0].strip()
-        ml_home = int(cells[1].text.strip())
-        ml_away = int(cells[2].text.strip())
-        spread = float(cells[3].text.strip().replace("−", "-"))
-        total = float(cells[4].text.strip())
+        try:
+            teams = cells[0].text.strip().split(" vs ")
+            home = teams[1].strip()
+            away = teams[0].strip()
+            ml_home = int(cells[1].text.strip())
+            ml_away = int(cells[2].text.strip())
+            spread = float(cells[3].text.strip().replace("−", "-"))
+            total = float(cells[4].text.strip())
+        except (IndexError, ValueError):
+            continue
         prob_home = 100 / (abs(ml_home) + 100) if ml_home > 0 else abs(ml_home) / (abs(ml_home) + 100)
         prob_away = 100 / (abs(ml_away) + 100) if ml_away > 0 else abs(ml_away) / (abs(ml_away) + 100)
         results.append({
@@ -46,4 +159,44 @@ def scrape_betiq_odds(league):
             "ml_home_prob": round(prob_home, 4),
             "ml_away_prob": round(prob_away, 4)
         })
-    return results
\ No newline at end of file
+    return results
+
+
+def fetch_static(url):
+    try:
+        response = requests.get(url, timeout=STATIC_TIMEOUT, headers={"User-Agent": "Mozilla/5.0"})
+    except requests.RequestException:
+        return None
+    # raw bytes, so BeautifulSoup picks the encoding from the page's meta charset
+    return response.content if response.status_code == 200 else None
+
+
+def scrape_betiq_odds(league, pool=None, base_url=None, static_first=True):
+    url = league_url(league, base_url)
+    # plain HTTP is enough when the predictions table is server-rendered
+    if static_first:
+        with metrics.span("betiq_scrape_seconds", league=league, method="static"):
+            html = fetch_static(url)
+            results = parse_betiq_html(html) if html else []
+        if results:
+            return results
+    with metrics.span("betiq_scrape_seconds", league=league, method="browser"):
+        return parse_betiq_html((pool or get_browser_pool()).page_source(url))
+
+
+def scrape_all_leagues(leagues=None, pool=None, base_url=None, static_first=True):
+    leagues = leagues or LEAGUES
+    pool = pool or get_browser_pool()
+    with ThreadPoolExecutor(max_workers=max(pool.size, 1)) as executor:
+        futures = {
+            league: executor.submit(scrape_betiq_odds, league, pool, base_url, static_first)
+            for league in leagues
+        }
+    results = {}
+    for league, future in futures.items():
+        try:
+            results[league] = future.result()
+        except Exception as e:
+            print(f"Failed to scrape {league}: {e}")
+            results[league] = []
+    return results
@@ -1,4 +1,4 @@
-from db_utils import connect_to_db
+from persistence import connect_to_db
 import streamlit as st
 import pandas as pd
 
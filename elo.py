@@ -1,4 +1,5 @@
-
+import json
+import os
 
 
 class EloRating:
@@ -25,3 +26,23 @@ class EloRating:
 
     def get_all_ratings(self):
         return dict(sorted(self.ratings.items(), key=lambda item: item[1], reverse=True))
+
+
+def update_elo_ratings(path="elo_history.json", leagues=("NBA", "WNBA", "MLB", "NFL", "NHL")):
+    # publish the latest checkpointed rating of every team for merge_market_with_elo
+    from elo_checkpoint import load_checkpoint
+
+    ratings = {}
+    for league in leagues:
+        checkpoint = load_checkpoint(league)
+        if checkpoint:
+            ratings.update(zip(checkpoint["teams"], checkpoint["ratings"]))
+    if not ratings:
+        # no checkpoints here (fresh install, another ELO_CHECKPOINT_DIR); keep the ratings already published
+        print(f"No Elo checkpoints found; leaving {path} unchanged")
+        return ratings
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(ratings, f, indent=2)
+    os.replace(tmp, path)
+    return ratings
@@ -1,9 +1,17 @@
-import requests
+import argparse
+from functools import partial
 import pandas as pd
-from bs4 import BeautifulSoup
-from datetime import datetime
-from db_utils import connect_to_db
-from elo_utils import EloRating
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from persistence import get_database
+from page_cache import fetch_page
+from schedule_parser import parse_schedule
+from team_index import get_team_index
+from elo_vectorized import run_elo_batch
+from elo_checkpoint import apply_games, empty_checkpoint, load_checkpoint, number_games, save_checkpoint
+from elo_columnar import RatingHistory
+from elo_params import load_params, season_of
+import metrics
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,60 +26,51 @@ LEAGUE_INFO = {
 
 YEARS = [2022, 2023, 2024]
 
+# (years after the season label, month) from which a season's page is final
+SEASON_COMPLETE = {
+    "NBA": (0, 7),
+    "WNBA": (0, 11),
+    "MLB": (0, 12),
+    "NFL": (1, 3),
+    "NHL": (0, 7)
+}
+
+MAX_WORKERS = 8
+
+def season_complete(league, year, today=None):
+    today = today or date.today()
+    years_after, month = SEASON_COMPLETE[league]
+    return (today.year, today.month) >= (year + years_after, month)
+
 def fetch_game_data(league, year):
     url = LEAGUE_INFO[league].format(year)
-    res = requests.get(url)
-    soup = BeautifulSoup(res.text, "html.parser")
-    tables = soup.find_all("table")
-    if not tables:
+    html = fetch_page(url, final=season_complete(league, year))
+    if not html:
         return []
-    games = []
-    table = tables[0]
-    rows = table.find("tbody").find_all("tr")
-    for row in rows:
-        if 'class' in row.attrs and 'thead' in row['class']:
-            continue
-        cols = row.find_all("td")
-        if not cols or len(cols) < 5:
-            continue
-        try:
-            date_str = row.find("th").text.strip()
-            date = datetime.strptime(date_str, "%a, %b %d, %Y").date() if league != "NFL" else datetime.strptime(date_str, "%Y-%m-%d").date()
-            away_team = cols[0].text.strip()
-            home_team = cols[1].text.strip()
-            away_score = int(cols[2].text.strip())
-            home_score = int(cols[3].text.strip())
-            games.append({
-                "game_date": date,
-                "home_team": home_team,
-                "away_team": away_team,
-                "home_score": home_score,
-                "away_score": away_score
-            })
-        except Exception:
-            continue
-    return games
-
-def run_elo(games):
-    elo = EloRating()
-    rows = []
-    for g in sorted(games, key=lambda x: x["game_date"]):
-        home = g["home_team"]
-        away = g["away_team"]
-        home_score = g["home_score"]
-        away_score = g["away_score"]
-        home_elo_before = elo.get_rating(home)
-        away_elo_before = elo.get_rating(away)
-        winner = home if home_score > away_score else away
-        elo.update_elo(home, away, winner)
-        home_elo_after = elo.get_rating(home)
-        away_elo_after = elo.get_rating(away)
-        rows.append((
-            g["game_date"], home, away, home_score, away_score,
-            home_elo_before, away_elo_before,
-            home_elo_after, away_elo_after
-        ))
-    return rows
+    return parse_game_data(league, html)
+
+def parse_game_data(league, html):
+    games = parse_schedule(league, html)
+    index = get_team_index()
+    for g in games:
+        g["home_team"] = index.canonical_name(league, g["home_team"])
+        g["away_team"] = index.canonical_name(league, g["away_team"])
+    return number_games(games)
+
+def run_elo(games, league=None):
+    # with a league, its tuned parameters from elo_params.json apply
+    params = load_params(league) if league else {}
+    season = partial(season_of, league) if league else None
+    games, _, _, (home_before, away_before, home_after, away_after) = run_elo_batch(games, season_of=season, **params)
+    return [
+        (
+            g["game_date"], g["home_team"], g["away_team"], g["home_score"], g["away_score"],
+            hb, ab, ha, aa, g.get("game_seq", 1)
+        )
+        for g, hb, ab, ha, aa in zip(
+            games, home_before.tolist(), away_before.tolist(), home_after.tolist(), away_after.tolist()
+        )
+    ]
 
 def create_league_table(cursor, table_name):
     create_table_sql = f"""
@@ -86,47 +85,128 @@ def create_league_table(cursor, table_name):
         home_elo_before FLOAT,
         away_elo_before FLOAT,
         home_elo_after FLOAT,
-        away_elo_after FLOAT
+        away_elo_after FLOAT,
+        game_seq INT NOT NULL CONSTRAINT df_{table_name}_game_seq DEFAULT 1,
+        CONSTRAINT uq_{table_name}_game_seq UNIQUE (game_date, home_team, away_team, game_seq)
     );
     """
     cursor.execute(create_table_sql)
+    # tables from before game_seq: existing rows become game 1 of their date, then the key widens.
+    # separate batches, since SQL Server resolves the new column when a batch compiles
+    cursor.execute(f"""
+    IF COL_LENGTH('{table_name}', 'game_seq') IS NULL
+    ALTER TABLE {table_name} ADD game_seq INT NOT NULL CONSTRAINT df_{table_name}_game_seq DEFAULT 1;
+    """)
+    cursor.execute(f"""
+    IF OBJECT_ID('uq_{table_name}_game', 'UQ') IS NOT NULL
+    ALTER TABLE {table_name} DROP CONSTRAINT uq_{table_name}_game;
+    """)
+    cursor.execute(f"""
+    IF OBJECT_ID('uq_{table_name}_game_seq', 'UQ') IS NULL
+    ALTER TABLE {table_name} ADD CONSTRAINT uq_{table_name}_game_seq UNIQUE (game_date, home_team, away_team, game_seq);
+    """)
 
 def insert_elo_data(cursor, table_name, rows):
-    insert_query = f"""
-    INSERT INTO {table_name} (
+    # keyed on (game_date, home_team, away_team, game_seq) so re-running never duplicates rows
+    # and both games of a doubleheader keep their own row
+    upsert_query = f"""
+    MERGE {table_name} AS target
+    USING (SELECT ? AS game_date, ? AS home_team, ? AS away_team,
+                  ? AS home_score, ? AS away_score,
+                  ? AS home_elo_before, ? AS away_elo_before,
+                  ? AS home_elo_after, ? AS away_elo_after, ? AS game_seq) AS source
+    ON target.game_date = source.game_date
+       AND target.home_team = source.home_team
+       AND target.away_team = source.away_team
+       AND target.game_seq = source.game_seq
+    WHEN MATCHED THEN UPDATE SET
+        home_score = source.home_score, away_score = source.away_score,
+        home_elo_before = source.home_elo_before, away_elo_before = source.away_elo_before,
+        home_elo_after = source.home_elo_after, away_elo_after = source.away_elo_after
+    WHEN NOT MATCHED THEN INSERT (
         game_date, home_team, away_team,
         home_score, away_score,
         home_elo_before, away_elo_before,
-        home_elo_after, away_elo_after
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        home_elo_after, away_elo_after, game_seq
+    ) VALUES (
+        source.game_date, source.home_team, source.away_team,
+        source.home_score, source.away_score,
+        source.home_elo_before, source.away_elo_before,
+        source.home_elo_after, source.away_elo_after, source.game_seq
+    );
     """
-    cursor.executemany(insert_query, rows)
+    if hasattr(cursor, "fast_executemany"):
+        # pyodbc binds the whole parameter array in one round trip instead of one per row
+        cursor.fast_executemany = True
+    with metrics.span("db_write_seconds", table=table_name):
+        cursor.executemany(upsert_query, rows)
+    metrics.inc("db_rows_written_total", len(rows), table=table_name)
 
-def process_league(league):
+def fetch_all_seasons(league_years):
+    # every league-season is fetched in parallel; page_cache enforces per-host politeness
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {(league, year): pool.submit(fetch_game_data, league, year) for league, year in league_years}
+    seasons = {}
+    for (league, year), future in futures.items():
+        try:
+            seasons[(league, year)] = future.result()
+        except Exception as e:
+            print(f"Failed to fetch {league} {year}: {e}")
+            seasons[(league, year)] = []
+    return seasons
+
+def seasons_to_scan(league, checkpoint):
+    # seasons already complete when the checkpoint was taken hold no unapplied games
+    if checkpoint["last_date"] is None:
+        return YEARS
+    return [year for year in YEARS if not season_complete(league, year, checkpoint["last_date"])]
+
+def process_league(league, seasons=None):
     print(f"Processing {league}")
+    seasons = seasons or fetch_all_seasons([(league, year) for year in YEARS])
     all_games = []
     for year in YEARS:
-        all_games += fetch_game_data(league, year)
-    return run_elo(all_games)
-
-def main():
-    try:
-        conn = connect_to_db()
-        cursor = conn.cursor()
+        all_games += seasons.get((league, year), [])
+    return run_elo(all_games, league)
 
-        for league in LEAGUE_INFO:
-            table_name = f"elo_{league.lower()}"
-            rows = process_league(league)
-            create_league_table(cursor, table_name)
-            insert_elo_data(cursor, table_name, rows)
-            conn.commit()
-            print(f"Inserted {len(rows)} rows into {table_name}")
+def process_league_incremental(league, seasons, checkpoint):
+    print(f"Processing {league} after {checkpoint['last_date'] or 'the first game'}")
+    all_games = []
+    for year in YEARS:
+        all_games += seasons.get((league, year), [])
+    return apply_games(all_games, checkpoint, season_of=partial(season_of, league), **load_params(league))
 
-        cursor.close()
-        conn.close()
+def main(full=False):
+    try:
+        checkpoints = {
+            league: (None if full else load_checkpoint(league)) or empty_checkpoint()
+            for league in LEAGUE_INFO
+        }
+        seasons = fetch_all_seasons([
+            (league, year) for league in LEAGUE_INFO for year in seasons_to_scan(league, checkpoints[league])
+        ])
+        history = RatingHistory()
+        if full:
+            history.reset()
+        with get_database("sqlserver").connection() as conn:
+            cursor = conn.cursor()
+            for league in LEAGUE_INFO:
+                table_name = f"elo_{league.lower()}"
+                rows, checkpoint = process_league_incremental(league, seasons, checkpoints[league])
+                create_league_table(cursor, table_name)
+                if rows:
+                    insert_elo_data(cursor, table_name, rows)
+                conn.commit()
+                # only advance the checkpoint once its rows are committed
+                save_checkpoint(league, checkpoint)
+                history.append_games(league, rows)
+                print(f"Upserted {len(rows)} rows into {table_name}")
+            cursor.close()
 
     except Exception as e:
         print(f"Database error: {e}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Update Elo tables from sports-reference schedules")
+    parser.add_argument("--full", action="store_true", help="ignore checkpoints and recompute every season")
+    main(full=parser.parse_args().full)
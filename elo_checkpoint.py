@@ -0,0 +1,124 @@
+import json
+import os
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from elo_vectorized import BatchElo, game_arrays, season_flags
+
+CHECKPOINT_DIR = Path(os.getenv("ELO_CHECKPOINT_DIR", "elo_checkpoints"))
+
+
+def checkpoint_path(league, root=None):
+    return Path(root or CHECKPOINT_DIR) / f"{league.lower()}.json"
+
+
+def load_checkpoint(league, root=None):
+    try:
+        data = json.loads(checkpoint_path(league, root).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    data["last_date"] = date.fromisoformat(data["last_date"]) if data.get("last_date") else None
+    return data
+
+
+def save_checkpoint(league, checkpoint, root=None):
+    path = checkpoint_path(league, root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = dict(checkpoint, last_date=checkpoint["last_date"].isoformat() if checkpoint["last_date"] else None)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def empty_checkpoint():
+    return {"teams": [], "ratings": [], "seasons": [], "last_date": None, "last_date_games": [], "games_processed": 0}
+
+
+def game_key(g):
+    return f"{g['home_team']}|{g['away_team']}|{g.get('game_seq', 1)}"
+
+
+def number_games(games):
+    # doubleheaders share date, home and away; game_seq tells them apart, in schedule order
+    seen = Counter()
+    for g in games:
+        key = (g["game_date"], g["home_team"], g["away_team"])
+        seen[key] += 1
+        g["game_seq"] = seen[key]
+    return games
+
+
+def applied_keys(keys):
+    # checkpoints from before game_seq list "home|away" once per game played
+    counts = Counter()
+    upgraded = []
+    for key in keys:
+        if key.count("|") == 1:
+            counts[key] += 1
+            key = f"{key}|{counts[key]}"
+        upgraded.append(key)
+    return upgraded
+
+
+def new_games(games, checkpoint):
+    # games on the checkpoint's last date may be split across runs, so count what was already applied
+    last_date = checkpoint["last_date"]
+    if last_date is None:
+        return sorted(games, key=lambda x: x["game_date"])
+    seen = Counter(applied_keys(checkpoint["last_date_games"]))
+    fresh = []
+    for g in sorted(games, key=lambda x: x["game_date"]):
+        if g["game_date"] < last_date:
+            continue
+        if g["game_date"] == last_date:
+            key = game_key(g)
+            if seen[key]:
+                seen[key] -= 1
+                continue
+        fresh.append(g)
+    return fresh
+
+
+def apply_games(games, checkpoint, k=20, base_rating=1500, home_advantage=0.0, mov_factor=0.0, season_regression=0.0, season_of=None):
+    # returns the rows for games newer than the checkpoint and the checkpoint after them
+    games = new_games(games, checkpoint)
+    if not games:
+        return [], checkpoint
+    names, home_idx, away_idx, home_win, margin = game_arrays(games, names=checkpoint["teams"])
+    ratings = np.full(len(names), float(base_rating))
+    ratings[:len(checkpoint["ratings"])] = checkpoint["ratings"]
+    new_season = None
+    seasons = None
+    if season_of is not None:
+        # each team's last season is kept, so a team that hasn't played yet this season is still regressed
+        seasons = checkpoint.get("seasons")
+        if seasons is None:
+            # older checkpoints: every team taken to have last played in the checkpoint's season
+            last = season_of(checkpoint["last_date"]) if checkpoint["last_date"] else None
+            seasons = [last] * len(checkpoint["teams"])
+        new_home, new_away, seasons = season_flags(home_idx, away_idx, [season_of(g["game_date"]) for g in games], len(names), seasons)
+        if season_regression:
+            new_season = new_home, new_away
+    elo = BatchElo(k, base_rating, home_advantage, mov_factor, season_regression)
+    ratings, hb, ab, ha, aa = elo.run(home_idx, away_idx, home_win, len(names), ratings, margin=margin, new_season=new_season)
+    rows = [
+        (g["game_date"], g["home_team"], g["away_team"], g["home_score"], g["away_score"], *values, g.get("game_seq", 1))
+        for g, values in zip(games, zip(hb.tolist(), ab.tolist(), ha.tolist(), aa.tolist()))
+    ]
+    last_date = games[-1]["game_date"]
+    last_date_games = [game_key(g) for g in games if g["game_date"] == last_date]
+    if last_date == checkpoint["last_date"]:
+        last_date_games = applied_keys(checkpoint["last_date_games"]) + last_date_games
+    updated = {
+        "teams": names,
+        "ratings": ratings.tolist(),
+        "last_date": last_date,
+        "last_date_games": last_date_games,
+        "games_processed": checkpoint["games_processed"] + len(games),
+    }
+    if seasons is not None:
+        updated["seasons"] = seasons
+    return rows, updated
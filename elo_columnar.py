@@ -0,0 +1,252 @@
+import argparse
+import json
+import os
+import struct
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+# file layout: fixed prefix, JSON dtype descriptor padded to a 64-byte boundary, then packed records
+MAGIC = b"ELOCOL1\0"
+PREFIX = struct.Struct("<8sIQ")
+ALIGN = 64
+
+LEAGUES = ("", "NBA", "WNBA", "MLB", "NFL", "NHL")
+STORE_DIR = Path(os.getenv("ELO_STORE_DIR", "elo_store"))
+
+HISTORY_DTYPE = np.dtype([("day", "<i4"), ("league", "u1"), ("team", "<i4"), ("rating", "<f8")], align=True)
+LATEST_DTYPE = np.dtype([("rating", "<f8"), ("day", "<i4"), ("league", "u1")], align=True)
+PREDICTION_DTYPE = np.dtype([
+    ("league", "<U8"), ("date", "<U10"), ("home", "<U40"), ("away", "<U40"),
+    ("elo_home", "<f8"), ("elo_away", "<f8"), ("prob_home", "<f8"), ("prob_away", "<f8"),
+    ("fair_ml_home", "<i8"), ("fair_ml_away", "<i8"), ("market_ml_home", "<i8"), ("market_ml_away", "<i8"),
+    ("spread", "<f8"), ("total", "<f8"), ("value_edge_home", "<f8"), ("value_edge_away", "<f8"),
+])
+
+EPOCH = date(1970, 1, 1).toordinal()
+
+
+def day_number(d):
+    return date.fromisoformat(d).toordinal() - EPOCH if isinstance(d, str) else d.toordinal() - EPOCH
+
+
+def day_date(n):
+    return date.fromordinal(int(n) + EPOCH)
+
+
+def encode_header(dtype, count):
+    descr = json.dumps(np.lib.format.dtype_to_descr(dtype)).encode()
+    header_len = -(-(PREFIX.size + len(descr)) // ALIGN) * ALIGN
+    return PREFIX.pack(MAGIC, header_len, count) + descr.ljust(header_len - PREFIX.size, b" ")
+
+
+def read_header(f):
+    magic, header_len, count = PREFIX.unpack(f.read(PREFIX.size))
+    if magic != MAGIC:
+        raise ValueError(f"{getattr(f, 'name', 'file')} is not a columnar record file")
+    descr = json.loads(f.read(header_len - PREFIX.size))
+    # JSON turns the descriptor's tuples into lists
+    dtype = np.lib.format.descr_to_dtype([tuple(field) for field in descr] if isinstance(descr, list) else descr)
+    return dtype, header_len, count
+
+
+def write_records(path, records):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(encode_header(records.dtype, len(records)))
+        f.write(np.ascontiguousarray(records).tobytes())
+    os.replace(tmp, path)
+
+
+def open_records(path):
+    # read-only memory map: nothing is read until a column is touched
+    with open(path, "rb") as f:
+        dtype, header_len, count = read_header(f)
+    if count == 0:
+        return np.empty(0, dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=header_len, shape=(count,))
+
+
+def append_records(path, records):
+    path = Path(path)
+    if not path.exists():
+        write_records(path, records)
+        return len(records)
+    with open(path, "r+b") as f:
+        dtype, header_len, count = read_header(f)
+        if dtype != records.dtype:
+            raise ValueError(f"{path} holds {dtype}, not {records.dtype}")
+        # records go in first and the count last, so a torn append is simply ignored and overwritten next time
+        f.seek(header_len + count * dtype.itemsize)
+        f.write(np.ascontiguousarray(records).tobytes())
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+        f.seek(0)
+        f.write(PREFIX.pack(MAGIC, header_len, count + len(records)))
+    return count + len(records)
+
+
+class RatingHistory:
+    # append-only per-game ratings plus a small dense file with every team's latest rating
+    def __init__(self, root=None):
+        self.root = Path(root or STORE_DIR)
+        self.history_path = self.root / "history.rec"
+        self.latest_path = self.root / "latest.rec"
+        self.teams_path = self.root / "teams.txt"
+        self._teams = None
+
+    def teams(self):
+        if self._teams is None:
+            try:
+                self._teams = self.teams_path.read_text().splitlines()
+            except FileNotFoundError:
+                self._teams = []
+        return self._teams
+
+    def _team_ids(self, names):
+        teams = self.teams()
+        index = {name: i for i, name in enumerate(teams)}
+        new = []
+        ids = []
+        for name in names:
+            if name not in index:
+                index[name] = len(index)
+                new.append(name)
+            ids.append(index[name])
+        if new:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.teams_path, "a") as f:
+                f.write("".join(f"{name}\n" for name in new))
+            teams.extend(new)
+        return np.asarray(ids, dtype=np.int32)
+
+    def append(self, league, days, names, ratings):
+        records = np.zeros(len(names), HISTORY_DTYPE)
+        records["day"] = days
+        records["league"] = LEAGUES.index(league.upper())
+        records["team"] = self._team_ids(names)
+        records["rating"] = ratings
+        # the team list is appended before the records that point into it
+        append_records(self.history_path, records)
+        latest = np.zeros(len(self.teams()), LATEST_DTYPE)
+        previous = self.latest()
+        latest[:len(previous)] = previous
+        # a team's last record in the batch is its latest rating
+        teams, last = np.unique(records["team"][::-1], return_index=True)
+        last = len(records) - 1 - last
+        latest["rating"][teams] = records["rating"][last]
+        latest["day"][teams] = records["day"][last]
+        latest["league"][teams] = records["league"][last]
+        write_records(self.latest_path, latest)
+        return len(records)
+
+    def append_games(self, league, rows):
+        # rows as produced by apply_games: date, home, away, scores, ratings before and after, game_seq
+        if not rows:
+            return 0
+        days, names, ratings = [], [], []
+        for r in rows:
+            day = day_number(r[0])
+            days += (day, day)
+            names += (r[1], r[2])
+            ratings += (r[7], r[8])
+        return self.append(league, days, names, ratings)
+
+    def history(self):
+        try:
+            return open_records(self.history_path)
+        except FileNotFoundError:
+            return np.empty(0, HISTORY_DTYPE)
+
+    def latest(self):
+        try:
+            return open_records(self.latest_path)
+        except FileNotFoundError:
+            return np.empty(0, LATEST_DTYPE)
+
+    def latest_ratings(self, league=None):
+        latest = self.latest()
+        teams = self.teams()
+        ratings = latest["rating"].tolist()
+        leagues = latest["league"].tolist()
+        code = LEAGUES.index(league.upper()) if league else None
+        return {
+            name: rating for name, rating, lg in zip(teams, ratings, leagues)
+            if code is None or lg == code
+        }
+
+    def reset(self):
+        for path in (self.history_path, self.latest_path, self.teams_path):
+            path.unlink(missing_ok=True)
+        self._teams = None
+
+
+def prediction_dtype(games):
+    # PREDICTION_DTYPE fitted to the batch: strings widen to the longest value, and a number column
+    # stays integer only when every value is one, so nothing is truncated and ints read back as ints.
+    # each file's header records the dtype it was written with
+    fields = []
+    for name in PREDICTION_DTYPE.names:
+        base = PREDICTION_DTYPE[name]
+        values = [g[name] for g in games]
+        if base.kind == "U":
+            fields.append((name, f"<U{max([base.itemsize // 4] + [len(str(v)) for v in values])}"))
+        elif not values:
+            fields.append((name, base.str))
+        elif all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values):
+            fields.append((name, "<i8"))
+        else:
+            fields.append((name, "<f8"))
+    return np.dtype(fields)
+
+
+def predictions_to_records(games):
+    records = np.zeros(len(games), prediction_dtype(games))
+    for name in PREDICTION_DTYPE.names:
+        records[name] = [g[name] for g in games]
+    return records
+
+
+def write_predictions(path, games):
+    write_records(path, predictions_to_records(games))
+
+
+def convert_elo_history(json_path, store, league=""):
+    # the JSON history only has each team's latest rating, so it becomes one entry per team dated by the file
+    text = Path(json_path).read_text().strip()
+    ratings = json.loads(text) if text else {}
+    if not ratings:
+        return 0
+    day = day_number(date.fromtimestamp(os.path.getmtime(json_path)))
+    return store.append(league, [day] * len(ratings), list(ratings), list(ratings.values()))
+
+
+def convert_predictions(json_path, rec_path=None):
+    with open(json_path) as f:
+        games = json.load(f)
+    rec_path = rec_path or Path(json_path).with_suffix(".rec")
+    write_predictions(rec_path, games)
+    return len(games)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert JSON Elo artifacts to columnar record files")
+    parser.add_argument("--history", default="elo_history.json", help="flat team -> rating JSON")
+    parser.add_argument("--league", default="", help="league the history belongs to, if only one")
+    parser.add_argument("--store", default=None, help=f"output directory (default {STORE_DIR})")
+    parser.add_argument("predictions", nargs="*", help="<league>_predicted_odds.json files")
+    args = parser.parse_args()
+
+    if args.history and os.path.exists(args.history):
+        count = convert_elo_history(args.history, RatingHistory(args.store), args.league)
+        print(f"{args.history}: {count} ratings")
+    for path in args.predictions:
+        print(f"{path}: {convert_predictions(path)} games")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+from datetime import date
+from pathlib import Path
+
+# per-league Elo settings written by elo_tuning; leagues without an entry keep EloRating's defaults
+ELO_PARAMS_PATH = Path(os.getenv("ELO_PARAMS_PATH", "elo_params.json"))
+
+DEFAULT_PARAMS = {
+    "k": 20.0,
+    "base_rating": 1500.0,
+    "home_advantage": 0.0,
+    # 0 ignores the margin; 1 is the full log-margin multiplier
+    "mov_factor": 0.0,
+    # share of the distance to the base rating given back at a team's first game of a season
+    "season_regression": 0.0,
+}
+
+# month a league's season label changes; NBA and NHL seasons run into the next calendar year,
+# the NFL's playoffs into February
+SEASON_START_MONTH = {"NBA": 8, "NHL": 8, "NFL": 6, "MLB": 1, "WNBA": 1}
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def season_of(league, game_date):
+    start = SEASON_START_MONTH.get(league.upper(), 1)
+    return game_date.year if game_date.month >= start else game_date.year - 1
+
+
+def load_all(path=ELO_PARAMS_PATH):
+    path = Path(path)
+    try:
+        stamp = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    with _lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    try:
+        data = json.loads(path.read_text())
+    except ValueError as e:
+        print(f"Ignoring unreadable {path}: {e}")
+        data = {}
+    if not isinstance(data, dict):
+        print(f"Ignoring {path}: expected an object of leagues")
+        data = {}
+    with _lock:
+        _cache[path] = (stamp, data)
+    return data
+
+
+def load_params(league, path=ELO_PARAMS_PATH):
+    entry = load_all(path).get(league.upper(), {})
+    return {name: float(entry.get(name, default)) for name, default in DEFAULT_PARAMS.items()}
+
+
+def save_params(league, params, scores=None, path=ELO_PARAMS_PATH):
+    path = Path(path)
+    data = dict(load_all(path))
+    if not data and path.exists() and path.read_text().strip() not in ("", "{}"):
+        # never overwrite a file that isn't ours
+        print(f"Not writing {path}: it holds something other than Elo parameters")
+        return False
+    data[league.upper()] = dict(
+        {name: float(params[name]) for name in DEFAULT_PARAMS},
+        **(scores or {}),
+        tuned_on=date.today().isoformat(),
+    )
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True))
+    os.replace(tmp, path)
+    return True
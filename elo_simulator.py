@@ -0,0 +1,250 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+
+import numpy as np
+
+from team_index import get_team_index
+
+CHUNK_RUNS = 2048
+DEFAULT_SEED = 0
+# league-wide playoff fields; conferences and divisions aren't in the schedule data, so seeding is by wins alone
+PLAYOFF_SPOTS = {"MLB": 12, "NBA": 16, "NFL": 14, "NHL": 16, "WNBA": 8}
+SEASON_GAMES = {"MLB": 162, "NBA": 82, "NFL": 17, "NHL": 82, "WNBA": 40}
+# home team of each game in a best-of series, from the higher seed's point of view
+SERIES_HOME = {3: (1, 1, 1), 5: (1, 1, 0, 0, 1), 7: (1, 1, 0, 0, 1, 0, 1)}
+# games in a playoff round; the NFL plays single games
+SERIES_LENGTH = {"MLB": 7, "NBA": 7, "NFL": 1, "NHL": 7, "WNBA": 5}
+
+
+def win_probability(rating_a, rating_b, home_advantage=0.0):
+    # the same logistic curve as EloRating.expected_result, with an optional home bonus for a
+    return 1 / (1 + 10 ** ((rating_b - rating_a - home_advantage) / 400))
+
+
+def season_arrays(ratings, schedule, home_advantage=0.0, base_rating=1500):
+    # schedule: (home, away) pairs; teams with no rating start at the base rating
+    teams = sorted({t for game in schedule for t in game} | set(ratings))
+    index = {team: i for i, team in enumerate(teams)}
+    home = np.fromiter((index[h] for h, _ in schedule), dtype=np.int32, count=len(schedule))
+    away = np.fromiter((index[a] for _, a in schedule), dtype=np.int32, count=len(schedule))
+    rating = np.array([float(ratings.get(t, base_rating)) for t in teams])
+    p_home = win_probability(rating[home], rating[away], home_advantage).astype(np.float32)
+    return teams, home, away, p_home
+
+
+def simulate_chunk(p_home, home, away, n_teams, runs, seed, current_wins, playoff_spots, max_wins):
+    # one batch of seasons: runs x games uniform draws, then every team's wins with one matrix product
+    rng = np.random.default_rng(seed)
+    games = len(p_home)
+    # wins = home wins of the team's home games + away wins of its away games
+    #      = away_games + home_won @ (home_onehot - away_onehot)
+    delta = np.zeros((games, n_teams), dtype=np.float32)
+    delta[np.arange(games), home] += 1
+    delta[np.arange(games), away] -= 1
+    away_games = np.bincount(away, minlength=n_teams).astype(np.float32)
+    home_won = (rng.random((runs, games), dtype=np.float32) < p_home).astype(np.float32)
+    wins = (home_won @ delta + away_games).astype(np.int32) + current_wins
+    # (team, wins) cells flattened so one bincount builds the whole histogram
+    cells = np.arange(n_teams, dtype=np.int64) * (max_wins + 1) + wins
+    histogram = np.bincount(cells.ravel(), minlength=n_teams * (max_wins + 1)).reshape(n_teams, max_wins + 1)
+    playoffs = np.zeros(n_teams, dtype=np.int64)
+    if playoff_spots:
+        # ties for the last spots are broken at random
+        order = np.argsort(-(wins + rng.random(wins.shape, dtype=np.float32)), axis=1)
+        playoffs = np.bincount(order[:, :playoff_spots].ravel(), minlength=n_teams)
+    return runs, histogram, playoffs
+
+
+class SeasonResult:
+    # running totals across finished chunks; every count is an integer, so chunk order never changes the result
+    def __init__(self, teams, max_wins):
+        self.teams = teams
+        self.runs = 0
+        self.histogram = np.zeros((len(teams), max_wins + 1), dtype=np.int64)
+        self.playoffs = np.zeros(len(teams), dtype=np.int64)
+
+    def add(self, runs, histogram, playoffs):
+        self.runs += runs
+        self.histogram += histogram
+        self.playoffs += playoffs
+
+    def mean_wins(self):
+        return self.histogram @ np.arange(self.histogram.shape[1]) / max(self.runs, 1)
+
+    def win_percentile(self, q):
+        cumulative = np.cumsum(self.histogram, axis=1)
+        return (cumulative < q * max(self.runs, 1)).sum(axis=1)
+
+    def playoff_odds(self):
+        return self.playoffs / max(self.runs, 1)
+
+    def series_odds(self, ratings, best_of=7, home_advantage=0.0, base_rating=1500):
+        # each team's chance to win a best-of series against the playoff field, opponents weighted by
+        # how often they make it and home court decided by a coin flip
+        matrix = series_matrix({t: ratings.get(t, base_rating) for t in self.teams}, best_of, home_advantage)
+        odds = self.playoff_odds()
+        result = {}
+        for i, a in enumerate(self.teams):
+            total = odds.sum() - odds[i]
+            weighted = sum(
+                odds[j] * (matrix[(a, b)] + 1 - matrix[(b, a)]) / 2
+                for j, b in enumerate(self.teams) if j != i
+            )
+            result[a] = float(weighted / total) if total else None
+        return result
+
+    def rows(self, series=None):
+        # series: team -> series odds, as from series_odds
+        mean = self.mean_wins()
+        low = self.win_percentile(0.1)
+        high = self.win_percentile(0.9)
+        odds = self.playoff_odds()
+        rows = [
+            {"team": team, "mean_wins": round(float(mean[i]), 2), "wins_p10": int(low[i]), "wins_p90": int(high[i]), "playoff_odds": round(float(odds[i]), 4)}
+            for i, team in enumerate(self.teams)
+        ]
+        if series is not None:
+            for row in rows:
+                value = series.get(row["team"])
+                row["series_odds"] = None if value is None else round(value, 4)
+        return sorted(rows, key=lambda row: -row["mean_wins"])
+
+
+def simulate_season(ratings, schedule, runs=100_000, current_wins=None, playoff_spots=0, home_advantage=0.0,
+                    seed=DEFAULT_SEED, workers=None, chunk_runs=CHUNK_RUNS):
+    # yields a SeasonResult after every finished chunk; the last one covers all runs.
+    # chunk i always gets the i-th child of the seed, so results don't depend on the worker count.
+    teams, home, away, p_home = season_arrays(ratings, schedule, home_advantage)
+    current = np.array([int((current_wins or {}).get(t, 0)) for t in teams], dtype=np.int32)
+    games_left = np.bincount(home, minlength=len(teams)) + np.bincount(away, minlength=len(teams))
+    max_wins = int((current + games_left).max(initial=0))
+    sizes = [min(chunk_runs, runs - start) for start in range(0, runs, chunk_runs)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    result = SeasonResult(teams, max_wins)
+    args = (p_home, home, away, len(teams))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for size, child in zip(sizes, seeds):
+            result.add(*simulate_chunk(*args, size, child, current, playoff_spots, max_wins))
+            yield result
+        return
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(simulate_chunk, *args, size, child, current, playoff_spots, max_wins) for size, child in zip(sizes, seeds)]
+        for future in as_completed(futures):
+            result.add(*future.result())
+            yield result
+    finally:
+        # a caller that stops early (or closes the generator) doesn't wait for chunks nobody will read
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_season(ratings, schedule, runs=100_000, **kwargs):
+    result = None
+    for result in simulate_season(ratings, schedule, runs, **kwargs):
+        pass
+    return result
+
+
+def series_probability(p_home, p_away, best_of=7):
+    # exact chance the higher seed wins a best-of series, given its win probability at home and away
+    pattern = SERIES_HOME.get(best_of) or tuple(1 - i % 2 for i in range(best_of))
+    need = best_of // 2 + 1
+    # states: (higher seed wins, lower seed wins) -> probability
+    states = {(0, 0): 1.0}
+    total = 0.0
+    for home in pattern:
+        p = p_home if home else p_away
+        following = {}
+        for (w, l), prob in states.items():
+            if w == need or l == need:
+                continue
+            following[(w + 1, l)] = following.get((w + 1, l), 0.0) + prob * p
+            following[(w, l + 1)] = following.get((w, l + 1), 0.0) + prob * (1 - p)
+        total += sum(prob for (w, _), prob in following.items() if w == need)
+        states = {state: prob for state, prob in following.items() if state[0] < need and state[1] < need}
+    return total
+
+
+def series_matrix(ratings, best_of=7, home_advantage=0.0):
+    # {(a, b): chance a beats b with a holding home advantage}; pairs are looked up in either order
+    odds = {}
+    for a, b in combinations(sorted(ratings), 2):
+        ra, rb = ratings[a], ratings[b]
+        p = series_probability(win_probability(ra, rb, home_advantage), win_probability(ra, rb, -home_advantage), best_of)
+        q = series_probability(win_probability(rb, ra, home_advantage), win_probability(rb, ra, -home_advantage), best_of)
+        odds[(a, b)] = p
+        odds[(b, a)] = q
+    return odds
+
+
+def synthetic_schedule(league, games=None, seed=DEFAULT_SEED):
+    # a balanced round-robin season of the league's real teams, for benchmarks and dry runs
+    teams = [team["name"] for team in get_team_index().league_teams(league)]
+    games = games or SEASON_GAMES[league.upper()] * len(teams) // 2
+    pairs = [(h, a) for h in teams for a in teams if h != a]
+    rng = random.Random(seed)
+    schedule = []
+    while len(schedule) < games:
+        rng.shuffle(pairs)
+        schedule.extend(pairs[:games - len(schedule)])
+    return schedule
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo season simulation from current Elo ratings")
+    parser.add_argument("--league", default="MLB", choices=sorted(PLAYOFF_SPOTS))
+    parser.add_argument("--runs", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--schedule", help="sports-reference schedule page; unplayed games are simulated")
+    parser.add_argument("--home-advantage", type=float, help="Elo points (default: the league's tuned value)")
+    args = parser.parse_args()
+
+    from elo_columnar import RatingHistory
+    from elo_params import load_params
+
+    if args.home_advantage is None:
+        args.home_advantage = load_params(args.league)["home_advantage"]
+
+    index = get_team_index()
+    ratings = RatingHistory().latest_ratings(args.league)
+    if args.schedule:
+        from schedule_parser import parse_remaining, parse_schedule
+
+        with open(args.schedule, encoding="utf-8") as f:
+            html = f.read()
+        played = parse_schedule(args.league, html)
+        schedule = [(index.canonical_name(args.league, g["home_team"]), index.canonical_name(args.league, g["away_team"]))
+                    for g in parse_remaining(args.league, html)]
+        current = {}
+        for g in played:
+            winner = g["home_team"] if g["home_score"] > g["away_score"] else g["away_team"]
+            winner = index.canonical_name(args.league, winner)
+            current[winner] = current.get(winner, 0) + 1
+    else:
+        schedule = synthetic_schedule(args.league)
+        current = {}
+    if not ratings:
+        print(f"No {args.league} ratings in the Elo store; every team starts at 1500")
+
+    start = time.perf_counter()
+    result = None
+    for result in simulate_season(ratings, schedule, args.runs, current_wins=current, playoff_spots=PLAYOFF_SPOTS[args.league],
+                                  home_advantage=args.home_advantage, seed=args.seed, workers=args.workers):
+        print(f"\r{result.runs:>9}/{args.runs} runs  {time.perf_counter() - start:6.2f}s", end="", flush=True)
+    print(f"\n{len(schedule)} games x {args.runs} runs on {args.workers} workers in {time.perf_counter() - start:.2f}s")
+    best_of = SERIES_LENGTH[args.league]
+    series = result.series_odds(ratings, best_of, args.home_advantage)
+    print(f"series: chance to win a best-of-{best_of} against the playoff field")
+    for row in result.rows(series):
+        series_odds = "" if row["series_odds"] is None else f"  series {row['series_odds']:6.1%}"
+        print(f"{row['team']:28} {row['mean_wins']:7.2f} wins  (p10 {row['wins_p10']:3}, p90 {row['wins_p90']:3})  playoffs {row['playoff_odds']:6.1%}{series_odds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from elo_params import DEFAULT_PARAMS, ELO_PARAMS_PATH, save_params, season_of
+from elo_vectorized import game_arrays, schedule_waves, season_flags
+
+# the parameters searched; base_rating only shifts every rating and never changes a prediction
+SEARCHED = ("k", "home_advantage", "mov_factor", "season_regression")
+GRID = {
+    "k": (4, 8, 12, 16, 20, 25, 30, 40),
+    "home_advantage": (0, 15, 30, 45, 60, 80, 100),
+    "mov_factor": (0.0, 0.5, 1.0),
+    "season_regression": (0.0, 0.2, 0.33, 0.5),
+}
+RANGES = {"k": (2.0, 50.0), "home_advantage": (0.0, 120.0), "mov_factor": (0.0, 1.0), "season_regression": (0.0, 0.6)}
+# ratings are still settling in the first season; its games are played but not scored
+BURN_IN_SEASONS = 1
+CANDIDATES_PER_TASK = 64
+EPS = 1e-12
+
+
+class Backtest:
+    # one league's history as arrays, laid out wave by wave, built once and shared by every candidate
+    def __init__(self, league, games, base_rating=DEFAULT_PARAMS["base_rating"], burn_in=BURN_IN_SEASONS):
+        games = sorted(games, key=lambda g: g["game_date"])
+        self.league = league
+        self.base_rating = float(base_rating)
+        names, home, away, home_win, margin = game_arrays(games)
+        seasons = [season_of(league, g["game_date"]) for g in games]
+        new_home, new_away, _ = season_flags(home, away, seasons, len(names))
+        labels = sorted(set(seasons))
+        # a single season is scored whole rather than not at all
+        first_scored = labels[min(burn_in, len(labels) - 1)] if labels else 0
+        scored = np.array(seasons, dtype=np.int64) >= first_scored
+        waves = schedule_waves(home, away, len(names))
+        order = np.argsort(waves, kind="stable")
+        bounds = np.flatnonzero(np.diff(waves[order])) + 1
+        self.n_teams = len(names)
+        self.n_games = len(games)
+        self.n_scored = int(scored.sum())
+        # every wave is a contiguous slice of these; a team appears at most once per wave
+        self.home = home[order]
+        self.away = away[order]
+        self.result = home_win[order].astype(np.float64)
+        self.margin = np.log1p(np.abs(margin[order]))
+        self.new_home = new_home[order]
+        self.new_away = new_away[order]
+        self.scored = scored[order]
+        self.slices = [
+            (s, e, bool(self.new_home[s:e].any() or self.new_away[s:e].any()), bool(self.scored[s:e].any()))
+            for s, e in zip([0] + bounds.tolist(), bounds.tolist() + [len(order)])
+        ]
+
+    def score(self, params):
+        # params: (candidates, 4) in SEARCHED order -> log loss and Brier score per candidate
+        params = np.asarray(params, dtype=np.float64)
+        c = len(params)
+        k = params[:, 0:1]
+        hfa = params[:, 1:2]
+        mov = params[:, 2:3]
+        keep = 1 - params[:, 3:4]
+        base = self.base_rating
+        ratings = np.full((c, self.n_teams), base)
+        log_loss = np.zeros(c)
+        brier = np.zeros(c)
+        use_mov = bool(mov.any())
+        for s, e, regress, scored in self.slices:
+            h = self.home[s:e]
+            a = self.away[s:e]
+            rh = ratings[:, h]
+            ra = ratings[:, a]
+            if regress:
+                rh = np.where(self.new_home[s:e], base + keep * (rh - base), rh)
+                ra = np.where(self.new_away[s:e], base + keep * (ra - base), ra)
+            y = self.result[s:e]
+            diff = rh + hfa - ra
+            expected = 1 / (1 + 10 ** (-diff / 400))
+            if scored:
+                mask = self.scored[s:e]
+                p = np.clip(expected[:, mask], EPS, 1 - EPS)
+                ym = y[mask]
+                log_loss -= (ym * np.log(p) + (1 - ym) * np.log(1 - p)).sum(axis=1)
+                brier += ((p - ym) ** 2).sum(axis=1)
+            change = k * (y - expected)
+            if use_mov:
+                winner_diff = np.where(y > 0, diff, -diff)
+                change *= 1 + mov * (self.margin[s:e] * 2.2 / (winner_diff * 0.001 + 2.2) - 1)
+            ratings[:, h] = rh + change
+            ratings[:, a] = ra - change
+        n = max(self.n_scored, 1)
+        return log_loss / n, brier / n
+
+
+def grid_candidates(grid=GRID):
+    return np.array(list(itertools.product(*(grid[name] for name in SEARCHED))), dtype=np.float64)
+
+
+def random_candidates(n, seed=0, ranges=RANGES):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(*ranges[name], size=n) for name in SEARCHED])
+
+
+_backtest = None
+
+
+def _init_worker(backtest):
+    # each worker receives the arrays once and keeps them for every task
+    global _backtest
+    _backtest = backtest
+
+
+def _score_chunk(params):
+    return _backtest.score(params)
+
+
+def tune(backtest, candidates, workers=None, chunk=CANDIDATES_PER_TASK):
+    # scores every candidate; returns (log_loss, brier) arrays aligned with candidates
+    chunks = [candidates[i:i + chunk] for i in range(0, len(candidates), chunk)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        scores = [backtest.score(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(backtest,)) as pool:
+            scores = list(pool.map(_score_chunk, chunks))
+    return np.concatenate([s[0] for s in scores]), np.concatenate([s[1] for s in scores])
+
+
+def best_params(candidates, log_loss, brier):
+    i = int(np.argmin(log_loss))
+    params = dict(DEFAULT_PARAMS, **{name: float(candidates[i][j]) for j, name in enumerate(SEARCHED)})
+    return params, {"log_loss": round(float(log_loss[i]), 6), "brier": round(float(brier[i]), 6)}
+
+
+def load_games(league, source):
+    # previously fetched games only; nothing here scrapes
+    if source == "db":
+        from persistence import get_database
+
+        with get_database("sqlserver").connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT game_date, home_team, away_team, home_score, away_score FROM elo_{league.lower()} ORDER BY game_date, game_seq")
+            rows = cursor.fetchall()
+            cursor.close()
+        return [
+            {"game_date": r[0], "home_team": r[1], "away_team": r[2], "home_score": int(r[3]), "away_score": int(r[4])}
+            for r in rows
+        ]
+    from elo_batch_processor import LEAGUE_INFO, YEARS, parse_game_data
+
+    if source == "cache":
+        from page_cache import PageCache
+
+        cache = PageCache()
+        pages = [cache.get(LEAGUE_INFO[league].format(year)) for year in YEARS]
+    else:
+        pages = [Path(source, f"{league.lower()}.html").read_text(encoding="utf-8")]
+    return [g for html in pages if html for g in parse_game_data(league, html)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest Elo parameters per league and save the best by log loss")
+    parser.add_argument("--leagues", default="NBA,WNBA,MLB,NFL,NHL")
+    parser.add_argument("--source", default="db", help="db (the elo_<league> tables), cache (stored schedule pages) or a directory of <league>.html pages")
+    parser.add_argument("--search", choices=("grid", "random"), default="grid")
+    parser.add_argument("--samples", type=int, default=500, help="candidates for --search random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", type=Path, default=ELO_PARAMS_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="report without writing parameters")
+    args = parser.parse_args()
+
+    candidates = grid_candidates() if args.search == "grid" else random_candidates(args.samples, args.seed)
+    written = False
+    for league in args.leagues.upper().split(","):
+        games = load_games(league, args.source)
+        if not games:
+            print(f"{league}: no games in {args.source}")
+            continue
+        start = time.perf_counter()
+        backtest = Backtest(league, games)
+        log_loss, brier = tune(backtest, candidates, args.workers)
+        params, scores = best_params(candidates, log_loss, brier)
+        baseline = backtest.score([[DEFAULT_PARAMS[name] for name in SEARCHED]])
+        print(f"{league}: {len(candidates)} candidates over {backtest.n_games} games ({backtest.n_scored} scored) in {time.perf_counter() - start:.1f}s")
+        print(f"  best   {', '.join(f'{n}={params[n]:g}' for n in SEARCHED)}  log loss {scores['log_loss']:.4f}  Brier {scores['brier']:.4f}")
+        print(f"  default log loss {baseline[0][0]:.4f}  Brier {baseline[1][0]:.4f}")
+        if not args.dry_run:
+            written = save_params(league, params, dict(scores, games=backtest.n_scored), args.out) or written
+    if written:
+        # ratings already stored were built with the old parameters
+        print(f"Parameters written to {args.out}; run elo_batch_processor.py --full to rebuild ratings with them")
+
+
+if __name__ == "__main__":
+    main()
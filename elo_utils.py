@@ -1,89 +1,86 @@
-import json
-import os
+from functools import partial
+
+import numpy as np
+import pandas as pd
 
 from elo import update_elo_ratings
-from team_mapping import get_team_mapping
+from elo_params import load_params
+from team_index import get_team_index
+from persistence import get_database
+from rating_store import ELO_HISTORY_PATH, get_store
 from dotenv import load_dotenv
 
 load_dotenv("creds.ev")
 
 def run_elo_pipeline():
-    update_elo_ratings()
+    ratings = update_elo_ratings(ELO_HISTORY_PATH)
+    if ratings:
+        get_store().publish(ELO_HISTORY_PATH, ratings)
+    else:
+        # nothing was written; readers go back to whatever the file holds
+        get_store().invalidate(ELO_HISTORY_PATH)
+
+MERGED_COLUMNS = [
+    "league", "date", "home", "away", "elo_home", "elo_away",
+    "prob_home", "prob_away", "fair_ml_home", "fair_ml_away",
+    "market_ml_home", "market_ml_away", "spread", "total",
+    "value_edge_home", "value_edge_away"
+]
+
+def load_elo_ratings(path=ELO_HISTORY_PATH):
+    return get_store().get(path).data
+
+def fair_moneyline(prob):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(prob >= 0.5, -100 * prob / (1 - prob), 100 * (1 - prob) / prob)
+
+def merge_market_frame(league, market, elo_data, mapping=None):
+    # columnar merge: one pass of name/rating lookups, then array math for every game at once
+    if not isinstance(market, pd.DataFrame):
+        market = pd.DataFrame(list(market))
+    if market.empty:
+        return pd.DataFrame(columns=MERGED_COLUMNS)
+    if mapping is None:
+        # BetIQ spellings resolve to the sports-reference names the ratings are keyed by
+        canonical = partial(get_team_index().canonical_name, league)
+    else:
+        canonical = lambda t: mapping.get(t, t)
+    home = [canonical(t) for t in market["home"]]
+    away = [canonical(t) for t in market["away"]]
+    # object arrays keep the ratings exactly as stored (int stays int) for the output rows
+    elo_home = np.array([elo_data.get(t, 1500) for t in home], dtype=object)
+    elo_away = np.array([elo_data.get(t, 1500) for t in away], dtype=object)
+    # a tuned league's home advantage counts toward the home side, as it did when its ratings were built
+    home_advantage = load_params(league)["home_advantage"]
+    prob_home = 1 / (1 + 10 ** ((elo_away.astype(float) - elo_home.astype(float) - home_advantage) / 400))
+    prob_away = 1 - prob_home
+    return pd.DataFrame({
+        "league": league,
+        "date": market["date"].to_numpy(),
+        "home": home,
+        "away": away,
+        "elo_home": elo_home,
+        "elo_away": elo_away,
+        "prob_home": np.round(prob_home, 4),
+        "prob_away": np.round(prob_away, 4),
+        "fair_ml_home": np.rint(fair_moneyline(prob_home)).astype(np.int64),
+        "fair_ml_away": np.rint(fair_moneyline(prob_away)).astype(np.int64),
+        "market_ml_home": market["ml_home"].to_numpy(),
+        "market_ml_away": market["ml_away"].to_numpy(),
+        "spread": market["spread"].to_numpy(),
+        "total": market["total"].to_numpy(),
+        "value_edge_home": np.round(prob_home - market["ml_home_prob"].to_numpy(dtype=float), 4) * 100,
+        "value_edge_away": np.round(prob_away - market["ml_away_prob"].to_numpy(dtype=float), 4) * 100,
+    }, columns=MERGED_COLUMNS)
+
+def value_side(df):
+    return np.where(df["value_edge_home"] > df["value_edge_away"], "HOME", "AWAY")
 
-def merge_market_with_elo(league, market_games):
-    with open("elo_history.json", "r") as f:
-        elo_data = json.load(f)
-    mapping = get_team_mapping(league)
-    merged = []
-    for g in market_games:
-        home = mapping.get(g["home"], g["home"])
-        away = mapping.get(g["away"], g["away"])
-        elo_home = elo_data.get(home, 1500)
-        elo_away = elo_data.get(away, 1500)
-        prob_home = 1 / (1 + 10 ** ((elo_away - elo_home) / 400))
-        prob_away = 1 - prob_home
-        fair_ml_home = -100 * prob_home / (1 - prob_home) if prob_home >= 0.5 else 100 * (1 - prob_home) / prob_home
-        fair_ml_away = -100 * prob_away / (1 - prob_away) if prob_away >= 0.5 else 100 * (1 - prob_away) / prob_away
-        edge_home = round(prob_home - g["ml_home_prob"], 4) * 100
-        edge_away = round(prob_away - g["ml_away_prob"], 4) * 100
-        merged.append({
-            "league": league,
-            "date": g["date"],
-            "home": home,
-            "away": away,
-            "elo_home": elo_home,
-            "elo_away": elo_away,
-            "prob_home": round(prob_home, 4),
-            "prob_away": round(prob_away, 4),
-            "fair_ml_home": round(fair_ml_home),
-            "fair_ml_away": round(fair_ml_away),
-            "market_ml_home": g["ml_home"],
-            "market_ml_away": g["ml_away"],
-            "spread": g["spread"],
-            "total": g["total"],
-            "value_edge_home": edge_home,
-            "value_edge_away": edge_away
-        })
-    return merged
+def merge_market_with_elo(league, market_games, elo_data=None):
+    if elo_data is None:
+        elo_data = load_elo_ratings()
+    return merge_market_frame(league, market_games, elo_data).to_dict("records")
 
 def save_betting_data(league, data):
-    conn = psycopg2.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        dbname=os.getenv("DB_NAME")
-    )
-    cur = conn.cursor()
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS betting_odds (
-            id SERIAL PRIMARY KEY,
-            game_date DATE,
-            league VARCHAR(10),
-            home_team VARCHAR(20),
-            away_team VARCHAR(20),
-            elo_home INT,
-            elo_away INT,
-            market_ml_home INT,
-            market_ml_away INT,
-            spread FLOAT,
-            total FLOAT,
-            value_home FLOAT,
-            value_away FLOAT
-        )
-    """)
-    for g in data:
-        cur.execute("""
-            INSERT INTO betting_odds 
-            (game_date, league, home_team, away_team, elo_home, elo_away,
-             market_ml_home, market_ml_away, spread, total, value_home, value_away)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            g["date"], g["league"], g["home"], g["away"],
-            g["elo_home"], g["elo_away"],
-            g["market_ml_home"], g["market_ml_away"],
-            g["spread"], g["total"],
-            g["value_edge_home"], g["value_edge_away"]
-        ))
-    conn.commit()
-    cur.close()
-    conn.close()
+    # pooled connection, schema created once per process, one bulk upsert per league
+    return get_database("postgres").upsert_betting_odds(data)
@@ -0,0 +1,140 @@
+import math
+
+import numpy as np
+
+
+def index_teams(home_teams, away_teams, names=None):
+    index = {name: i for i, name in enumerate(names or [])}
+    home_idx = np.fromiter((index.setdefault(t, len(index)) for t in home_teams), dtype=np.int32, count=len(home_teams))
+    away_idx = np.fromiter((index.setdefault(t, len(index)) for t in away_teams), dtype=np.int32, count=len(away_teams))
+    return list(index), home_idx, away_idx
+
+
+def schedule_waves(home_idx, away_idx, n_teams):
+    # a game only depends on earlier games of its two teams, so games can be
+    # grouped into waves in which no team appears twice and updated together.
+    # elo_tuning uses this to score many parameter sets at once; for a single run a league's
+    # waves are ~15 games wide and per-wave numpy overhead loses to the plain loop in BatchElo
+    last = [0] * n_teams
+    waves = np.empty(len(home_idx), dtype=np.int32)
+    for i, (h, a) in enumerate(zip(home_idx.tolist(), away_idx.tolist())):
+        w = last[h] if last[h] > last[a] else last[a]
+        waves[i] = w
+        last[h] = last[a] = w + 1
+    return waves
+
+
+def season_flags(home_idx, away_idx, seasons, n_teams, last_season=None):
+    # marks each side's first game of a new season; teams without a previous season are never regressed.
+    # also returns every team's season after these games, for the next incremental run
+    last = list(last_season or []) + [None] * (n_teams - len(last_season or []))
+    new_home = np.zeros(len(home_idx), dtype=bool)
+    new_away = np.zeros(len(away_idx), dtype=bool)
+    for i, (h, a, season) in enumerate(zip(home_idx.tolist(), away_idx.tolist(), seasons)):
+        new_home[i] = last[h] is not None and last[h] != season
+        new_away[i] = last[a] is not None and last[a] != season
+        last[h] = last[a] = season
+    return new_home, new_away, last
+
+
+def mov_multiplier(margin, winner_diff, mov_factor):
+    # 1 at mov_factor 0; at 1 the log-margin multiplier, damped when the favourite wins big
+    return 1 + mov_factor * (math.log1p(abs(margin)) * 2.2 / (winner_diff * 0.001 + 2.2) - 1)
+
+
+class BatchElo:
+    def __init__(self, k=20, base_rating=1500, home_advantage=0.0, mov_factor=0.0, season_regression=0.0):
+        self.k = k
+        self.base_rating = base_rating
+        self.home_advantage = home_advantage
+        self.mov_factor = mov_factor
+        self.season_regression = season_regression
+
+    @property
+    def extended(self):
+        return bool(self.home_advantage or self.mov_factor or self.season_regression)
+
+    def run(self, home_idx, away_idx, home_win, n_teams, ratings=None, margin=None, new_season=None):
+        # margin (home minus away score) and new_season (home, away flags) are only read by the extended model
+        if ratings is None:
+            ratings = np.full(n_teams, float(self.base_rating))
+        if self.extended and len(home_idx):
+            return self._run_extended(home_idx, away_idx, home_win, ratings, margin, new_season)
+        return self._run_sequential(home_idx, away_idx, home_win, ratings)
+
+    def _run_sequential(self, home_idx, away_idx, home_win, ratings):
+        # one sweep over plain lists indexed by team code
+        values = ratings.tolist()
+        k = float(self.k)
+        home_before = []
+        away_before = []
+        home_after = []
+        away_after = []
+        for h, a, res in zip(home_idx.tolist(), away_idx.tolist(), np.asarray(home_win, dtype=np.float64).tolist()):
+            rh = values[h]
+            ra = values[a]
+            # same expression order as EloRating.update_ratings so results match bit for bit
+            new_h = rh + k * (res - 1 / (1 + 10 ** ((ra - rh) / 400)))
+            new_a = ra + k * ((1 - res) - 1 / (1 + 10 ** ((rh - ra) / 400)))
+            values[h] = new_h
+            values[a] = new_a
+            home_before.append(rh)
+            away_before.append(ra)
+            home_after.append(new_h)
+            away_after.append(new_a)
+        ratings[:] = values
+        return ratings, np.array(home_before), np.array(away_before), np.array(home_after), np.array(away_after)
+
+    def _run_extended(self, home_idx, away_idx, home_win, ratings, margin, new_season):
+        # home advantage, margin of victory and season regression; elo_tuning.backtest is the
+        # same model vectorized across parameter sets
+        values = ratings.tolist()
+        k = float(self.k)
+        base = float(self.base_rating)
+        hfa = float(self.home_advantage)
+        keep = 1 - float(self.season_regression)
+        n = len(home_idx)
+        margins = margin.tolist() if margin is not None and self.mov_factor else [0] * n
+        new_home, new_away = (new_season[0].tolist(), new_season[1].tolist()) if new_season is not None and self.season_regression else ([False] * n, [False] * n)
+        home_before = np.empty(n)
+        away_before = np.empty(n)
+        home_after = np.empty(n)
+        away_after = np.empty(n)
+        for i, (h, a, res) in enumerate(zip(home_idx.tolist(), away_idx.tolist(), np.asarray(home_win, dtype=np.float64).tolist())):
+            rh = values[h]
+            ra = values[a]
+            if new_home[i]:
+                rh = base + keep * (rh - base)
+            if new_away[i]:
+                ra = base + keep * (ra - base)
+            diff = rh + hfa - ra
+            expected = 1 / (1 + 10 ** (-diff / 400))
+            mult = mov_multiplier(margins[i], diff if res else -diff, self.mov_factor) if self.mov_factor else 1.0
+            change = k * mult * (res - expected)
+            values[h] = rh + change
+            values[a] = ra - change
+            home_before[i] = rh
+            away_before[i] = ra
+            home_after[i] = values[h]
+            away_after[i] = values[a]
+        ratings[:] = values
+        return ratings, home_before, away_before, home_after, away_after
+
+
+def game_arrays(games, names=None):
+    names, home_idx, away_idx = index_teams([g["home_team"] for g in games], [g["away_team"] for g in games], names=names)
+    home_win = np.fromiter((g["home_score"] > g["away_score"] for g in games), dtype=bool, count=len(games))
+    margin = np.fromiter((g["home_score"] - g["away_score"] for g in games), dtype=np.float64, count=len(games))
+    return names, home_idx, away_idx, home_win, margin
+
+
+def run_elo_batch(games, k=20, base_rating=1500, home_advantage=0.0, mov_factor=0.0, season_regression=0.0, season_of=None):
+    # season_of(game_date) labels seasons for the regression; without it ratings carry over untouched
+    games = sorted(games, key=lambda x: x["game_date"])
+    names, home_idx, away_idx, home_win, margin = game_arrays(games)
+    new_season = None
+    if season_regression and season_of is not None:
+        new_season = season_flags(home_idx, away_idx, [season_of(g["game_date"]) for g in games], len(names))[:2]
+    elo = BatchElo(k, base_rating, home_advantage, mov_factor, season_regression)
+    ratings, hb, ab, ha, aa = elo.run(home_idx, away_idx, home_win, len(names), margin=margin, new_season=new_season)
+    return games, names, ratings, (hb, ab, ha, aa)
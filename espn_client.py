@@ -0,0 +1,195 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+BASE_URL = os.getenv("ESPN_BASE_URL", "https://site.api.espn.com/apis/site/v2/sports")
+SPORTS = ["baseball/mlb", "football/nfl", "basketball/nba", "basketball/wnba", "hockey/nhl"]
+
+# (connect, read) timeouts in seconds; a slow league only costs its own budget
+DEFAULT_TIMEOUT = (3.05, 6)
+LEAGUE_TIMEOUTS = {}
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.25
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=len(SPORTS), thread_name_prefix="espn-fetch")
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(SPORTS), pool_maxsize=len(SPORTS) * 4)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+            _session = session
+    return _session
+
+
+class FetchStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_downloaded = 0
+        self.parses_skipped = 0
+        self.time_saved = 0.0
+
+    def record(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "not_modified": self.not_modified,
+                "bytes_downloaded": self.bytes_downloaded,
+                "parses_skipped": self.parses_skipped,
+                "time_saved": round(self.time_saved, 6),
+            }
+
+
+STATS = FetchStats()
+# called with (url, body) for every downloaded body that differs from the last one for its url
+PAYLOAD_HOOKS = []
+STAT_METRICS = {
+    "requests": "espn_requests_total",
+    "not_modified": "espn_not_modified_total",
+    "bytes_downloaded": "espn_bytes_downloaded_total",
+    "parses_skipped": "espn_parses_skipped_total",
+    "time_saved": "espn_parse_seconds_saved_total",
+}
+metrics.register_collector(lambda: [(STAT_METRICS[name], {}, value) for name, value in STATS.as_dict().items()])
+
+# url -> validators, body digest, last parsed payload and what parsing it cost
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def add_payload_hook(fn):
+    PAYLOAD_HOOKS.append(fn)
+
+
+def _conditional_headers(entry):
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _handle_ok(url, response, entry):
+    body = response.content
+    STATS.record(bytes_downloaded=len(body))
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    if entry and entry["digest"] == digest:
+        # byte-identical body: reuse the previous parse
+        STATS.record(parses_skipped=1, time_saved=entry["parse_seconds"])
+        with _cache_lock:
+            entry.update(validators)
+        return entry["data"], False
+    for hook in PAYLOAD_HOOKS:
+        try:
+            hook(url, body)
+        except Exception as e:
+            print(f"Payload hook failed for {url}: {e}")
+    started = time.perf_counter()
+    try:
+        data = response.json()
+    except ValueError:
+        return None, True
+    parse_seconds = time.perf_counter() - started
+    with _cache_lock:
+        _cache[url] = dict(validators, digest=digest, data=data, parse_seconds=parse_seconds)
+    return data, True
+
+
+def get_with_retry(url, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, headers=None, stats=None):
+    # the first response that isn't a retryable status, or None once every attempt has failed
+    session = get_session()
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(url, timeout=timeout, headers=headers)
+            if stats is not None:
+                stats.record(requests=1)
+        except (requests.ConnectionError, requests.Timeout):
+            response = None
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            return response
+        if attempt < retries:
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+    return None
+
+
+def fetch_json_conditional(url, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES):
+    with _cache_lock:
+        entry = _cache.get(url)
+    headers = _conditional_headers(entry) if entry else {}
+    response = get_with_retry(url, timeout, retries, headers=headers, stats=STATS)
+    if response is not None:
+        if response.status_code == 304 and entry:
+            STATS.record(not_modified=1, parses_skipped=1, time_saved=entry["parse_seconds"])
+            return entry["data"], False
+        if response.status_code == 200:
+            return _handle_ok(url, response, entry)
+    return None, True
+
+
+def fetch_json(url, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES):
+    return fetch_json_conditional(url, timeout=timeout, retries=retries)[0]
+
+
+def get_json(url, timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES):
+    # a plain GET for callers with their own cache; stays out of the scoreboard's validator cache and STATS
+    response = get_with_retry(url, timeout, retries)
+    if response is None or response.status_code != 200:
+        return None
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+
+def fetch_league(sport_path, base_url=None, timeout=None, retries=MAX_RETRIES):
+    url = f"{base_url or BASE_URL}/{sport_path}/scoreboard"
+    timeout = timeout or LEAGUE_TIMEOUTS.get(sport_path, DEFAULT_TIMEOUT)
+    league = sport_path.split("/")[1]
+    with metrics.span("espn_fetch_seconds", league=league):
+        data, changed = fetch_json_conditional(url, timeout=timeout, retries=retries)
+    metrics.inc("espn_fetch_total", league=league, result="error" if data is None else "changed" if changed else "unchanged")
+    return data, changed
+
+
+def fetch_all_leagues(sports=None, base_url=None, timeout=None, retries=MAX_RETRIES):
+    # sport_path -> (data, changed); changed is False when the payload matches the last poll
+    sports = sports or SPORTS
+    futures = {
+        sport_path: _executor.submit(fetch_league, sport_path, base_url, timeout, retries)
+        for sport_path in sports
+    }
+    wait(futures.values())
+    results = {}
+    for sport_path, future in futures.items():
+        try:
+            results[sport_path] = future.result()
+        except Exception:
+            results[sport_path] = (None, True)
+    return results
@@ -0,0 +1,175 @@
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from espn_client import SPORTS
+from team_index import get_team_index
+
+# a local stand-in for ESPN's scoreboard API, for benchmarks and load tests
+
+
+def make_event(league, i, home, away, tick, rng):
+    inning = 1 + (tick + i) // 6
+    return {
+        "id": f"{league}-{i}",
+        # the scoreboard only keeps events dated today in local time
+        "date": datetime.now().strftime("%Y-%m-%dT%H:%MZ"),
+        "competitions": [{
+            "competitors": [
+                {"homeAway": "home", "score": str((tick + i) // 7), "team": {"displayName": home["name"], "abbreviation": home["abbreviation"]}},
+                {"homeAway": "away", "score": str((tick + 2 * i) // 9), "team": {"displayName": away["name"], "abbreviation": away["abbreviation"]}},
+            ],
+            "status": {
+                "period": min(inning, 4),
+                "displayClock": f"{11 - tick % 12}:{rng.randint(0, 59):02d}",
+                "type": {"state": "in", "shortDetail": f"Top {inning}th"},
+            },
+            "situation": {
+                "balls": tick % 4, "strikes": (tick + i) % 3, "onFirst": bool(tick % 2), "onSecond": False, "onThird": bool(i % 2),
+                "pitcher": {"athlete": {"displayName": f"Pitcher {i}"}},
+                "lastPlay": {"athlete": {"displayName": f"Batter {tick % 9}"}},
+                "possession": {"displayName": home["name"]},
+            },
+        }],
+    }
+
+
+class StubScoreboards:
+    def __init__(self, games_per_league=8, tick_seconds=5.0, seed=0, detail_delay=0.0):
+        self.games_per_league = games_per_league
+        self.detail_delay = detail_delay
+        self.detail_requests = 0
+        self.tick_seconds = tick_seconds
+        self.seed = seed
+        self.started = time.monotonic()
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def tick(self):
+        # every game moves on once per tick, so conditional GETs see 304s in between
+        return int((time.monotonic() - self.started) / self.tick_seconds) if self.tick_seconds else 0
+
+    def payload(self, sport_path):
+        tick = self.tick()
+        with self._lock:
+            cached = self._cache.get(sport_path)
+            if cached and cached[0] == tick:
+                return cached[1], cached[2]
+        league = sport_path.rsplit("/", 1)[-1]
+        teams = get_team_index().league_teams(league)
+        rng = random.Random(f"{self.seed}:{league}:{tick}")
+        n = min(self.games_per_league, len(teams) // 2)
+        events = [make_event(league, i, teams[2 * i], teams[2 * i + 1], tick, rng) for i in range(n)]
+        body = json.dumps({"day": {"date": datetime.now().date().isoformat()}, "events": events}).encode()
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        with self._lock:
+            self._cache[sport_path] = (tick, body, etag)
+        return body, etag
+
+
+def make_roster(sport_path, team_id):
+    league = sport_path.rsplit("/", 1)[-1]
+    players = [
+        {"displayName": f"{team_id.upper()} Player {n}", "jersey": str(n), "position": {"abbreviation": ("G", "F", "C")[n % 3]}}
+        for n in range(1, 16)
+    ]
+    # basketball rosters are flat, the other sports group players by position
+    athletes = players if league in ("nba", "wnba") else [{"position": "all", "items": players}]
+    return {"team": {"abbreviation": team_id.upper(), "recordSummary": "10-5", "standingSummary": "2nd in Division"}, "athletes": athletes}
+
+
+def make_handler(boards):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0].strip("/")
+            with boards._lock:
+                boards.requests += 1
+            if path.endswith("/roster"):
+                sport_path, _, team_id = path[:-len("/roster")].rpartition("/teams/")
+                if boards.detail_delay:
+                    time.sleep(boards.detail_delay)
+                body = json.dumps(make_roster(sport_path, team_id)).encode()
+                with boards._lock:
+                    boards.detail_requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            sport_path = path.rsplit("/scoreboard", 1)[0]
+            if sport_path not in SPORTS:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body, etag = boards.payload(sport_path)
+            if self.headers.get("If-None-Match") == etag:
+                with boards._lock:
+                    boards.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class StubServer:
+    def __init__(self, host="127.0.0.1", port=0, boards=None, **kwargs):
+        # boards is anything with payload(sport_path) -> (body, etag), e.g. a recorded night's ReplaySource
+        self.boards = boards or StubScoreboards(**kwargs)
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self.boards))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="espn-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic ESPN scoreboards; point ESPN_BASE_URL at it")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--games", type=int, default=8, help="live games per league")
+    parser.add_argument("--tick", type=float, default=5.0, help="seconds between game updates")
+    args = parser.parse_args()
+    server = StubServer(port=args.port, games_per_league=args.games, tick_seconds=args.tick)
+    print(f"ESPN_BASE_URL={server.url}", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,20 @@
-
 import streamlit as st
-import requests
 
-def fetch_team_stats(team_id):
-    url = f"https://site.api.espn.com/apis/site/v2/sports/basketball/nba/teams/{team_id}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        return None
-    return response.json()
+from game_state import game_key
+from team_details import get_team_detail_service
+from team_index import get_team_index
+
+DETAIL_WAIT = 5
 
 def display_game_details(game):
-    with st.expander("More Game Details"):
-        sport = game.get("sport", "")
-        away = game.get("away_team", {})
-        home = game.get("home_team", {})
+    sport = game.get("sport", "")
+    away = game.get("away_team", {})
+    home = game.get("home_team", {})
+    # the body only runs while the expander is open
+    expander = st.expander(f"More Game Details: {away.get('name', '')} @ {home.get('name', '')}", key=f"details-{game_key(game)}", on_change="rerun")
+    with expander:
+        if not expander.open:
+            return
 
         st.subheader("Team Info & Odds")
 
@@ -23,28 +24,27 @@ def display_game_details(game):
         st.markdown("- Over/Under: 211.5")
         st.markdown("- Moneyline: Home -140 / Away +120")
 
-        if sport == "nba":
-            # ESPN team IDs could be mapped or extracted from full API
-            away_team_id = get_team_id_from_name(away["name"])
-            home_team_id = get_team_id_from_name(home["name"])
-            away_stats = fetch_team_stats(away_team_id)
-            home_stats = fetch_team_stats(home_team_id)
-
-            if away_stats:
-                st.markdown(f"### {away['name']} Player Stats")
-                for player in away_stats.get("athletes", []):
-                    st.write(f"- **{player.get('displayName', '')}**: {player.get('position', {}).get('abbreviation', '')}")
-
-            if home_stats:
-                st.markdown(f"### {home['name']} Player Stats")
-                for player in home_stats.get("athletes", []):
-                    st.write(f"- **{player.get('displayName', '')}**: {player.get('position', {}).get('abbreviation', '')}")
-
-def get_team_id_from_name(team_name):
-    mapping = {
-        "Boston Celtics": "2",
-        "Los Angeles Lakers": "13",
-        "Golden State Warriors": "9",
-        # Add more team mappings here
-    }
-    return mapping.get(team_name, "")
+        service = get_team_detail_service()
+        # both teams are requested before waiting on either; prefetched teams come straight from memory
+        pending = []
+        for team in (away, home):
+            team_id = get_team_id_from_name(team.get("name", ""), sport)
+            if team_id:
+                pending.append((team, service.request(sport, team_id)))
+        for team, future in pending:
+            try:
+                details = future.result(DETAIL_WAIT)
+            except Exception:
+                st.info(f"Still loading {team['name']} details...")
+                continue
+            if not details:
+                continue
+            summary = " · ".join(s for s in (details["record"], details["standing"]) if s)
+            st.markdown(f"### {team['name']} Roster" + (f" ({summary})" if summary else ""))
+            for player in details["players"]:
+                st.write(f"- **{player['name']}**: {player['position']}")
+
+def get_team_id_from_name(team_name, league="nba"):
+    # ESPN's team endpoints accept the abbreviation used in its logo URLs
+    team = get_team_index().resolve(league, team_name)
+    return team["id"] if team else ""
@@ -0,0 +1,168 @@
+import threading
+from collections import OrderedDict
+from html import escape
+from string import Template
+
+import metrics
+from game_state import game_key
+
+# compiled once at import; every card is a substitution into one of these
+TEAM_PANEL = Template(
+    "<div class='card-team' style='background: linear-gradient(135deg, $primary, $secondary);'>"
+    "<h3>$name</h3><img src=\"$logo\" width=\"100\" /><p class='card-score'>$score</p></div>"
+)
+MLB_INFO = Template(
+    "<div class='info-box'>"
+    "⚾ <strong>Inning:</strong> $inning<br/>"
+    "🧢 <strong>At Bat:</strong> $at_bat<br/>"
+    "🥎 <strong>Pitcher:</strong> $pitcher<br/>"
+    "🎯 <strong>Count:</strong> $balls Balls, $strikes Strikes"
+    "<div class='diamond'>"
+    "<div class='base second $second'></div><div class='base third $third'></div>"
+    "<div class='base first $first'></div><div class='base mound'></div>"
+    "</div></div>"
+)
+BASKETBALL_INFO = Template(
+    "<div class='info-box'>"
+    "🏀 <strong>Quarter:</strong> $quarter<br/>"
+    "⏱️ <strong>Clock:</strong> $clock"
+    "<div class='court responsive-court'>"
+    "<div class='half-court'></div><div class='top-hoop'></div><div class='bottom-hoop'></div>"
+    "<div class='top-ft-arc'></div><div class='bottom-ft-arc'></div>"
+    "<div class='top-3pt-arc'></div><div class='bottom-3pt-arc'></div>"
+    "</div></div>"
+)
+NFL_INFO = Template("<div class='info-text'><strong>Quarter:</strong> $quarter<br>🟢 Possession: $possession</div>")
+NHL_INFO = Template("<div class='info-text'><strong>Period:</strong> $period<br>⏱️ Clock: $clock</div>")
+CARD = Template("<div class='game-card' data-gid='$gid'>$away<div class='card-info'>$info</div>$home</div>")
+
+MAX_CARDS = 512
+
+
+def text(value):
+    return escape(str(value), quote=True)
+
+
+def render_team_panel(team):
+    return TEAM_PANEL.substitute(
+        primary=text(team["colors"][0]),
+        secondary=text(team["colors"][1]),
+        name=text(team["name"]),
+        logo=text(team["logo"]),
+        score=text(team["score"]),
+    )
+
+
+def render_info_panel(sport_lower, info):
+    if sport_lower == "mlb":
+        return MLB_INFO.substitute(
+            inning=text(info.get("inning", "")),
+            at_bat=text(info.get("at_bat", "N/A")),
+            pitcher=text(info.get("pitcher", "N/A")),
+            balls=text(info.get("balls", 0)),
+            strikes=text(info.get("strikes", 0)),
+            first="active" if info.get("onFirst") else "",
+            second="active" if info.get("onSecond") else "",
+            third="active" if info.get("onThird") else "",
+        )
+    elif sport_lower in ["nba", "wnba"]:
+        return BASKETBALL_INFO.substitute(quarter=text(info.get("quarter", "N/A")), clock=text(info.get("clock", "")))
+    elif sport_lower == "nfl":
+        return NFL_INFO.substitute(quarter=text(info.get("quarter", "N/A")), possession=text(info.get("possession", "")))
+    elif sport_lower == "nhl":
+        return NHL_INFO.substitute(period=text(info.get("period", "N/A")), clock=text(info.get("clock", "")))
+    return ""
+
+
+def state_hash(game):
+    # everything a card shows, and nothing else, so a card is re-rendered only when it would look different
+    away = game["away_team"]
+    home = game["home_team"]
+    return hash((
+        game.get("sport", ""),
+        away["name"], away["score"], away["logo"], *away["colors"],
+        home["name"], home["score"], home["logo"], *home["colors"],
+        *game.get("info", {}).items(),
+    ))
+
+
+def render_card(game):
+    return CARD.substitute(
+        gid=text(game_key(game)),
+        away=render_team_panel(game["away_team"]),
+        info=render_info_panel(game.get("sport", ""), game.get("info", {})),
+        home=render_team_panel(game["home_team"]),
+    )
+
+
+class CardRenderer:
+    # shared by every session: rendering is a pure function of the game's visible state
+    def __init__(self, max_cards=MAX_CARDS):
+        self.max_cards = max_cards
+        self._lock = threading.Lock()
+        self._cards = OrderedDict()
+        self._blocks = {}
+        self.renders = 0
+        self.hits = 0
+
+    def card(self, game):
+        key = (game_key(game), state_hash(game))
+        with self._lock:
+            html = self._cards.get(key)
+            if html is not None:
+                self._cards.move_to_end(key)
+                self.hits += 1
+                return html
+        html = render_card(game)
+        with self._lock:
+            self._cards[key] = html
+            self.renders += 1
+            while len(self._cards) > self.max_cards:
+                self._cards.popitem(last=False)
+        return html
+
+    def league_block(self, league, games):
+        with metrics.span("card_render_seconds", league=league.lower()):
+            return self._league_block(league, games)
+
+    def _league_block(self, league, games):
+        # one HTML block per league; an unchanged slate reuses the joined string as well
+        keys = [(game_key(game), state_hash(game)) for game in games]
+        with self._lock:
+            block = self._blocks.get(league)
+            if block is not None and block[0] == keys:
+                self.hits += len(keys)
+                return block[1]
+            cards = [self._cards.get(key) for key in keys]
+        for i, html in enumerate(cards):
+            if html is None:
+                cards[i] = render_card(games[i])
+        with self._lock:
+            for key, html in zip(keys, cards):
+                if key in self._cards:
+                    self._cards.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self._cards[key] = html
+                    self.renders += 1
+            while len(self._cards) > self.max_cards:
+                self._cards.popitem(last=False)
+            html = f"<div class='card-list' data-league='{text(league.lower())}'>" + "".join(cards) + "</div>"
+            self._blocks[league] = (keys, html)
+        return html
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_card_renderer():
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = CardRenderer()
+            metrics.register_collector(lambda: [
+                ("card_cache_hits_total", {}, _renderer.hits),
+                ("card_renders_total", {}, _renderer.renders),
+            ])
+    return _renderer
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import deque
+
+# info keys that make up each change category a card cares about
+CHANGE_FIELDS = {
+    "clock": ("inning", "quarter", "period", "clock"),
+    "bases": ("onFirst", "onSecond", "onThird"),
+    "count": ("balls", "strikes"),
+    "possession": ("possession",),
+    "matchup": ("at_bat", "pitcher"),
+}
+
+
+def game_key(game):
+    if game.get("id"):
+        return f"{game['sport']}:{game['id']}"
+    return f"{game['sport']}:{game['away_team']['name']}@{game['home_team']['name']}"
+
+
+def diff_game(old, new):
+    changed = []
+    if (old["away_team"]["score"], old["home_team"]["score"]) != (new["away_team"]["score"], new["home_team"]["score"]):
+        changed.append("score")
+    if old.get("state") != new.get("state"):
+        changed.append("status")
+    old_info = old.get("info", {})
+    new_info = new.get("info", {})
+    for field, keys in CHANGE_FIELDS.items():
+        if any(old_info.get(k) != new_info.get(k) for k in keys):
+            changed.append(field)
+    if not changed and old != new:
+        changed.append("other")
+    return tuple(changed)
+
+
+class GameStateStore:
+    def __init__(self, history=2000):
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._games = {}
+        self._revisions = {}
+        self._changes = deque(maxlen=history)
+        self._view = ((), {})
+        self.version = 0
+        self.updated_at = None
+
+    def apply(self, league, games):
+        with self._lock:
+            changes = {}
+            seen = set()
+            for game in games:
+                gid = game_key(game)
+                seen.add(gid)
+                old = self._games.get(gid)
+                fields = ("added",) if old is None else diff_game(old, game)
+                if not fields:
+                    continue
+                self._games[gid] = game
+                changes[gid] = fields
+            for gid in [gid for gid, g in self._games.items() if g["sport"] == league and gid not in seen]:
+                del self._games[gid]
+                changes[gid] = ("removed",)
+            if changes:
+                self.version += 1
+                for gid, fields in changes.items():
+                    self._changes.append((self.version, gid, fields))
+                    if fields == ("removed",):
+                        self._revisions.pop(gid, None)
+                    else:
+                        self._revisions[gid] = self.version
+                # games and their revisions are swapped in together so readers see a consistent pair
+                self._view = (tuple(self._games.values()), dict(self._revisions))
+                self._changed.notify_all()
+            self.updated_at = time.time()
+            return changes
+
+    def publish(self, league_games):
+        changes = {}
+        for league, games in league_games.items():
+            changes.update(self.apply(league, games))
+        return changes
+
+    def snapshot(self):
+        return self._view[0]
+
+    def league_games(self, league):
+        return [g for g in self._view[0] if g["sport"] == league]
+
+    def view(self):
+        return self._view
+
+    def revision(self, gid):
+        return self._view[1].get(gid, 0)
+
+    def wait_for_change(self, version, timeout=None):
+        # blocks until the store moves past version; returns the current version
+        with self._changed:
+            self._changed.wait_for(lambda: self.version > version, timeout)
+            return self.version
+
+    def changes_since(self, version):
+        # None means the feed no longer reaches back that far; re-read the snapshot
+        with self._lock:
+            if version >= self.version:
+                return self.version, {}
+            if not self._changes or self._changes[0][0] > version:
+                return None
+            merged = {}
+            for v, gid, fields in self._changes:
+                if v > version:
+                    merged.setdefault(gid, set()).update(fields)
+            return self.version, merged
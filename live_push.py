@@ -0,0 +1,304 @@
+import json
+import os
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import metrics
+from game_state import game_key
+
+# local browsers only unless the operator widens the bind or proxies the port (PUSH_PUBLIC_URL)
+PUSH_HOST = os.getenv("PUSH_HOST", "127.0.0.1")
+PUSH_PORT = int(os.getenv("PUSH_PORT", "8502"))
+# set when the push port is served through a proxy; otherwise the browser uses the page's host
+PUSH_PUBLIC_URL = os.getenv("PUSH_PUBLIC_URL", "")
+# dashboard origins allowed to read the stream cross-origin; a same-origin proxy needs none
+PUSH_ALLOWED_ORIGINS = os.getenv("PUSH_ALLOWED_ORIGINS", "http://localhost:8501,http://127.0.0.1:8501")
+KEEPALIVE = 15.0
+BACKLOG = 256
+
+# runs in st.iframe, whose srcdoc frame is same-origin with the app, and patches the cards in the
+# parent page. If the parent can't be reached or the stream never connects, the server never sees
+# this session and the dashboard keeps polling reruns.
+CLIENT_JS = """
+(function () {
+  var w;
+  try {
+    w = window.parent;
+    w.document.body;
+  } catch (e) {
+    return;
+  }
+  if (w.__liveScores) { return; }
+  var base = %(url)s || (w.location.protocol + "//" + w.location.hostname + ":%(port)d");
+  var es = new w.EventSource(base + "/events?session=" + encodeURIComponent(%(session)s));
+  w.__liveScores = es;
+  function find(gid) {
+    return w.document.querySelector('.game-card[data-gid="' + w.CSS.escape(gid) + '"]');
+  }
+  function apply(message) {
+    Object.keys(message.cards).forEach(function (gid) {
+      var card = message.cards[gid];
+      var template = w.document.createElement("template");
+      template.innerHTML = card.html;
+      var el = find(gid);
+      if (el) {
+        el.replaceWith(template.content.firstChild);
+      } else {
+        var list = w.document.querySelector('.card-list[data-league="' + card.league + '"]');
+        if (list) { list.appendChild(template.content.firstChild); }
+      }
+    });
+    (message.removed || []).forEach(function (gid) {
+      var el = find(gid);
+      if (el) { el.remove(); }
+    });
+  }
+  es.addEventListener("snapshot", function (e) { apply(JSON.parse(e.data)); });
+  es.addEventListener("delta", function (e) { apply(JSON.parse(e.data)); });
+})();
+"""
+
+
+def sse_message(event, version, payload):
+    return f"id: {version}\nevent: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n".encode()
+
+
+class DeltaFeed:
+    # each store version is rendered and encoded once, then written as-is to every client
+    def __init__(self, store, renderer, backlog=BACKLOG):
+        self.store = store
+        self.renderer = renderer
+        self._cond = threading.Condition()
+        self._messages = deque(maxlen=backlog)
+        self.version = store.version
+        self._stop = threading.Event()
+        self._thread = None
+        self._snapshot = None
+
+    def _card(self, game):
+        return {"league": game["sport"].lower(), "html": self.renderer.card(game)}
+
+    def snapshot(self):
+        # clients connecting at the same version share one encoded snapshot
+        # version first: games newer than the id only mean a delta gets applied twice
+        version = self.store.version
+        games, _ = self.store.view()
+        cached = self._snapshot
+        if cached and cached[0] == version:
+            return cached
+        self._snapshot = version, sse_message("snapshot", version, {
+            "version": version,
+            "cards": {game_key(g): self._card(g) for g in games},
+            "removed": [],
+        })
+        return self._snapshot
+
+    def _publish(self):
+        result = self.store.changes_since(self.version)
+        if result is None:
+            # the store's change log no longer covers our last version; clients resync from a snapshot
+            version, message = self.snapshot()
+        else:
+            version, changes = result
+            if not changes:
+                return
+            games = {game_key(g): g for g in self.store.snapshot()}
+            message = sse_message("delta", version, {
+                "version": version,
+                "cards": {gid: self._card(games[gid]) for gid in changes if gid in games},
+                "removed": [gid for gid in changes if gid not in games],
+            })
+        with self._cond:
+            # a snapshot covers every earlier version, a delta only those since the previous message
+            base = 0 if result is None else self.version
+            self._messages.append((base, version, message))
+            self.version = version
+            self._cond.notify_all()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.store.wait_for_change(self.version, timeout=1.0) > self.version:
+                self._publish()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="live-push-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def messages_after(self, version):
+        # (version the messages bring the client to, messages), read together so nothing published
+        # in between is skipped; None when the backlog can't catch the client up and it needs a snapshot
+        with self._cond:
+            if version == self.version:
+                return self.version, []
+            if version > self.version:
+                # an id from before a restart
+                return None
+            pending = [(base, v, m) for base, v, m in self._messages if v > version]
+            if not pending or pending[0][0] > version:
+                return None
+            return self.version, [m for _, _, m in pending]
+
+    def catch_up(self, version):
+        # messages_after, falling back to a snapshot
+        result = None if version is None else self.messages_after(version)
+        if result is None:
+            version, message = self.snapshot()
+            return version, [message]
+        return result
+
+    def wait(self, version, timeout):
+        with self._cond:
+            self._cond.wait_for(lambda: self.version > version, timeout)
+            return self.version
+
+
+class PushHTTPServer(ThreadingHTTPServer):
+    # browsers reconnect together after a restart; the default listen backlog of 5 drops most of them
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def make_handler(server):
+    feed = server.feed
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/client.js":
+                self._send_body(server.client_js().encode(), "application/javascript")
+            elif url.path == "/events":
+                self._stream(parse_qs(url.query))
+            else:
+                self._send_body(b"not found", "text/plain", 404)
+
+        def _send_body(self, body, content_type, status=200):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self._cors()
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, query):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self._cors()
+            self.end_headers()
+            since = self.headers.get("Last-Event-ID") or query.get("since", [None])[0]
+            session = query.get("session", [""])[0]
+            server.connected(1, session)
+            try:
+                version, pending = feed.catch_up(int(since) if since and since.isdigit() else None)
+                self._write(pending)
+                while not server.closing:
+                    if feed.wait(version, KEEPALIVE) == version:
+                        self._write([b": keepalive\n\n"])
+                        continue
+                    version, pending = feed.catch_up(version)
+                    self._write(pending)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                server.connected(-1, session)
+
+        def _cors(self):
+            # only the dashboard's own origin may read the feed from another port
+            origin = self.headers.get("Origin")
+            if origin and origin in server.allowed_origins:
+                self.send_header("Access-Control-Allow-Origin", origin)
+                self.send_header("Vary", "Origin")
+
+        def _write(self, messages):
+            for message in messages:
+                self.wfile.write(message)
+                server.sent(len(message))
+            self.wfile.flush()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class PushServer:
+    def __init__(self, store, renderer, host=PUSH_HOST, port=PUSH_PORT, public_url=PUSH_PUBLIC_URL,
+                 allowed_origins=PUSH_ALLOWED_ORIGINS):
+        self.feed = DeltaFeed(store, renderer)
+        self.public_url = public_url
+        self.allowed_origins = {o.strip().rstrip("/") for o in allowed_origins.split(",") if o.strip()}
+        self.closing = False
+        self._lock = threading.Lock()
+        self.clients = 0
+        self._sessions = {}
+        self.bytes_sent = 0
+        self.messages_sent = 0
+        self.httpd = PushHTTPServer((host, port), make_handler(self))
+        self.port = self.httpd.server_address[1]
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def connected(self, delta, session=""):
+        with self._lock:
+            self.clients += delta
+            if session:
+                count = self._sessions.get(session, 0) + delta
+                if count > 0:
+                    self._sessions[session] = count
+                else:
+                    self._sessions.pop(session, None)
+
+    def is_live(self, session):
+        # whether this dashboard session's browser currently holds a stream
+        with self._lock:
+            return self._sessions.get(session, 0) > 0
+
+    def sent(self, size):
+        with self._lock:
+            self.bytes_sent += size
+            self.messages_sent += 1
+
+    def client_js(self, session=""):
+        return CLIENT_JS % {"url": json.dumps(self.public_url), "port": self.port, "session": json.dumps(session)}
+
+    def start(self):
+        self.feed.start()
+        threading.Thread(target=self.httpd.serve_forever, name="live-push", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.closing = True
+        self.feed.stop()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+_server = None
+_server_lock = threading.Lock()
+_server_failed = False
+
+
+def get_push_server(store, renderer):
+    # None when the push port can't be bound; the dashboard then falls back to polling reruns
+    global _server, _server_failed
+    with _server_lock:
+        if _server is None and not _server_failed:
+            try:
+                _server = PushServer(store, renderer).start()
+                metrics.register_collector(lambda: [
+                    ("push_clients", {}, _server.clients),
+                    ("push_messages_sent_total", {}, _server.messages_sent),
+                    ("push_bytes_sent_total", {}, _server.bytes_sent),
+                ])
+            except OSError as e:
+                print(f"Live push disabled: {e}")
+                _server_failed = True
+    return _server
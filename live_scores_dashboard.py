@@ -1,105 +1,24 @@
 import streamlit as st
-import requests
-from datetime import datetime, date
-from team_colors_all_leagues import team_colors as TEAM_COLORS
-from all_team_logos import team_logos as TEAM_LOGOS
 from pathlib import Path
+from uuid import uuid4
+from streamlit_autorefresh import st_autorefresh
+from scoreboard_poller import POLL_INTERVAL, get_poller
+from game_cards import get_card_renderer
 from expandable_game_view import display_game_details
+from live_push import get_push_server
+from metrics import get_metrics_server
 
-import pandas as pd
-import json
-from elo_utils import run_elo_pipeline, merge_market_with_elo, save_betting_data
-from betiq_scraper import scrape_betiq_odds
+BETTING_LEAGUES = ["mlb", "nba", "nfl", "nhl", "wnba"]
+# with live push the page only reruns to pick up new games, tabs and betting data
+STRUCTURE_REFRESH = 300
 
-# Auto-refresh every 10 seconds
-st_autorefresh(interval=10_000, key="refresh")
+@st.cache_resource
+def load_styles():
+    return Path("styles.html").read_text()
 
 st.set_page_config(page_title="Live Sports Scoreboard", layout="wide")
-st.markdown(Path("styles.html").read_text(), unsafe_allow_html=True)
+st.markdown(load_styles(), unsafe_allow_html=True)
 st.title("🏟️ Live American Sports Scoreboard")
-st.caption("🔁 Auto-refreshing every 10 seconds...")
-
-def get_team_colors(team_name):
-    colors = TEAM_COLORS.get(team_name)
-    if colors:
-        return [colors["primary"], colors["secondary"]]
-    return ["#333", "#555"]
-
-def get_team_logo(team_name):
-    return TEAM_LOGOS.get(team_name, "")
-
-def format_game_team_data(team):
-    return {
-        "name": team["team"]["displayName"],
-        "score": team.get("score", "0"),
-        "colors": get_team_colors(team["team"]["displayName"]),
-        "logo": get_team_logo(team["team"]["displayName"])
-    }
-
-@st.cache_data(ttl=5)
-def fetch_espn_scores():
-    base_url = "https://site.api.espn.com/apis/site/v2/sports"
-    sports = ["baseball/mlb", "football/nfl", "basketball/nba", "basketball/wnba", "hockey/nhl"]
-    games = []
-    today = date.today().isoformat()
-    for sport_path in sports:
-        response = requests.get(f"{base_url}/{sport_path}/scoreboard")
-        if response.status_code != 200:
-            continue
-        data = response.json()
-        league_slug = sport_path.split("/")[1]
-        for event in data.get("events", []):
-            if event.get("date", "").split("T")[0] != today:
-                continue
-            competition = event.get("competitions", [{}])[0]
-            competitors = competition.get("competitors", [])
-            if len(competitors) < 2:
-                continue
-
-            away = next((team for team in competitors if team["homeAway"] == "away"), None)
-            home = next((team for team in competitors if team["homeAway"] == "home"), None)
-
-            if not away or not home:
-                continue
-
-            info = {}
-            status = competition.get("status", {})
-            situation = competition.get("situation", {})
-
-            if league_slug == "mlb":
-                info = {
-                    "inning": status.get("type", {}).get("shortDetail", ""),
-                    "at_bat": situation.get("lastPlay", {}).get("athlete", {}).get("displayName", "N/A"),
-                    "pitcher": situation.get("pitcher", {}).get("athlete", {}).get("displayName", "N/A"),
-                    "onFirst": situation.get("onFirst", False),
-                    "onSecond": situation.get("onSecond", False),
-                    "onThird": situation.get("onThird", False),
-                    "balls": situation.get("balls", 0),
-                    "strikes": situation.get("strikes", 0),
-                }
-            elif league_slug == "nfl":
-                info = {
-                    "quarter": f"Q{status.get('period', 'N/A')}",
-                    "possession": situation.get("possession", {}).get("displayName", "N/A")
-                }
-            elif league_slug in ["nba", "wnba"]:
-                info = {
-                    "quarter": f"Q{status.get('period', 'N/A')}",
-                    "clock": status.get("displayClock", "")
-                }
-            elif league_slug == "nhl":
-                info = {
-                    "period": f"Period {status.get('period', 'N/A')}",
-                    "clock": status.get("displayClock", "")
-                }
-
-            games.append({
-                "sport": league_slug,
-                "away_team": format_game_team_data(away),
-                "home_team": format_game_team_data(home),
-                "info": info
-            })
-    return games
 
 sport_icons = {
     "NBA": "https://a.espncdn.com/i/teamlogos/leagues/500/nba.png",
@@ -109,109 +28,119 @@ sport_icons = {
     "MLB": "https://a.espncdn.com/i/teamlogos/leagues/500/mlb.png",
 }
 
-games = fetch_espn_scores()
+poller = get_poller()
+poller.wait_for_first_poll(timeout=15)
+games = poller.store.snapshot()
+card_renderer = get_card_renderer()
+push = get_push_server(poller.store, card_renderer)
+get_metrics_server()
+
+if push:
+    # score changes are patched into the cards in the browser as the poller publishes them
+    push_session = st.session_state.setdefault("push_session", uuid4().hex)
+    st.iframe(f"<script>{push.client_js(push_session)}</script>", height="content")
+# polling reruns until this browser's stream is up, and for browsers that can't reach it
+if push and push.is_live(push_session):
+    st_autorefresh(interval=STRUCTURE_REFRESH * 1000, key="refresh")
+    st.caption("⚡ Live updates as scores change")
+else:
+    # Reruns line up with the shared poller; sessions never hit ESPN themselves
+    st_autorefresh(interval=POLL_INTERVAL * 1000, key="refresh")
+    st.caption(f"🔁 Auto-refreshing every {POLL_INTERVAL} seconds...")
 
 available_sports = sorted(set(game.get("sport", "").upper() for game in games))
 
 tabs_keys = available_sports + ["Betting Info"]
-tabs = st.tabs(tabs_keys)
-
-def update_betting_predictions():
-    run_elo_pipeline()
-    leagues = ["mlb", "nba", "nfl", "nhl", "wnba"]
-    for league in leagues:
-        market_odds = scrape_betiq_odds(league)
-        merged = merge_market_with_elo(league, market_odds)
-        save_betting_data(league, merged)
-        with open(f"{league}_predicted_odds.json", "w") as f:
-            json.dump(merged, f, indent=2)
+# only the selected tab runs, so Betting Info's dependencies load the first time it is opened
+tabs = st.tabs(tabs_keys, key="main_tabs", on_change="rerun")
+
+def get_betting_frame(league):
+    import pandas as pd
+    from elo_utils import value_side
+    from rating_store import predictions_snapshot
+
+    # one DataFrame per session per predictions snapshot; steady-state reruns touch no files
+    snap = predictions_snapshot(league)
+    frames = st.session_state.setdefault("betting_frames", {})
+    cached = frames.get(league)
+    if cached and cached[0] == snap.version:
+        return cached[1]
+    df = pd.DataFrame(snap.data)
+    df["Value On"] = value_side(df)
+    frames[league] = (snap.version, df)
+    return df
+
+def show_refresh_status(status):
+    if status is None:
+        return
+    stages = status["stages"]
+    done = sum(1 for stage in stages.values() if stage in ("done", "failed"))
+    if status["state"] == "running":
+        st.info(f"⏳ Refreshing Elo ratings + odds: {done}/{len(stages)} leagues done ({', '.join(f'{l.upper()}: {s}' for l, s in stages.items())})")
+    elif status["state"] == "succeeded" and not status["errors"]:
+        st.success("Betting predictions updated!")
+    else:
+        st.warning(f"Betting refresh finished with errors: {status['errors']}")
+
+def render_betting_tab():
+    from refresh_jobs import get_refresh_runner
+
+    refresh_runner = get_refresh_runner()
+    st.header("📈 Elo Predictions vs BetIQ Market")
+    if st.button("🔁 Refresh Elo Ratings + Odds"):
+        # returns immediately; clicks during a run join the run in progress
+        refresh_runner.submit()
+    status = refresh_runner.status()
+    if push and push.is_live(push_session) and status and status["state"] == "running":
+        # the structure refresh is too slow to follow a job; poll its progress until it finishes
+        st_autorefresh(interval=POLL_INTERVAL * 1000, key="refresh_job")
+    show_refresh_status(status)
+    betting_tabs = st.tabs([l.upper() for l in BETTING_LEAGUES], key="betting_tabs", on_change="rerun")
+    for j, league in enumerate(BETTING_LEAGUES):
+        with betting_tabs[j]:
+            if not betting_tabs[j].open:
+                continue
+            try:
+                st.dataframe(get_betting_frame(league), use_container_width=True)
+            except Exception as e:
+                st.warning(f"Could not load betting data for {league.upper()}: {e}")
 
 for i, tab_key in enumerate(tabs_keys):
     with tabs[i]:
+        if not tabs[i].open:
+            continue
         if tab_key == "Betting Info":
-            st.header("📈 Elo Predictions vs BetIQ Market")
-            if st.button("🔁 Refresh Elo Ratings + Odds"):
-                update_betting_predictions()
-                st.success("Betting predictions updated!")
-            leagues = ["mlb", "nba", "nfl", "nhl", "wnba"]
-            betting_tabs = st.tabs([l.upper() for l in leagues])
-            for j, league in enumerate(leagues):
-                with betting_tabs[j]:
-                    try:
-                        with open(f"{league}_predicted_odds.json", "r") as f:
-                            data = json.load(f)
-                        df = pd.DataFrame(data)
-                        df["Value On"] = df.apply(lambda x: "HOME" if x["value_edge_home"] > x["value_edge_away"] else "AWAY", axis=1)
-                        st.dataframe(df, use_container_width=True)
-                    except Exception as e:
-                        st.warning(f"Could not load betting data for {league.upper()}: {e}")
+            render_betting_tab()
         else:
             sport = tab_key
             icon_url = sport_icons.get(sport, "")
             st.markdown(f"<h2 style='display:flex; align-items:center; gap:8px;'><img src='{icon_url}' height='32'/> {sport} Games</h2>", unsafe_allow_html=True)
             filtered_games = [game for game in games if game.get("sport", "").upper() == sport]
+            # one element per league instead of columns and three markdown blocks per game
+            st.markdown(card_renderer.league_block(sport, filtered_games), unsafe_allow_html=True)
             for game in filtered_games:
-                away_team = game["away_team"]
-                home_team = game["home_team"]
-                info = game.get("info", {})
-                col1, col2, col3 = st.columns([3, 2, 3])
-                with col1:
-                    st.markdown(f"""
-                        <div style='background: linear-gradient(135deg, {away_team['colors'][0]}, {away_team['colors'][1]}); border-radius: 10px; padding: 10px;'>
-                            <h3>{away_team['name']}</h3>
-                            <img src="{away_team['logo']}" width="100" />
-                            <p style='font-size: 36px; margin: 10px 0;'>{away_team['score']}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                with col2:
-                    sport_lower = sport.lower()
-                    if sport_lower == "mlb":
-                        first = 'active' if info.get('onFirst') else ''
-                        second = 'active' if info.get('onSecond') else ''
-                        third = 'active' if info.get('onThird') else ''
-                        at_bat = info.get('at_bat', 'N/A')
-                        pitcher = info.get('pitcher', 'N/A')
-                        balls = info.get('balls', 0)
-                        strikes = info.get('strikes', 0)
-                        st.markdown(f"""
-                            <div class='info-box'>
-                                ⚾ <strong>Inning:</strong> {info.get('inning', '')}<br/>
-                                🧢 <strong>At Bat:</strong> {at_bat}<br/>
-                                🥎 <strong>Pitcher:</strong> {pitcher}<br/>
-                                🎯 <strong>Count:</strong> {balls} Balls, {strikes} Strikes
-                                <div class='diamond'>
-                                    <div class='base second {second}'></div>
-                                    <div class='base third {third}'></div>
-                                    <div class='base first {first}'></div>
-                                    <div class='base mound'></div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    elif sport_lower in ["nba", "wnba"]:
-                        st.markdown(f"""
-                            <div class='info-box'>
-                                🏀 <strong>Quarter:</strong> {info.get('quarter', 'N/A')}<br/>
-                                ⏱️ <strong>Clock:</strong> {info.get('clock', '')}
-                                <div class='court responsive-court'>
-                                    <div class='half-court'></div>
-                                    <div class='top-hoop'></div>
-                                    <div class='bottom-hoop'></div>
-                                    <div class='top-ft-arc'></div>
-                                    <div class='bottom-ft-arc'></div>
-                                    <div class='top-3pt-arc'></div>
-                                    <div class='bottom-3pt-arc'></div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    elif sport_lower == "nfl":
-                        st.markdown(f"**Quarter:** {info.get('quarter', 'N/A')}<br>🟢 Possession: {info.get('possession', '')}", unsafe_allow_html=True)
-                    elif sport_lower == "nhl":
-                        st.markdown(f"**Period:** {info.get('period', 'N/A')}<br>⏱️ Clock: {info.get('clock', '')}", unsafe_allow_html=True)
-                with col3:
-                    st.markdown(f"""
-                        <div style='background: linear-gradient(135deg, {home_team['colors'][0]}, {home_team['colors'][1]}); border-radius: 10px; padding: 10px;'>
-                            <h3>{home_team['name']}</h3>
-                            <img src="{home_team['logo']}" width="100" />
-                            <p style='font-size: 36px; margin: 10px 0;'>{home_team['score']}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
+                display_game_details(game)
+
+def render_diagnostics():
+    import metrics
+
+    expander = st.expander("🩺 Diagnostics", key="diagnostics", on_change="rerun")
+    with expander:
+        if not expander.open:
+            return
+        st.markdown("**Stage timings**")
+        st.table([
+            {"stage": name, **labels, "count": h["count"], "mean ms": round(h["sum"] / h["count"] * 1000, 2) if h["count"] else 0.0,
+             "p50 ms ≤": h["p50"] * 1000, "p95 ms ≤": h["p95"] * 1000}
+            for name, labels, h in sorted(metrics.REGISTRY.histograms(), key=lambda item: (item[0], sorted(item[1].items())))
+        ])
+        st.markdown("**Counters**")
+        st.table([{"metric": name, "labels": ", ".join(f"{k}={v}" for k, v in sorted(labels.items())), "value": value}
+                  for name, labels, value in sorted(metrics.REGISTRY.counters(), key=lambda item: (item[0], sorted(item[1].items())))])
+        server = get_metrics_server()
+        if server:
+            st.caption(f"Prometheus metrics: http://<host>:{server.port}/metrics")
+
+# ?diagnostics=1 shows per-stage timings and cache counters at the bottom of the page
+if st.query_params.get("diagnostics") == "1":
+    render_diagnostics()
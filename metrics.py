@@ -0,0 +1,244 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# loopback by default; set METRICS_HOST=0.0.0.0 for a scraper on another machine
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+# METRICS_ENABLED=0 turns every span and counter into a no-op
+ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+# seconds; covers a cached card render up to a cold Selenium page load
+BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in pairs) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        # upper bound of the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    # one lock and plain dicts: an observation is a bisect and a few adds
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help = {}
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def inc(self, name, value=1, **labels):
+        key = (name, label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def register_collector(self, fn):
+        # fn() -> [(name, labels, value)] read at scrape time, for counts other modules already keep;
+        # names ending in _total are counters, anything else a gauge
+        with self._lock:
+            self._collectors.append(fn)
+
+    def collected(self):
+        with self._lock:
+            collectors = list(self._collectors)
+        values = []
+        for fn in collectors:
+            try:
+                values.extend(fn())
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+        return values
+
+    def counters(self):
+        with self._lock:
+            values = [(name, dict(key), value) for (name, key), value in self._counters.items()]
+        return values + self.collected()
+
+    def histograms(self):
+        with self._lock:
+            return [
+                (name, dict(key), {"count": h.count, "sum": h.sum, "p50": h.quantile(0.5), "p95": h.quantile(0.95)})
+                for (name, key), h in self._histograms.items()
+            ]
+
+    def render(self):
+        # Prometheus text exposition format 0.0.4
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                ((name, key), (list(h.counts), h.count, h.sum)) for (name, key), h in self._histograms.items()
+            )
+        counters += sorted(((name, label_key(labels)), value) for name, labels, value in self.collected())
+        seen = set()
+        for (name, key), value in counters:
+            if name not in seen:
+                seen.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                # collectors also report current values such as connected clients
+                lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+            lines.append(f"{name}{format_labels(key)} {value}")
+        for (name, key), (counts, count, total) in histograms:
+            if name not in seen:
+                seen.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{format_labels(key, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{format_labels(key, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{format_labels(key)} {total}")
+            lines.append(f"{name}_count{format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class span:
+    # with span("espn_fetch_seconds", league="nba"): ... records the block's wall time
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if ENABLED:
+            REGISTRY.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+def inc(name, value=1, **labels):
+    if ENABLED:
+        REGISTRY.inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    if ENABLED:
+        REGISTRY.observe(name, value, **labels)
+
+
+def describe(name, text):
+    REGISTRY.describe(name, text)
+
+
+def register_collector(fn):
+    REGISTRY.register_collector(fn)
+
+
+describe("espn_fetch_seconds", "ESPN scoreboard request time per league, including retries")
+describe("scoreboard_normalize_seconds", "Time to normalize one league's scoreboard payload")
+describe("card_render_seconds", "Time to build one league's game card block")
+describe("betiq_scrape_seconds", "BetIQ predictions scrape time per league and method")
+describe("betiq_pages_total", "Pages loaded in pooled browsers")
+describe("db_write_seconds", "Time spent writing rows per table")
+describe("db_rows_written_total", "Rows upserted per table")
+
+
+def make_handler(registry):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class MetricsServer:
+    def __init__(self, registry=REGISTRY, host=METRICS_HOST, port=METRICS_PORT):
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(registry))
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, name="metrics", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+_server = None
+_server_lock = threading.Lock()
+_server_failed = False
+
+
+def get_metrics_server():
+    # None when the port is taken, e.g. by a second Streamlit process on the same host
+    global _server, _server_failed
+    with _server_lock:
+        if _server is None and not _server_failed and ENABLED:
+            try:
+                _server = MetricsServer().start()
+            except OSError as e:
+                print(f"Metrics endpoint disabled: {e}")
+                _server_failed = True
+    return _server
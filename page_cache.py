@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+CACHE_DIR = Path(os.getenv("PAGE_CACHE_DIR", ".page_cache"))
+
+# sports-reference sites throttle aggressive clients; stay well under their limit
+HOST_CONCURRENCY = 1
+HOST_MIN_INTERVAL = 3.0
+REQUEST_TIMEOUT = 30
+
+
+class PageCache:
+    def __init__(self, root=CACHE_DIR):
+        self.root = Path(root)
+        self.index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                self._index = json.loads(self.index_path.read_text())
+            except (FileNotFoundError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _object_path(self, digest):
+        return self.root / "objects" / digest[:2] / f"{digest}.html"
+
+    def get(self, url, final_only=False):
+        with self._lock:
+            entry = self._load_index().get(url)
+        if not entry or (final_only and not entry.get("final")):
+            return None
+        try:
+            return self._object_path(entry["sha256"]).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def put(self, url, text, final=False):
+        body = text.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+        with self._lock:
+            index = self._load_index()
+            index[url] = {"sha256": digest, "fetched_at": time.time(), "final": final}
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(index, indent=2))
+            os.replace(tmp, self.index_path)
+        return digest
+
+
+class HostLimiter:
+    def __init__(self, concurrency=HOST_CONCURRENCY, min_interval=HOST_MIN_INTERVAL):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._last_request = {}
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.Semaphore(self.concurrency)
+                self._last_request[host] = 0.0
+            return self._slots[host]
+
+    def fetch(self, session, url):
+        host = urlparse(url).netloc
+        with self._slot(host):
+            with self._lock:
+                wait_for = self._last_request[host] + self.min_interval - time.monotonic()
+            if wait_for > 0:
+                time.sleep(wait_for)
+            try:
+                return session.get(url, timeout=REQUEST_TIMEOUT)
+            finally:
+                with self._lock:
+                    self._last_request[host] = time.monotonic()
+
+
+_session = requests.Session()
+_limiter = HostLimiter()
+_cache = PageCache()
+
+
+def fetch_page(url, final=False, cache=None, limiter=None):
+    # final pages (completed seasons) are served from disk forever once stored
+    cache = cache or _cache
+    cached = cache.get(url, final_only=True)
+    if cached is not None:
+        return cached
+    try:
+        response = (limiter or _limiter).fetch(_session, url)
+    except requests.RequestException:
+        response = None
+    if response is None or response.status_code != 200:
+        # fall back to whatever copy we have rather than losing the season
+        return cache.get(url)
+    cache.put(url, response.text, final=final)
+    return response.text
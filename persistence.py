@@ -0,0 +1,216 @@
+import csv
+import io
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from operator import itemgetter
+
+import metrics
+
+BETTING_COLUMNS = (
+    "game_date", "league", "home_team", "away_team", "elo_home", "elo_away",
+    "market_ml_home", "market_ml_away", "spread", "total", "value_home", "value_away"
+)
+BETTING_KEY = ("league", "game_date", "home_team", "away_team")
+
+BETTING_SCHEMA = {
+    "postgres": [
+        """
+        CREATE TABLE IF NOT EXISTS betting_odds (
+            id SERIAL PRIMARY KEY,
+            game_date DATE,
+            league VARCHAR(10),
+            home_team VARCHAR(20),
+            away_team VARCHAR(20),
+            elo_home INT,
+            elo_away INT,
+            market_ml_home INT,
+            market_ml_away INT,
+            spread FLOAT,
+            total FLOAT,
+            value_home FLOAT,
+            value_away FLOAT
+        )
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS betting_odds_game_key ON betting_odds (league, game_date, home_team, away_team)",
+    ],
+    "sqlite": [
+        """
+        CREATE TABLE IF NOT EXISTS betting_odds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            game_date DATE,
+            league VARCHAR(10),
+            home_team VARCHAR(20),
+            away_team VARCHAR(20),
+            elo_home INT,
+            elo_away INT,
+            market_ml_home INT,
+            market_ml_away INT,
+            spread FLOAT,
+            total FLOAT,
+            value_home FLOAT,
+            value_away FLOAT
+        )
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS betting_odds_game_key ON betting_odds (league, game_date, home_team, away_team)",
+    ],
+}
+
+# run when the unique index can't be built over rows saved before it existed; the newest row per game stays
+BETTING_DEDUPE = [
+    "DELETE FROM betting_odds WHERE EXISTS (SELECT 1 FROM betting_odds newer"
+    " WHERE newer.league = betting_odds.league AND newer.game_date = betting_odds.game_date"
+    " AND newer.home_team = betting_odds.home_team AND newer.away_team = betting_odds.away_team"
+    " AND newer.id > betting_odds.id)",
+]
+
+# above this many rows Postgres loads go through COPY into a staging table
+COPY_THRESHOLD = 5000
+POOL_SIZE = 4
+
+
+def betting_row(g):
+    return (
+        g["date"], g["league"], g["home"], g["away"],
+        g["elo_home"], g["elo_away"],
+        g["market_ml_home"], g["market_ml_away"],
+        g["spread"], g["total"],
+        g["value_edge_home"], g["value_edge_away"]
+    )
+
+
+def dedupe_rows(rows, columns, key):
+    # an upsert batch may not touch the same key twice; the last row for a key wins
+    key_of = itemgetter(*[columns.index(c) for c in key])
+    return list({key_of(row): row for row in rows}.values())
+
+
+def upsert_sql(table, columns, key, values_clause):
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in key)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) {values_clause} "
+        f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}"
+    )
+
+
+class Database:
+    def __init__(self, dialect, connect, pool_size=POOL_SIZE):
+        self.dialect = dialect
+        self._connect = connect
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._schema_lock = threading.Lock()
+        self._schema_ready = set()
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        except Exception:
+            # a connection that failed mid-transaction is not handed out again
+            try:
+                conn.rollback()
+                conn.close()
+            except Exception:
+                pass
+            raise
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def ensure_schema(self, conn, name, statements, repair=()):
+        with self._schema_lock:
+            if name in self._schema_ready:
+                return
+            cur = conn.cursor()
+            try:
+                for statement in statements:
+                    cur.execute(statement)
+            except Exception as e:
+                if not repair:
+                    raise
+                # e.g. a unique index over a table that already holds duplicates
+                print(f"Schema for {name} failed ({e}); repairing existing rows and retrying")
+                conn.rollback()
+                cur.close()
+                cur = conn.cursor()
+                for statement in list(repair) + list(statements):
+                    cur.execute(statement)
+            conn.commit()
+            cur.close()
+            self._schema_ready.add(name)
+
+    def upsert_betting_odds(self, games):
+        rows = dedupe_rows([betting_row(g) for g in games], BETTING_COLUMNS, BETTING_KEY)
+        if not rows:
+            return 0
+        with metrics.span("db_write_seconds", table="betting_odds"), self.connection() as conn:
+            self.ensure_schema(conn, "betting_odds", BETTING_SCHEMA[self.dialect], BETTING_DEDUPE)
+            cur = conn.cursor()
+            if self.dialect == "postgres":
+                self._pg_upsert(cur, "betting_odds", BETTING_COLUMNS, BETTING_KEY, rows)
+            else:
+                placeholders = ", ".join("?" for _ in BETTING_COLUMNS)
+                cur.executemany(upsert_sql("betting_odds", BETTING_COLUMNS, BETTING_KEY, f"VALUES ({placeholders})"), rows)
+            conn.commit()
+            cur.close()
+        metrics.inc("db_rows_written_total", len(rows), table="betting_odds")
+        return len(rows)
+
+    def _pg_upsert(self, cur, table, columns, key, rows):
+        from psycopg2.extras import execute_values
+
+        if len(rows) < COPY_THRESHOLD:
+            execute_values(cur, upsert_sql(table, columns, key, "VALUES %s"), rows, page_size=1000)
+            return
+        stage = f"{table}_stage"
+        cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {stage} AS SELECT {', '.join(columns)} FROM {table} WITH NO DATA")
+        cur.execute(f"TRUNCATE {stage}")
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        buf.seek(0)
+        cur.copy_expert(f"COPY {stage} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+        cur.execute(upsert_sql(table, columns, key, f"SELECT {', '.join(columns)} FROM {stage}"))
+
+
+def connect_postgres():
+    import psycopg2
+
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        dbname=os.getenv("DB_NAME")
+    )
+
+
+def connect_to_db():
+    import pyodbc
+
+    return pyodbc.connect(
+        f"DRIVER={{{os.getenv('DB_DRIVER', 'ODBC Driver 18 for SQL Server')}}};"
+        f"SERVER={os.getenv('DB_SERVER')};DATABASE={os.getenv('DB_NAME')};"
+        f"UID={os.getenv('DB_USER')};PWD={os.getenv('DB_PASSWORD')};Encrypt=yes"
+    )
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(name):
+    # one pooled Database per backend per process
+    with _databases_lock:
+        if name not in _databases:
+            if name == "postgres":
+                _databases[name] = Database("postgres", connect_postgres)
+            elif name == "sqlserver":
+                _databases[name] = Database("sqlserver", connect_to_db)
+            else:
+                raise ValueError(f"Unknown database: {name}")
+        return _databases[name]
@@ -0,0 +1,80 @@
+import threading
+from datetime import datetime, timedelta
+
+LIVE_INTERVAL = 10
+PREGAME_INTERVAL = 300
+FINAL_INTERVAL = 900
+DORMANT_INTERVAL = 3600
+# failed polls back off from the live interval, doubling up to this
+RETRY_MAX_INTERVAL = 300
+
+
+def parse_start(value):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+def league_phase(games):
+    if not games:
+        return "dormant"
+    states = {g.get("state", "") for g in games}
+    if "in" in states:
+        return "live"
+    if "pre" in states:
+        return "pregame"
+    return "final"
+
+
+def next_interval(games, now, live_interval=LIVE_INTERVAL):
+    phase = league_phase(games)
+    if phase == "live":
+        return phase, live_interval
+    if phase == "pregame":
+        starts = [s for s in (parse_start(g.get("start")) for g in games if g.get("state") == "pre") if s]
+        if not starts:
+            return phase, live_interval
+        # wake up one live interval before first pitch / puck drop / tip-off
+        return phase, min(PREGAME_INTERVAL, max(live_interval, min(starts) - now - live_interval))
+    if phase == "final":
+        return phase, FINAL_INTERVAL
+    return phase, DORMANT_INTERVAL
+
+
+def seconds_until_midnight(now):
+    current = datetime.fromtimestamp(now)
+    midnight = datetime.combine(current.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - current).total_seconds()
+
+
+class PollScheduler:
+    def __init__(self, sports, live_interval=LIVE_INTERVAL):
+        self.live_interval = live_interval
+        self._lock = threading.Lock()
+        self._next_due = {sport_path: 0.0 for sport_path in sports}
+        self._failures = {}
+        self.phases = {sport_path: "unknown" for sport_path in sports}
+
+    def due(self, now):
+        with self._lock:
+            return [sport_path for sport_path, due_at in self._next_due.items() if due_at <= now]
+
+    def next_due(self):
+        with self._lock:
+            return min(self._next_due.values())
+
+    def schedule(self, sport_path, games, now):
+        phase, interval = next_interval(games, now, self.live_interval)
+        # today's slate is only visible after the date rolls over, so never sleep past midnight
+        interval = min(interval, seconds_until_midnight(now) + 1)
+        with self._lock:
+            self.phases[sport_path] = phase
+            self._next_due[sport_path] = now + interval
+            self._failures.pop(sport_path, None)
+
+    def schedule_retry(self, sport_path, now):
+        with self._lock:
+            failures = self._failures.get(sport_path, 0)
+            self._failures[sport_path] = failures + 1
+            self._next_due[sport_path] = now + min(self.live_interval * 2 ** failures, RETRY_MAX_INTERVAL)
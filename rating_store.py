@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+
+ELO_HISTORY_PATH = "elo_history.json"
+# how often a reader may stat a file for out-of-process changes; in-process writers publish directly
+CHECK_INTERVAL = 30.0
+# "columnar" stores predictions as memory-mapped record files (see elo_columnar)
+ARTIFACT_FORMAT = os.getenv("ARTIFACT_FORMAT", "json")
+
+
+def predictions_path(league, fmt=None):
+    suffix = "rec" if (fmt or ARTIFACT_FORMAT) == "columnar" else "json"
+    return f"{league}_predicted_odds.{suffix}"
+
+
+def load_artifact(path):
+    if str(path).endswith(".rec"):
+        from elo_columnar import open_records
+
+        # a read-only memory map is already immutable
+        return open_records(path)
+    with open(path, "r") as f:
+        return freeze(json.load(f))
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def file_stamp(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Snapshot:
+    __slots__ = ("path", "version", "stamp", "data")
+
+    def __init__(self, path, version, stamp, data):
+        self.path = path
+        self.version = version
+        self.stamp = stamp
+        self.data = data
+
+
+class ArtifactStore:
+    # loads each JSON artifact once and hands every reader the same frozen snapshot
+    def __init__(self, check_interval=CHECK_INTERVAL, clock=time.monotonic):
+        self.check_interval = check_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self._checked_at = {}
+        self._version = 0
+        self.loads = 0
+
+    def get(self, path):
+        now = self.clock()
+        with self._lock:
+            snap = self._snapshots.get(path)
+            if snap is not None and now - self._checked_at[path] < self.check_interval:
+                return snap
+        stamp = file_stamp(path)
+        if snap is not None and snap.stamp == stamp:
+            with self._lock:
+                self._checked_at[path] = now
+            return snap
+        data = load_artifact(path)
+        with self._lock:
+            self.loads += 1
+            return self._install(path, stamp, data, now)
+
+    def publish(self, path, data):
+        # for writers in this process: the file was just written, so skip re-reading it
+        try:
+            stamp = file_stamp(path)
+        except FileNotFoundError:
+            stamp = None
+        with self._lock:
+            return self._install(path, stamp, freeze(data), self.clock())
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._checked_at.clear()
+            else:
+                self._checked_at.pop(path, None)
+                self._snapshots.pop(path, None)
+
+    def _install(self, path, stamp, data, now):
+        self._version += 1
+        snap = Snapshot(path, self._version, stamp, data)
+        self._snapshots[path] = snap
+        self._checked_at[path] = now
+        return snap
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore()
+    return _store
+
+
+def ratings_snapshot():
+    return get_store().get(ELO_HISTORY_PATH)
+
+
+def predictions_snapshot(league):
+    return get_store().get(predictions_path(league))
+
+
+def save_predictions(league, games):
+    path = predictions_path(league)
+    if path.endswith(".rec"):
+        from elo_columnar import open_records, write_predictions
+
+        write_predictions(path, games)
+        return get_store().publish(path, open_records(path))
+    with open(path, "w") as f:
+        json.dump(games, f, indent=2)
+    return get_store().publish(path, games)
@@ -0,0 +1,123 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from betiq_scraper import LEAGUES, get_browser_pool, scrape_betiq_odds
+from elo_utils import load_elo_ratings, merge_market_with_elo, run_elo_pipeline, save_betting_data
+from rating_store import save_predictions
+
+LEAGUE_WORKERS = len(LEAGUES)
+
+
+def refresh_league(league, pool, progress, elo_data=None):
+    progress(league, "scraping")
+    market_odds = scrape_betiq_odds(league, pool)
+    progress(league, "merging")
+    merged = merge_market_with_elo(league, market_odds, elo_data)
+    progress(league, "saving")
+    save_betting_data(league, merged)
+    save_predictions(league, merged)
+    return merged
+
+
+class RefreshJob:
+    def __init__(self, leagues):
+        self.leagues = list(leagues)
+        self.state = "running"
+        self.stages = {league: "queued" for league in self.leagues}
+        self.errors = {}
+        self.started_at = time.time()
+        self.finished_at = None
+
+    def as_dict(self):
+        return {
+            "state": self.state,
+            "stages": dict(self.stages),
+            "errors": dict(self.errors),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class RefreshRunner:
+    # runs the Elo + odds refresh off the Streamlit thread; overlapping requests share one run
+    def __init__(self, leagues=LEAGUES, refresh_fn=refresh_league, elo_fn=run_elo_pipeline):
+        self.leagues = list(leagues)
+        self.refresh_fn = refresh_fn
+        self.elo_fn = elo_fn
+        self._lock = threading.Lock()
+        self._job = None
+        self._last_good = {}
+        self.last_good_at = {}
+
+    def submit(self):
+        with self._lock:
+            if self._job is not None and self._job.state == "running":
+                return self._job
+            job = RefreshJob(self.leagues)
+            self._job = job
+        threading.Thread(target=self._run, args=(job,), name="betting-refresh", daemon=True).start()
+        return job
+
+    def _progress(self, job):
+        def report(league, stage):
+            with self._lock:
+                job.stages[league] = stage
+        return report
+
+    def _run(self, job):
+        report = self._progress(job)
+        try:
+            for league in job.leagues:
+                report(league, "elo")
+            self.elo_fn()
+            # ratings are read once per run and shared by every league's merge
+            elo_data = load_elo_ratings()
+            pool = get_browser_pool()
+            with ThreadPoolExecutor(max_workers=LEAGUE_WORKERS, thread_name_prefix="betting-league") as executor:
+                futures = {executor.submit(self.refresh_fn, league, pool, report, elo_data): league for league in job.leagues}
+                # each league is marked as soon as it finishes, not when the slowest one does
+                for future in as_completed(futures):
+                    league = futures[future]
+                    try:
+                        merged = future.result()
+                    except Exception as e:
+                        print(f"Failed to refresh {league}: {e}")
+                        with self._lock:
+                            job.stages[league] = "failed"
+                            job.errors[league] = str(e)
+                        continue
+                    with self._lock:
+                        # readers keep the previous good result for leagues that failed
+                        self._last_good[league] = merged
+                        self.last_good_at[league] = time.time()
+                        job.stages[league] = "done"
+            state = "failed" if len(job.errors) == len(job.leagues) else "succeeded"
+        except Exception as e:
+            print(f"Elo refresh failed: {e}")
+            with self._lock:
+                job.errors["elo"] = str(e)
+            state = "failed"
+        with self._lock:
+            job.state = state
+            job.finished_at = time.time()
+
+    def status(self):
+        with self._lock:
+            return self._job.as_dict() if self._job else None
+
+    def last_good(self, league):
+        with self._lock:
+            return self._last_good.get(league)
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_refresh_runner():
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = RefreshRunner()
+    return _runner
@@ -0,0 +1,99 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from html import unescape
+
+DATE_FORMATS = {"NFL": "%Y-%m-%d"}
+DEFAULT_DATE_FORMAT = "%a, %b %d, %Y"
+
+ROW_RE = re.compile(r"<tr\b([^>]*)>(.*?)</tr>", re.S | re.I)
+CELL_RE = re.compile(r"<(t[hd])\b[^>]*>(.*?)</\1>", re.S | re.I)
+CLASS_RE = re.compile(r"""class\s*=\s*["']([^"']*)""", re.I)
+TAG_RE = re.compile(r"<!--.*?-->|<[^>]*>", re.S)
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date_str, fmt):
+    return datetime.strptime(date_str, fmt).date()
+
+
+def first_table_offset(html):
+    # sports-reference hides secondary tables inside comments; skip those
+    pos = html.find("<table")
+    while pos != -1:
+        if html.rfind("<!--", 0, pos) <= html.rfind("-->", 0, pos):
+            return pos
+        end = html.find("-->", pos)
+        if end == -1:
+            return -1
+        pos = html.find("<table", end)
+    return -1
+
+
+def parse_schedule_rows(html):
+    # yields (row classes, first th text, td texts) for the first table's body rows;
+    # only that slice of the page is ever scanned
+    start = first_table_offset(html)
+    if start == -1:
+        return
+    table_end = html.find("</table>", start)
+    if table_end == -1:
+        table_end = len(html)
+    body_start = html.find("<tbody", start, table_end)
+    if body_start == -1:
+        return
+    body_end = html.find("</tbody>", body_start, table_end)
+    for row in ROW_RE.finditer(html, body_start, body_end if body_end != -1 else table_end):
+        classes = CLASS_RE.search(row.group(1))
+        th = None
+        tds = []
+        for cell in CELL_RE.finditer(row.group(2)):
+            text = cell.group(2)
+            if "<" in text or "&" in text:
+                text = unescape(TAG_RE.sub("", text))
+            if cell.group(1).lower() == "td":
+                tds.append(text)
+            elif th is None:
+                th = text
+        yield (classes.group(1).split() if classes else []), th, tds
+
+
+def parse_schedule(league, html):
+    fmt = DATE_FORMATS.get(league, DEFAULT_DATE_FORMAT)
+    games = []
+    for classes, date_text, cols in parse_schedule_rows(html):
+        if "thead" in classes:
+            continue
+        if len(cols) < 5 or date_text is None:
+            continue
+        try:
+            games.append({
+                "game_date": parse_date(date_text.strip(), fmt),
+                "home_team": cols[1].strip(),
+                "away_team": cols[0].strip(),
+                "home_score": int(cols[3].strip()),
+                "away_score": int(cols[2].strip())
+            })
+        except ValueError:
+            continue
+    return games
+
+
+def parse_remaining(league, html):
+    # games on the schedule that have no score yet
+    fmt = DATE_FORMATS.get(league, DEFAULT_DATE_FORMAT)
+    games = []
+    for classes, date_text, cols in parse_schedule_rows(html):
+        if "thead" in classes or len(cols) < 4 or date_text is None:
+            continue
+        if cols[2].strip() or cols[3].strip():
+            continue
+        try:
+            games.append({
+                "game_date": parse_date(date_text.strip(), fmt),
+                "home_team": cols[1].strip(),
+                "away_team": cols[0].strip(),
+            })
+        except ValueError:
+            continue
+    return games
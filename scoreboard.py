@@ -0,0 +1,102 @@
+from datetime import date
+
+from team_index import DEFAULT_COLORS, get_team_index
+from espn_client import fetch_all_leagues
+
+
+def get_team_colors(team_name, league=None):
+    team = resolve_team(league, team_name)
+    return list(team["colors"]) if team else list(DEFAULT_COLORS)
+
+def get_team_logo(team_name, league=None):
+    team = resolve_team(league, team_name)
+    return team["logo"] if team else ""
+
+def resolve_team(league, team_name, abbreviation=None):
+    index = get_team_index()
+    if league is None:
+        for lg in ("mlb", "nfl", "nba", "nhl", "wnba"):
+            team = index.lookup(lg, team_name)
+            if team:
+                return team
+        return None
+    return index.resolve(league, team_name) or (index.lookup(league, abbreviation) if abbreviation else None)
+
+def format_game_team_data(team, league=None):
+    name = team["team"]["displayName"]
+    meta = resolve_team(league, name, team["team"].get("abbreviation"))
+    return {
+        "name": name,
+        "score": team.get("score", "0"),
+        "colors": list(meta["colors"]) if meta else list(DEFAULT_COLORS),
+        "logo": meta["logo"] if meta else ""
+    }
+
+def normalize_events(league_slug, data, today=None):
+    today = today or date.today().isoformat()
+    games = []
+    for event in data.get("events", []):
+        if event.get("date", "").split("T")[0] != today:
+            continue
+        competition = event.get("competitions", [{}])[0]
+        competitors = competition.get("competitors", [])
+        if len(competitors) < 2:
+            continue
+
+        away = next((team for team in competitors if team["homeAway"] == "away"), None)
+        home = next((team for team in competitors if team["homeAway"] == "home"), None)
+
+        if not away or not home:
+            continue
+
+        info = {}
+        status = competition.get("status", {})
+        situation = competition.get("situation", {})
+
+        if league_slug == "mlb":
+            info = {
+                "inning": status.get("type", {}).get("shortDetail", ""),
+                "at_bat": situation.get("lastPlay", {}).get("athlete", {}).get("displayName", "N/A"),
+                "pitcher": situation.get("pitcher", {}).get("athlete", {}).get("displayName", "N/A"),
+                "onFirst": situation.get("onFirst", False),
+                "onSecond": situation.get("onSecond", False),
+                "onThird": situation.get("onThird", False),
+                "balls": situation.get("balls", 0),
+                "strikes": situation.get("strikes", 0),
+            }
+        elif league_slug == "nfl":
+            info = {
+                "quarter": f"Q{status.get('period', 'N/A')}",
+                "possession": situation.get("possession", {}).get("displayName", "N/A")
+            }
+        elif league_slug in ["nba", "wnba"]:
+            info = {
+                "quarter": f"Q{status.get('period', 'N/A')}",
+                "clock": status.get("displayClock", "")
+            }
+        elif league_slug == "nhl":
+            info = {
+                "period": f"Period {status.get('period', 'N/A')}",
+                "clock": status.get("displayClock", "")
+            }
+
+        games.append({
+            "id": event.get("id"),
+            "sport": league_slug,
+            "state": status.get("type", {}).get("state", ""),
+            "start": event.get("date", ""),
+            "away_team": format_game_team_data(away, league_slug),
+            "home_team": format_game_team_data(home, league_slug),
+            "info": info
+        })
+    return games
+
+def fetch_espn_scores(base_url=None):
+    games = []
+    today = date.today().isoformat()
+    # leagues are fetched concurrently; a failed league is skipped, not fatal
+    for sport_path, (data, _) in fetch_all_leagues(base_url=base_url).items():
+        if data is None:
+            continue
+        games += normalize_events(sport_path.split("/")[1], data, today)
+    return games
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+from datetime import date
+
+import metrics
+from espn_client import SPORTS, STATS, fetch_all_leagues
+from game_state import GameStateStore
+from poll_scheduler import LIVE_INTERVAL, PollScheduler
+from scoreboard import normalize_events
+from team_details import get_team_detail_service
+
+POLL_INTERVAL = LIVE_INTERVAL
+# floor under the loop's sleep, whatever the schedule says
+MIN_WAIT = 1.0
+
+
+class ScoreboardPoller:
+    def __init__(self, store=None, interval=POLL_INTERVAL, base_url=None, on_publish=None, clock=time.time):
+        self.store = store or GameStateStore()
+        self.clock = clock
+        self.on_publish = on_publish
+        self.interval = interval
+        self.scheduler = PollScheduler(SPORTS, live_interval=interval)
+        self.base_url = base_url
+        self.polls = 0
+        self.last_error = None
+        self._normalized_on = {}
+        self._normalize_seconds = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll_once(self):
+        now = self.clock()
+        due = self.scheduler.due(now)
+        if not due:
+            return
+        try:
+            self._poll(due, now)
+        except Exception:
+            # every due league is pushed out, or a poll that keeps failing would spin the loop
+            for sport_path in due:
+                self.scheduler.schedule_retry(sport_path, now)
+            raise
+        self.polls += 1
+
+    def _poll(self, due, now):
+        today = date.today().isoformat()
+        league_games = {}
+        results = fetch_all_leagues(sports=due, base_url=self.base_url)
+        for sport_path, (data, changed) in results.items():
+            # a failed league keeps its previous games and is retried soon
+            if data is None:
+                self.scheduler.schedule_retry(sport_path, now)
+                continue
+            league = sport_path.split("/")[1]
+            # an unchanged payload normalizes to the same games, unless the day rolled over
+            if not changed and self._normalized_on.get(league) == today:
+                STATS.record(time_saved=self._normalize_seconds.get(league, 0.0))
+                continue
+            started = time.perf_counter()
+            league_games[league] = normalize_events(league, data, today)
+            self._normalize_seconds[league] = time.perf_counter() - started
+            metrics.observe("scoreboard_normalize_seconds", self._normalize_seconds[league], league=league)
+            self._normalized_on[league] = today
+        self.store.publish(league_games)
+        if self.on_publish and league_games:
+            self.on_publish([g for games in league_games.values() for g in games])
+        for sport_path, (data, _) in results.items():
+            if data is not None:
+                self.scheduler.schedule(sport_path, self.store.league_games(sport_path.split("/")[1]), now)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+            self._stop.wait(self.next_wait())
+
+    def next_wait(self):
+        # sleep until the next league is due; live leagues keep the fast cadence
+        return max(MIN_WAIT, self.scheduler.next_due() - self.clock())
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="scoreboard-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait_for_first_poll(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.polls == 0 and self._thread is not None and self._thread.is_alive():
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+        return self.store.snapshot()
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_poller(interval=POLL_INTERVAL, base_url=None):
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            # today's teams are warmed into the detail cache as soon as their games show up
+            if os.getenv("SCOREBOARD_RECORD_DIR"):
+                from scoreboard_recorder import install_recorder
+
+                install_recorder()
+            _poller = ScoreboardPoller(interval=interval, base_url=base_url, on_publish=get_team_detail_service().prefetch).start()
+    return _poller
+
@@ -0,0 +1,367 @@
+import argparse
+import heapq
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from espn_client import SPORTS
+
+RECORD_DIR = Path(os.getenv("SCOREBOARD_RECORD_DIR", "recordings"))
+COMPRESS_LEVEL = 6
+
+# <league>.log holds frames: a FRAME header (timestamp, compressed size) then the zlib'd payload.
+# <league>.idx holds one INDEX entry (timestamp, frame offset, compressed size) per frame, so a
+# reader finds the frame for any moment with a bisect over the index and one seek into the log.
+FRAME = struct.Struct("<dI")
+INDEX = struct.Struct("<dQI")
+
+LEAGUE_PATHS = {sport_path.split("/")[1]: sport_path for sport_path in SPORTS}
+# the scoreboard's own top-level {"day": {"date": "YYYY-MM-DD"}}, found without parsing the body
+SLATE_DAY = re.compile(rb'"day"\s*:\s*\{\s*"date"\s*:\s*"(\d{4}-\d{2}-\d{2})"')
+
+
+def league_of(url):
+    # .../basketball/nba/scoreboard -> "nba"; None for anything that isn't a scoreboard
+    path = url.split("?", 1)[0].rstrip("/")
+    if not path.endswith("/scoreboard"):
+        return None
+    league = path[:-len("/scoreboard")].rsplit("/", 1)[-1]
+    return league if league in LEAGUE_PATHS else None
+
+
+def slate_day(url, body, timestamp):
+    # the slate a payload belongs to: the request's dates=, else the payload's day.date,
+    # else the local date of the poll for payloads that carry neither
+    dates = parse_qs(urlparse(url).query).get("dates", [""])[0]
+    if len(dates) == 8 and dates.isdigit():
+        return f"{dates[:4]}-{dates[4:6]}-{dates[6:]}"
+    match = SLATE_DAY.search(body)
+    if match:
+        return match.group(1).decode()
+    return date.fromtimestamp(timestamp).isoformat()
+
+
+class ScoreboardLog:
+    # one league's append-only log and its index; appends come from one writer, reads from any thread
+    def __init__(self, root, league):
+        self.root = Path(root)
+        self.league = league
+        self.log_path = self.root / f"{league}.log"
+        self.index_path = self.root / f"{league}.idx"
+        self._lock = threading.Lock()
+        self._timestamps = []
+        self._entries = []
+        self._index_size = 0
+        self._repaired = False
+
+    def _repair(self):
+        # a crash mid-append can leave part of an index entry; later entries must start on a boundary
+        try:
+            size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size % INDEX.size:
+            with open(self.index_path, "r+b") as index:
+                index.truncate(size - size % INDEX.size)
+
+    def append(self, body, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        data = zlib.compress(body, COMPRESS_LEVEL)
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            if not self._repaired:
+                self._repair()
+                self._repaired = True
+            # the frame goes down before its index entry; a crash in between leaves a frame nobody reads
+            with open(self.log_path, "ab") as log:
+                offset = log.tell()
+                log.write(FRAME.pack(timestamp, len(data)) + data)
+            with open(self.index_path, "ab") as index:
+                index.write(INDEX.pack(timestamp, offset, len(data)))
+        return FRAME.size + len(data)
+
+    def refresh(self):
+        # picks up entries appended since the last read, including by another process
+        with self._lock:
+            try:
+                size = self.index_path.stat().st_size
+            except FileNotFoundError:
+                return
+            size -= size % INDEX.size
+            if size <= self._index_size:
+                return
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_size)
+                chunk = f.read(size - self._index_size)
+            for timestamp, offset, length in INDEX.iter_unpack(chunk):
+                self._timestamps.append(timestamp)
+                self._entries.append((timestamp, offset, length))
+            self._index_size = size
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def first(self):
+        return self._timestamps[0] if self._timestamps else None
+
+    @property
+    def last(self):
+        return self._timestamps[-1] if self._timestamps else None
+
+    def position(self, timestamp):
+        # index of the last frame recorded at or before timestamp, -1 before the first
+        return bisect_right(self._timestamps, timestamp) - 1
+
+    def read(self, i):
+        timestamp, offset, length = self._entries[i]
+        with open(self.log_path, "rb") as f:
+            f.seek(offset + FRAME.size)
+            return timestamp, zlib.decompress(f.read(length))
+
+    def at(self, timestamp):
+        i = self.position(timestamp)
+        return (i, *self.read(i)) if i >= 0 else None
+
+    def timestamps(self, start=None, end=None):
+        lo = 0 if start is None else bisect_left(self._timestamps, start)
+        hi = len(self._timestamps) if end is None else bisect_right(self._timestamps, end)
+        return [(self._timestamps[i], i) for i in range(lo, hi)]
+
+
+class ScoreboardRecorder:
+    # appends every new scoreboard payload to recordings/<date>/<league>.log as it is downloaded
+    def __init__(self, root=RECORD_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._logs = {}
+        self.frames = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def log(self, league, day):
+        with self._lock:
+            key = (day, league)
+            if key not in self._logs:
+                self._logs[key] = ScoreboardLog(self.root / day, league)
+            return self._logs[key]
+
+    def __call__(self, url, body, timestamp=None):
+        league = league_of(url)
+        if league is None:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        # keyed by slate, so games running past local midnight stay with their night
+        log = self.log(league, slate_day(url, body, timestamp))
+        written = log.append(body, timestamp)
+        with self._lock:
+            self.frames += 1
+            self.bytes_in += len(body)
+            self.bytes_out += written
+
+
+def open_night(night_dir):
+    logs = {}
+    for path in sorted(Path(night_dir).glob("*.idx")):
+        log = ScoreboardLog(night_dir, path.stem)
+        log.refresh()
+        if len(log):
+            logs[path.stem] = log
+    return logs
+
+
+def shift_date(value, days):
+    # "2025-10-18T23:30Z" moved by whole days, time of day untouched
+    try:
+        moved = date.fromisoformat(value[:10]) + timedelta(days=days)
+    except ValueError:
+        return value
+    return moved.isoformat() + value[10:]
+
+
+def redate(body, recorded_day, today):
+    # the scoreboard only keeps events dated today; a replayed slate is moved to today's date by the
+    # whole-day distance from its slate date, so events dated the morning after move with it
+    days = (date.fromisoformat(today) - date.fromisoformat(recorded_day)).days
+    if not days:
+        return body
+    data = json.loads(body)
+    if "date" in data.get("day", {}):
+        data["day"]["date"] = shift_date(data["day"]["date"], days)
+    for event in data.get("events", []):
+        event["date"] = shift_date(event.get("date", ""), days)
+        for competition in event.get("competitions", []):
+            if "date" in competition:
+                competition["date"] = shift_date(competition["date"], days)
+    return json.dumps(data).encode()
+
+
+class ReplaySource:
+    # stands in for ESPN by serving each league's payload as it was at the replay clock's position
+    def __init__(self, night_dir, speed=1.0, start=None, redate_to_today=True, clock=time.monotonic):
+        self.night_dir = Path(night_dir)
+        self.logs = open_night(night_dir)
+        if not self.logs:
+            raise ValueError(f"No recorded scoreboards in {night_dir}")
+        self.speed = speed
+        self.clock = clock
+        self.recorded_day = self.night_dir.name
+        self.redate_to_today = redate_to_today
+        self.first = min(log.first for log in self.logs.values())
+        self.last = max(log.last for log in self.logs.values())
+        # the attributes espn_stub's handler counts into
+        self.detail_delay = 0.0
+        self.detail_requests = 0
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._frames = {}
+        self.seek(self.first if start is None else start)
+
+    def seek(self, timestamp):
+        with self._lock:
+            self._origin = (timestamp, self.clock())
+
+    def now(self):
+        timestamp, started = self._origin
+        return timestamp + (self.clock() - started) * self.speed
+
+    @property
+    def finished(self):
+        return self.now() > self.last
+
+    def payload(self, sport_path):
+        league = sport_path.rsplit("/", 1)[-1]
+        log = self.logs.get(league)
+        i = log.position(self.now()) if log else -1
+        if i < 0:
+            # the league hadn't been polled yet at this point of the night
+            return b'{"events": []}', '"empty"'
+        with self._lock:
+            cached = self._frames.get(league)
+            if cached and cached[0] == i:
+                return cached[1], cached[2]
+        _, body = log.read(i)
+        if self.redate_to_today:
+            body = redate(body, self.recorded_day, date.today().isoformat())
+        etag = f'"{league}-{i}"'
+        with self._lock:
+            self._frames[league] = (i, body, etag)
+        return body, etag
+
+
+def frames(logs, start=None, end=None):
+    # (timestamp, league, frame number) across every league in recorded order
+    return heapq.merge(*(
+        [(timestamp, league, i) for timestamp, i in log.timestamps(start, end)]
+        for league, log in logs.items()
+    ))
+
+
+def play(night_dir, store, speed=10.0, start=None, end=None, renderer=None, sleep=time.sleep):
+    # pushes a recorded night through normalization, the state store and card rendering without HTTP
+    from scoreboard import normalize_events
+
+    logs = open_night(night_dir)
+    today = date.today().isoformat()
+    recorded_day = Path(night_dir).name
+    previous = None
+    played = 0
+    for timestamp, league, i in frames(logs, start, end):
+        if previous is not None and speed:
+            sleep(max(0.0, (timestamp - previous) / speed))
+        previous = timestamp
+        _, body = logs[league].read(i)
+        games = normalize_events(league, json.loads(redate(body, recorded_day, today)), today)
+        store.publish({league: games})
+        if renderer is not None:
+            renderer.league_block(league.upper(), games)
+        played += 1
+    return played
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def install_recorder(root=RECORD_DIR):
+    # every scoreboard the process downloads from now on is recorded
+    import espn_client
+
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = ScoreboardRecorder(root)
+            espn_client.add_payload_hook(_recorder)
+    return _recorder
+
+
+def parse_time(value, night_dir, first=None):
+    # "19:30" is a time on the recorded night, "00:45" after midnight when the night started
+    # later than that; a bare number is a unix timestamp
+    try:
+        return float(value)
+    except ValueError:
+        timestamp = datetime.fromisoformat(f"{Path(night_dir).name}T{value}").timestamp()
+    if first is not None and timestamp < first:
+        timestamp = (datetime.fromtimestamp(timestamp) + timedelta(days=1)).timestamp()
+    return timestamp
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record ESPN scoreboards and replay a recorded night")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="poll ESPN and append every new payload to the log")
+    record.add_argument("--dir", type=Path, default=RECORD_DIR)
+    record.add_argument("--interval", type=float, default=10.0)
+    replay = commands.add_parser("replay", help="serve a recorded night as a stand-in for ESPN_BASE_URL")
+    replay.add_argument("night", type=Path, help="recordings/<date>")
+    replay.add_argument("--speed", type=float, default=1.0, help="1 to 100 times real time")
+    replay.add_argument("--start", help="HH:MM[:SS] on the recorded night, or a unix timestamp")
+    replay.add_argument("--port", type=int, default=8765)
+    info = commands.add_parser("info", help="list what a recorded night holds")
+    info.add_argument("night", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        from scoreboard_poller import ScoreboardPoller
+
+        recorder = install_recorder(args.dir)
+        poller = ScoreboardPoller(interval=args.interval).start()
+        print(f"Recording to {args.dir}; Ctrl-C to stop")
+        try:
+            while True:
+                time.sleep(60)
+                print(f"{recorder.frames} payloads, {recorder.bytes_in / 1e6:.1f} MB raw")
+        except KeyboardInterrupt:
+            poller.stop()
+    elif args.command == "replay":
+        from espn_stub import StubServer
+
+        source = ReplaySource(args.night, speed=args.speed)
+        if args.start:
+            source.seek(parse_time(args.start, args.night, source.first))
+        server = StubServer(port=args.port, boards=source)
+        print(f"ESPN_BASE_URL={server.url}", flush=True)
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    else:
+        for league, log in open_night(args.night).items():
+            raw = sum(len(log.read(i)[1]) for i in range(len(log)))
+            size = log.log_path.stat().st_size
+            print(f"{league:5} {len(log):6} frames  {datetime.fromtimestamp(log.first):%H:%M:%S}-{datetime.fromtimestamp(log.last):%H:%M:%S}  "
+                  f"{size / 1e6:7.2f} MB on disk ({raw / max(size, 1):.1f}x compression)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import metrics
+from espn_client import BASE_URL, SPORTS, get_json
+from team_index import get_team_index
+
+# rosters change a few times a season; failures are retried much sooner
+DETAIL_TTL = 6 * 3600
+ERROR_TTL = 60
+DETAIL_TIMEOUT = (3.05, 10)
+PREFETCH_WORKERS = 8
+# every team in the five leagues fits; least recently used teams go first past this
+MAX_TEAMS = 256
+
+SPORT_PATHS = {sport_path.split("/")[1]: sport_path for sport_path in SPORTS}
+
+
+def roster_players(data):
+    # basketball rosters are a flat list; football, baseball and hockey group players by position
+    players = []
+    for item in data.get("athletes", []):
+        for player in item.get("items", [item]):
+            players.append({
+                "name": player.get("displayName", ""),
+                "position": player.get("position", {}).get("abbreviation", ""),
+                "jersey": player.get("jersey", ""),
+            })
+    return players
+
+
+def fetch_team_details(league, team_id, base_url=None):
+    url = f"{base_url or BASE_URL}/{SPORT_PATHS[league]}/teams/{team_id}/roster"
+    data = get_json(url, timeout=DETAIL_TIMEOUT)
+    if data is None:
+        return None
+    team = data.get("team", {})
+    return {
+        "league": league,
+        "id": team_id,
+        "record": team.get("recordSummary", ""),
+        "standing": team.get("standingSummary", ""),
+        "players": roster_players(data),
+    }
+
+
+class TeamDetailService:
+    # one cache for every session; concurrent lookups of the same team share one request
+    def __init__(self, fetch=fetch_team_details, ttl=DETAIL_TTL, error_ttl=ERROR_TTL, workers=PREFETCH_WORKERS, clock=time.monotonic,
+                 max_teams=MAX_TEAMS):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.clock = clock
+        self.max_teams = max_teams
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="team-details")
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self.fetches = 0
+        self.hits = 0
+        self.coalesced = 0
+
+    def _fresh(self, key, now):
+        entry = self._cache.get(key)
+        if entry is not None and now < entry[0]:
+            self._cache.move_to_end(key)
+            return entry
+        return None
+
+    def _load(self, key):
+        league, team_id = key
+        try:
+            value = self.fetch(league, team_id)
+        except Exception as e:
+            print(f"Failed to fetch {league} team {team_id}: {e}")
+            value = None
+        expires = self.clock() + (self.ttl if value is not None else self.error_ttl)
+        with self._lock:
+            self._cache[key] = (expires, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_teams:
+                self._cache.popitem(last=False)
+            future = self._inflight.pop(key)
+        future.set_result(value)
+
+    def request(self, league, team_id, lookup=True):
+        # a future for the team's details, completed already when cached. Prefetches pass
+        # lookup=False so the hit and coalesced counters only reflect what sessions asked for
+        key = (league.lower(), team_id)
+        with self._lock:
+            entry = self._fresh(key, self.clock())
+            if entry is not None:
+                self.hits += lookup
+                future = Future()
+                future.set_result(entry[1])
+                return future
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += lookup
+                return future
+            future = self._inflight[key] = Future()
+            self.fetches += 1
+        self._executor.submit(self._load, key)
+        return future
+
+    def get(self, league, team_id, timeout=None):
+        return self.request(league, team_id).result(timeout)
+
+    def peek(self, league, team_id):
+        with self._lock:
+            entry = self._fresh((league.lower(), team_id), self.clock())
+        return entry[1] if entry else None
+
+    def team_id(self, league, team_name):
+        team = get_team_index().resolve(league, team_name)
+        return team["id"] if team else None
+
+    def prefetch(self, games):
+        # starts loading every team on the slate that isn't cached yet; returns without waiting
+        futures = []
+        for game in games:
+            league = game.get("sport", "")
+            if league not in SPORT_PATHS:
+                continue
+            for side in ("away_team", "home_team"):
+                team_id = self.team_id(league, game[side]["name"])
+                if team_id:
+                    futures.append(self.request(league, team_id, lookup=False))
+        return futures
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_team_detail_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TeamDetailService()
+            metrics.register_collector(lambda: [
+                ("team_detail_fetches_total", {}, _service.fetches),
+                ("team_detail_cache_hits_total", {}, _service.hits),
+                ("team_detail_coalesced_total", {}, _service.coalesced),
+            ])
+    return _service
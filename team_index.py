@@ -0,0 +1,171 @@
+import re
+import threading
+import unicodedata
+from difflib import get_close_matches
+from functools import lru_cache
+
+from all_team_logos import team_logos as TEAM_LOGOS
+from team_colors_all_leagues import team_colors as TEAM_COLORS, wnba_team_colors as WNBA_TEAM_COLORS
+
+DEFAULT_COLORS = ["#333", "#555"]
+FUZZY_CUTOFF = 0.85
+
+# nicknames that are more than the last word of the display name
+MULTI_WORD_NICKNAMES = {
+    "Red Sox", "White Sox", "Blue Jays", "Trail Blazers", "Maple Leafs", "Red Wings", "Blue Jackets", "Golden Knights",
+}
+
+# abbreviations sports-reference and the books use where they differ from ESPN's, plus former names
+ALIASES = {
+    "mlb": {
+        "ari": ["AZ"], "chw": ["CWS", "CHA"], "chc": ["CHN"], "kc": ["KCR", "KCA"], "laa": ["ANA", "LAA", "Los Angeles Angels of Anaheim", "Anaheim Angels"],
+        "lad": ["LAN"], "nyy": ["NYA"], "nym": ["NYN"], "oak": ["ATH", "Athletics", "Sacramento Athletics"], "sd": ["SDP", "SDN"],
+        "sf": ["SFG", "SFN"], "stl": ["SLN"], "tb": ["TBR", "TBA", "Tampa Bay Devil Rays"], "wsh": ["WSN", "WAS"],
+        "cle": ["Cleveland Indians"], "mia": ["Florida Marlins"],
+    },
+    "nba": {
+        "bkn": ["BRK", "New Jersey Nets"], "cha": ["CHO", "Charlotte Bobcats"], "gs": ["GSW"], "ny": ["NYK"], "no": ["NOP", "New Orleans Hornets"],
+        "phx": ["PHO"], "sa": ["SAS"], "utah": ["UTA"], "wsh": ["WAS"], "lac": ["LA Clippers"], "lal": ["LA Lakers"],
+        "okc": ["Seattle SuperSonics"], "mem": ["Vancouver Grizzlies"],
+    },
+    "wnba": {
+        "con": ["CONN"], "la": ["LA Sparks", "LAS"], "lv": ["LVA", "San Antonio Stars"], "ny": ["NYL"], "phx": ["PHO"], "wsh": ["WAS"],
+        "dal": ["Tulsa Shock"],
+    },
+    "nfl": {
+        "gb": ["GNB"], "kc": ["KAN"], "ne": ["NWE"], "no": ["NOR"], "sf": ["SFO"], "tb": ["TAM"], "lv": ["LVR", "Oakland Raiders"],
+        "lac": ["LAC", "San Diego Chargers"], "lar": ["LA Rams", "St. Louis Rams"], "wsh": ["WAS", "Washington Football Team", "Washington Redskins"],
+        "ari": ["ARZ"], "hou": ["HTX"], "ten": ["OTI"], "ind": ["CLT"], "bal": ["RAV"],
+    },
+    "nhl": {
+        "nj": ["NJD"], "la": ["LAK"], "sj": ["SJS"], "tb": ["TBL"], "vgk": ["VEG", "VGK"], "wsh": ["WSH"], "mtl": ["Montréal Canadiens"],
+        "ari": ["ARI", "Phoenix Coyotes", "Utah Hockey Club"], "cbj": ["CBJ"], "wpg": ["Atlanta Thrashers"],
+    },
+}
+
+PUNCTUATION_RE = re.compile(r"[^a-z0-9 ]+")
+SPACES_RE = re.compile(r"\s+")
+
+
+def normalize(name):
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    name = name.replace("&", " and ").replace("saint ", "st ")
+    return SPACES_RE.sub(" ", PUNCTUATION_RE.sub(" ", name)).strip()
+
+
+def nickname(name):
+    for nick in MULTI_WORD_NICKNAMES:
+        if name.endswith(" " + nick):
+            return nick
+    return name.rsplit(" ", 1)[-1]
+
+
+def city(name):
+    return normalize(name[:-len(nickname(name))])
+
+
+def logo_key(url):
+    # https://a.espncdn.com/i/teamlogos/<league>/500/<abbr>.png
+    parts = url.rsplit("/", 3)
+    return parts[1], parts[3].split(".")[0]
+
+
+class TeamIndex:
+    def __init__(self, logos=TEAM_LOGOS, colors=TEAM_COLORS, wnba_colors=WNBA_TEAM_COLORS, aliases=ALIASES):
+        self.teams = {}
+        self._aliases = {}
+        self._spellings = {}
+        self._choices = {}
+        part_counts = {}
+        for name, logo in logos.items():
+            league, team_id = logo_key(logo)
+            color = colors.get(name)
+            wnba_color = wnba_colors.get(name)
+            if color:
+                team_colors = [color["primary"], color["secondary"]]
+            elif wnba_color:
+                team_colors = [wnba_color["primary_color"], wnba_color["secondary_color"]]
+            else:
+                team_colors = list(DEFAULT_COLORS)
+            self.teams[(league, team_id)] = {
+                "league": league, "id": team_id, "abbreviation": team_id.upper(), "name": name,
+                "colors": team_colors, "logo": logo,
+            }
+            for part in (normalize(nickname(name)), city(name)):
+                part_counts[(league, part)] = part_counts.get((league, part), 0) + 1
+        for key, team in self.teams.items():
+            league = key[0]
+            self._add(league, team["name"], key)
+            self._add(league, team["abbreviation"], key)
+            # a nickname or city on its own only counts as an alias when it is unique in its league
+            for part in (normalize(nickname(team["name"])), city(team["name"])):
+                if part and part_counts[(league, part)] == 1:
+                    self._add(league, part, key)
+            for alias in aliases.get(league, {}).get(team["id"], []):
+                self._add(league, alias, key)
+        for league in {key[0] for key in self.teams}:
+            self._choices[league] = [alias for (lg, alias) in self._aliases if lg == league]
+
+    def _add(self, league, alias, key):
+        self._aliases.setdefault((league, normalize(alias)), key)
+        self._spellings.setdefault((league, alias), key)
+
+    def get(self, league, team_id):
+        return self.teams.get((league.lower(), team_id.lower()))
+
+    def lookup(self, league, name):
+        # exact match after normalization only
+        key = self._aliases.get((league.lower(), normalize(name)))
+        return self.teams[key] if key else None
+
+    def resolve(self, league, name):
+        if not name:
+            return None
+        team = self.lookup(league, name)
+        if team is None:
+            key = self._fuzzy_key(league.lower(), normalize(name))
+            team = self.teams[key] if key else None
+        return team
+
+    @lru_cache(maxsize=4096)
+    def _fuzzy_key(self, league, normalized):
+        # misses are rare and repeat every poll, so each distinct spelling is matched once
+        words = normalized.split()
+        # "NY Yankees" style variants keep the nickname at the end
+        for n in (2, 1):
+            key = self._aliases.get((league, " ".join(words[-n:])))
+            if key and len(words) > n:
+                return key
+        match = get_close_matches(normalized, self._choices.get(league, []), n=1, cutoff=FUZZY_CUTOFF)
+        return self._aliases[(league, match[0])] if match else None
+
+    @lru_cache(maxsize=8192)
+    def canonical_name(self, league, name):
+        team = self.resolve(league, name)
+        return team["name"] if team else name
+
+    def aliases(self, league):
+        # every spelling as written (display names, abbreviations, listed aliases) plus its normalized
+        # form -> display name, so callers can look up raw names with a plain dict get
+        league = league.lower()
+        names = {alias: self.teams[key]["name"] for (lg, alias), key in self._spellings.items() if lg == league}
+        for (lg, alias), key in self._aliases.items():
+            if lg == league:
+                names.setdefault(alias, self.teams[key]["name"])
+        return names
+
+    def league_teams(self, league):
+        league = league.lower()
+        return [team for (lg, _), team in self.teams.items() if lg == league]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_team_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TeamIndex()
+    return _index
@@ -1,8 +1,6 @@
+from team_index import get_team_index
+
+
 def get_team_mapping(league):
-    return {
-        "New York Yankees": "NYY",
-        "Boston Red Sox": "BOS",
-        "Los Angeles Dodgers": "LAD",
-        "Chicago Cubs": "CHC",
-        # Add more mappings per league as needed...
-    }
\ No newline at end of file
+    # raw and normalized spellings -> the display name Elo ratings are stored under
+    return get_team_index().aliases(league)
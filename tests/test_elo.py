@@ -0,0 +1,99 @@
+import random
+from datetime import date, timedelta
+from functools import partial
+
+import numpy as np
+import pytest
+
+from elo_checkpoint import apply_games, empty_checkpoint, number_games
+from elo_params import season_of
+from elo_tuning import SEARCHED, Backtest
+from elo_vectorized import run_elo_batch
+
+TUNED = {"k": 24.0, "home_advantage": 55.0, "mov_factor": 0.8, "season_regression": 0.3}
+
+
+def make_games(seasons=3, teams=12, per_day=4, days=60, seed=7):
+    rng = random.Random(seed)
+    names = [f"Team {i}" for i in range(teams)]
+    games = []
+    for season in range(seasons):
+        start = date(2021 + season, 11, 1)
+        for day in range(days):
+            playing = rng.sample(names, per_day * 2)
+            for i in range(per_day):
+                home, away = playing[2 * i], playing[2 * i + 1]
+                home_score, away_score = rng.randint(80, 120), rng.randint(80, 120)
+                if home_score == away_score:
+                    home_score += 1
+                games.append({
+                    "game_date": start + timedelta(days=day),
+                    "home_team": home, "away_team": away,
+                    "home_score": home_score, "away_score": away_score,
+                })
+    return games
+
+
+@pytest.mark.parametrize("params", [{}, TUNED], ids=["default", "tuned"])
+def test_apply_games_in_chunks_matches_run_elo_batch(params):
+    games = make_games()
+    seasons = partial(season_of, "NBA")
+    _, names, ratings, (hb, ab, ha, aa) = run_elo_batch(games, season_of=seasons, **params)
+    # chunks end mid-date, so the last date of one run continues in the next
+    checkpoint = empty_checkpoint()
+    rows = []
+    for end in (101, 250, 251, 517, len(games)):
+        chunk_rows, checkpoint = apply_games(games[:end], checkpoint, season_of=seasons, **params)
+        rows += chunk_rows
+    assert len(rows) == len(games)
+    final = dict(zip(checkpoint["teams"], checkpoint["ratings"]))
+    np.testing.assert_allclose([final[n] for n in names], ratings, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(np.array([r[5:9] for r in rows]), np.column_stack([hb, ab, ha, aa]), rtol=0, atol=1e-9)
+
+
+def test_backtest_score_matches_sequential_model():
+    games = make_games()
+    seasons = partial(season_of, "NBA")
+    backtest = Backtest("NBA", games, burn_in=0)
+    candidates = [[TUNED[n] for n in SEARCHED], [20.0, 0.0, 0.0, 0.0], [8.0, 90.0, 1.0, 0.5]]
+    log_loss, brier = backtest.score(candidates)
+    for i, row in enumerate(candidates):
+        params = dict(zip(SEARCHED, row))
+        ordered, _, _, (hb, ab, _, _) = run_elo_batch(games, season_of=seasons, **params)
+        y = np.array([g["home_score"] > g["away_score"] for g in ordered], dtype=float)
+        p = 1 / (1 + 10 ** (-(hb + params["home_advantage"] - ab) / 400))
+        assert log_loss[i] == pytest.approx(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)), rel=1e-12)
+        assert brier[i] == pytest.approx(np.mean((p - y) ** 2), rel=1e-12)
+
+
+def test_backtest_burn_in_skips_the_first_season():
+    games = make_games()
+    backtest = Backtest("NBA", games)
+    assert backtest.n_scored == len(games) * 2 // 3
+
+
+def test_doubleheader_games_keep_separate_rows_across_runs():
+    day = date(2024, 7, 4)
+    games = number_games([
+        {"game_date": day, "home_team": "NYY", "away_team": "BOS", "home_score": 3, "away_score": 2},
+        {"game_date": day, "home_team": "NYY", "away_team": "BOS", "home_score": 1, "away_score": 6},
+        {"game_date": day, "home_team": "LAD", "away_team": "SF", "home_score": 4, "away_score": 0},
+    ])
+    assert [g["game_seq"] for g in games] == [1, 2, 1]
+    rows, checkpoint = apply_games(games[:1], empty_checkpoint())
+    more, checkpoint = apply_games(games, checkpoint)
+    assert [(r[1], r[-1]) for r in rows + more] == [("NYY", 1), ("NYY", 2), ("LAD", 1)]
+    assert apply_games(games, checkpoint)[0] == []
+
+
+def test_checkpoints_without_game_seq_still_skip_applied_games():
+    day = date(2024, 7, 4)
+    games = number_games([
+        {"game_date": day, "home_team": "NYY", "away_team": "BOS", "home_score": 3, "away_score": 2},
+        {"game_date": day, "home_team": "NYY", "away_team": "BOS", "home_score": 1, "away_score": 6},
+    ])
+    _, checkpoint = apply_games(games, empty_checkpoint())
+    checkpoint["last_date_games"] = ["NYY|BOS"]
+    rows, checkpoint = apply_games(games, checkpoint)
+    assert [r[-1] for r in rows] == [2]
+    assert checkpoint["last_date_games"] == ["NYY|BOS|1", "NYY|BOS|2"]
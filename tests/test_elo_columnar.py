@@ -0,0 +1,31 @@
+from elo_columnar import PREDICTION_DTYPE, open_records, write_predictions
+
+
+def prediction(**values):
+    row = {name: 0 for name in PREDICTION_DTYPE.names}
+    row.update(league="mlb", date="2025-06-25", home="Home", away="Away", prob_home=0.5, prob_away=0.5)
+    row.update(values)
+    return row
+
+
+def test_predictions_round_trip_without_truncation(tmp_path):
+    long_name = "Los Angeles Angels of Anaheim Baseball Club of California"
+    games = [
+        prediction(home=long_name, date="2025-06-25T19:05:00-04:00", elo_home=1523, elo_away=1480, fair_ml_home=-151.5),
+        prediction(elo_home=1500, elo_away=1499.25, fair_ml_home=120),
+    ]
+    path = tmp_path / "mlb_predicted_odds.rec"
+    write_predictions(path, games)
+    records = open_records(path)
+    assert records["home"][0] == long_name
+    assert records["date"][0] == "2025-06-25T19:05:00-04:00"
+    assert records.dtype["elo_home"].kind == "i" and records["elo_home"].tolist() == [1523, 1500]
+    assert records.dtype["elo_away"].kind == "f" and records["elo_away"].tolist() == [1480.0, 1499.25]
+    assert records["fair_ml_home"].tolist() == [-151.5, 120.0]
+    assert records.dtype["market_ml_home"].kind == "i"
+
+
+def test_empty_predictions_keep_the_default_layout(tmp_path):
+    path = tmp_path / "nba_predicted_odds.rec"
+    write_predictions(path, [])
+    assert open_records(path).dtype == PREDICTION_DTYPE
@@ -0,0 +1,63 @@
+from concurrent.futures import Future
+
+import numpy as np
+
+import elo_simulator
+from elo_simulator import run_season, series_probability, simulate_season
+
+TEAMS = [f"Team {i}" for i in range(10)]
+RATINGS = {team: 1400 + 20 * i for i, team in enumerate(TEAMS)}
+SCHEDULE = [(h, a) for h in TEAMS for a in TEAMS if h != a] * 2
+
+
+def test_simulate_season_is_the_same_for_any_worker_count():
+    kwargs = dict(runs=5000, playoff_spots=4, seed=11, chunk_runs=700, current_wins={"Team 3": 5})
+    one = run_season(RATINGS, SCHEDULE, workers=1, **kwargs)
+    two = run_season(RATINGS, SCHEDULE, workers=2, **kwargs)
+    assert one.runs == two.runs == 5000
+    np.testing.assert_array_equal(one.histogram, two.histogram)
+    np.testing.assert_array_equal(one.playoffs, two.playoffs)
+    assert one.playoffs.sum() == 4 * 5000
+    other = run_season(RATINGS, SCHEDULE, workers=1, **dict(kwargs, seed=12))
+    assert not np.array_equal(one.histogram, other.histogram)
+
+
+def test_series_probability():
+    assert series_probability(0.5, 0.5, 7) == 0.5
+    assert series_probability(1.0, 1.0, 5) == 1.0
+    # best of 3 at p: p^2 + 2 p^2 (1 - p)
+    assert abs(series_probability(0.6, 0.6, 3) - (0.36 + 2 * 0.36 * 0.4)) < 1e-12
+
+
+def test_series_odds_in_rows():
+    result = run_season(RATINGS, SCHEDULE, runs=2000, playoff_spots=4, seed=3, workers=1)
+    series = result.series_odds(RATINGS, 7, home_advantage=24)
+    rows = {row["team"]: row for row in result.rows(series)}
+    assert set(rows) == set(TEAMS)
+    # the strongest team is a favourite against the field, the weakest an underdog
+    assert rows["Team 9"]["series_odds"] > 0.5 > rows["Team 0"]["series_odds"]
+    assert rows["Team 9"]["series_odds"] > rows["Team 8"]["series_odds"]
+    assert "series_odds" not in result.rows()[0]
+
+
+class RecordingPool:
+    def __init__(self, max_workers=None):
+        self.shutdowns = []
+        RecordingPool.last = self
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdowns.append((wait, cancel_futures))
+
+
+def test_closing_the_generator_cancels_pending_chunks(monkeypatch):
+    monkeypatch.setattr(elo_simulator, "ProcessPoolExecutor", RecordingPool)
+    progress = simulate_season(RATINGS, SCHEDULE, runs=3000, seed=5, workers=2, chunk_runs=500)
+    assert next(progress).runs == 500
+    progress.close()
+    # no waiting on chunks nobody will read
+    assert RecordingPool.last.shutdowns == [(False, True)]
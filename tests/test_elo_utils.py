@@ -0,0 +1,17 @@
+import json
+
+import elo_checkpoint
+import elo_utils
+
+
+def test_pipeline_without_checkpoints_keeps_published_ratings(tmp_path, monkeypatch):
+    path = str(tmp_path / "elo_history.json")
+    with open(path, "w") as f:
+        json.dump({"Boston Celtics": 1612.5}, f)
+    monkeypatch.setattr(elo_utils, "ELO_HISTORY_PATH", path)
+    monkeypatch.setattr(elo_checkpoint, "CHECKPOINT_DIR", tmp_path / "no_checkpoints")
+    assert elo_utils.load_elo_ratings(path)["Boston Celtics"] == 1612.5
+    elo_utils.run_elo_pipeline()
+    assert elo_utils.load_elo_ratings(path)["Boston Celtics"] == 1612.5
+    with open(path) as f:
+        assert json.load(f) == {"Boston Celtics": 1612.5}
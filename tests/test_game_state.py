@@ -0,0 +1,49 @@
+from game_state import GameStateStore
+
+
+def game(gid, home_score, away_score=0, state="in", **info):
+    return {
+        "sport": "NBA", "id": gid, "state": state, "info": info,
+        "home_team": {"name": f"Home {gid}", "score": home_score},
+        "away_team": {"name": f"Away {gid}", "score": away_score},
+    }
+
+
+def test_changes_since_merges_fields_per_game():
+    store = GameStateStore()
+    store.publish({"NBA": [game("1", 0), game("2", 0)]})
+    first = store.version
+    store.publish({"NBA": [game("1", 2), game("2", 0)]})
+    store.publish({"NBA": [game("1", 2, clock="4:00")]})
+    version, changes = store.changes_since(first)
+    assert version == store.version == first + 2
+    assert changes == {"NBA:1": {"score", "clock"}, "NBA:2": {"removed"}}
+    assert store.changes_since(first - 1) is None
+
+
+def test_changes_since_current_version_is_empty():
+    store = GameStateStore()
+    store.publish({"NBA": [game("1", 0)]})
+    assert store.changes_since(store.version) == (store.version, {})
+    # an unchanged poll doesn't move the version
+    store.publish({"NBA": [game("1", 0)]})
+    assert store.changes_since(store.version) == (1, {})
+
+
+def test_changes_since_past_the_history_needs_a_snapshot():
+    store = GameStateStore(history=3)
+    for score in range(5):
+        store.publish({"NBA": [game("1", score)]})
+    assert store.changes_since(0) is None
+    assert store.changes_since(2) is None
+    assert store.changes_since(3) == (store.version, {"NBA:1": {"score"}})
+
+
+def test_changes_since_never_serves_a_partly_dropped_version():
+    store = GameStateStore(history=3)
+    store.publish({"NBA": [game("1", 0), game("2", 0)]})
+    store.publish({"NBA": [game("1", 1), game("2", 1)]})
+    # version 1's first entry has been dropped from the log, its second is still there
+    assert store.changes_since(0) is None
+    assert store.changes_since(1) == (2, {"NBA:1": {"score"}, "NBA:2": {"score"}})
+    assert store.changes_since(2) == (2, {})
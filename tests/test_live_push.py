@@ -0,0 +1,45 @@
+from game_state import GameStateStore
+from live_push import DeltaFeed
+
+
+class Renderer:
+    def card(self, game):
+        return f"<div>{game['home_team']['score']}</div>"
+
+
+def game(gid, home_score):
+    return {
+        "sport": "NBA", "id": gid, "state": "in", "info": {},
+        "home_team": {"name": f"Home {gid}", "score": home_score},
+        "away_team": {"name": f"Away {gid}", "score": 0},
+    }
+
+
+def test_messages_after_returns_the_version_its_messages_cover():
+    store = GameStateStore()
+    feed = DeltaFeed(store, Renderer())
+    store.publish({"NBA": [game("1", 0)]})
+    feed._publish()
+    start = feed.version
+    store.publish({"NBA": [game("1", 2)]})
+    feed._publish()
+    version, messages = feed.messages_after(start)
+    assert version == feed.version == store.version
+    assert len(messages) == 1 and b"event: delta" in messages[0]
+    # a delta published after the read is left for the next call, not skipped
+    store.publish({"NBA": [game("1", 4)]})
+    feed._publish()
+    later, more = feed.messages_after(version)
+    assert later == store.version and len(more) == 1
+    assert feed.messages_after(later) == (later, [])
+
+
+def test_catch_up_falls_back_to_a_snapshot():
+    store = GameStateStore()
+    feed = DeltaFeed(store, Renderer())
+    store.publish({"NBA": [game("1", 0), game("2", 0)]})
+    feed._publish()
+    version, messages = feed.catch_up(None)
+    assert version == store.version
+    assert len(messages) == 1 and b"event: snapshot" in messages[0]
+    assert feed.catch_up(version + 5)[1][0].startswith(b"id: ")
@@ -0,0 +1,32 @@
+import sqlite3
+
+from persistence import BETTING_SCHEMA, Database
+
+
+def game(home, ml_home):
+    return {
+        "date": "2025-10-18", "league": "NBA", "home": home, "away": "BOS",
+        "elo_home": 1510, "elo_away": 1490, "market_ml_home": ml_home, "market_ml_away": 120,
+        "spread": -2.5, "total": 220.5, "value_edge_home": 0.01, "value_edge_away": -0.01,
+    }
+
+
+def test_unique_index_is_built_over_a_table_with_duplicates(tmp_path):
+    path = tmp_path / "odds.db"
+    conn = sqlite3.connect(path)
+    # a table saved to before the index existed
+    conn.execute(BETTING_SCHEMA["sqlite"][0])
+    for ml in (-110, -120, -130):
+        conn.execute(
+            "INSERT INTO betting_odds (game_date, league, home_team, away_team, market_ml_home) VALUES (?, ?, ?, ?, ?)",
+            ("2025-10-18", "NBA", "NYK", "BOS", ml),
+        )
+    conn.commit()
+    conn.close()
+
+    db = Database("sqlite", lambda: sqlite3.connect(path))
+    assert db.upsert_betting_odds([game("LAL", -150)]) == 1
+    assert db.upsert_betting_odds([game("NYK", -140)]) == 1
+    with db.connection() as conn:
+        rows = conn.execute("SELECT home_team, market_ml_home FROM betting_odds ORDER BY home_team").fetchall()
+    assert rows == [("LAL", -150), ("NYK", -140)]
@@ -0,0 +1,31 @@
+import threading
+import time
+
+import refresh_jobs
+from refresh_jobs import RefreshRunner
+
+
+def test_leagues_are_marked_done_as_they_finish(monkeypatch):
+    monkeypatch.setattr(refresh_jobs, "load_elo_ratings", lambda: {})
+    monkeypatch.setattr(refresh_jobs, "get_browser_pool", lambda: None)
+    release = threading.Event()
+
+    def refresh(league, pool, progress, elo_data=None):
+        if league == "NFL":
+            release.wait(5)
+        return [league]
+
+    runner = RefreshRunner(leagues=["NBA", "NFL"], refresh_fn=refresh, elo_fn=lambda: None)
+    runner.submit()
+    deadline = time.monotonic() + 5
+    while runner.status()["stages"]["NBA"] != "done" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    status = runner.status()
+    assert status["stages"]["NBA"] == "done"
+    assert status["state"] == "running"
+    assert runner.last_good("NBA") == ["NBA"]
+    release.set()
+    while runner.status()["state"] == "running" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert runner.status()["state"] == "succeeded"
+    assert runner.status()["stages"] == {"NBA": "done", "NFL": "done"}
@@ -0,0 +1,71 @@
+import pytest
+
+import scoreboard_poller
+from espn_client import SPORTS
+from poll_scheduler import LIVE_INTERVAL, RETRY_MAX_INTERVAL, PollScheduler
+from scoreboard_poller import MIN_WAIT, ScoreboardPoller
+
+
+def test_retry_backs_off_and_resets_on_success():
+    scheduler = PollScheduler(["hockey/nhl"])
+    delays = []
+    for _ in range(8):
+        scheduler.schedule_retry("hockey/nhl", 1000.0)
+        delays.append(scheduler.next_due() - 1000.0)
+    assert delays[:3] == [LIVE_INTERVAL, LIVE_INTERVAL * 2, LIVE_INTERVAL * 4]
+    assert max(delays) == RETRY_MAX_INTERVAL
+    scheduler.schedule("hockey/nhl", [{"state": "in"}], 1000.0)
+    scheduler.schedule_retry("hockey/nhl", 1000.0)
+    assert scheduler.next_due() - 1000.0 == LIVE_INTERVAL
+
+
+def failing_poller(monkeypatch, **kwargs):
+    fetches = []
+
+    def fetch_all_leagues(sports, base_url=None):
+        fetches.append(list(sports))
+        return {sport_path: ({"events": []}, True) for sport_path in sports}
+
+    def normalize_events(league, data, today):
+        raise ValueError("bad payload")
+
+    monkeypatch.setattr(scoreboard_poller, "fetch_all_leagues", fetch_all_leagues)
+    monkeypatch.setattr(scoreboard_poller, "normalize_events", normalize_events)
+    clock = [1000.0]
+    poller = ScoreboardPoller(clock=lambda: clock[0], **kwargs)
+    return poller, fetches, clock
+
+
+def failed_poll(poller):
+    with pytest.raises(ValueError):
+        poller.poll_once()
+
+
+def test_failing_poll_reschedules_every_due_league(monkeypatch):
+    poller, fetches, clock = failing_poller(monkeypatch)
+    failed_poll(poller)
+    assert fetches == [SPORTS]
+    assert poller.scheduler.due(clock[0]) == []
+    assert poller.next_wait() == LIVE_INTERVAL
+    assert poller.polls == 0
+
+
+def test_failing_polls_back_off(monkeypatch):
+    poller, fetches, clock = failing_poller(monkeypatch)
+    waits = []
+    for _ in range(7):
+        failed_poll(poller)
+        waits.append(poller.next_wait())
+        # nothing is due before the computed wait is up
+        clock[0] += waits[-1] - 0.5
+        poller.poll_once()
+        clock[0] += 0.5
+    assert waits == [min(LIVE_INTERVAL * 2 ** i, RETRY_MAX_INTERVAL) for i in range(7)]
+    assert len(fetches) == 7
+
+
+def test_zero_interval_still_waits_the_floor(monkeypatch):
+    poller, fetches, clock = failing_poller(monkeypatch, interval=0)
+    failed_poll(poller)
+    assert poller.scheduler.due(clock[0]) == SPORTS
+    assert poller.next_wait() == MIN_WAIT
@@ -0,0 +1,53 @@
+import json
+from datetime import datetime
+
+from scoreboard_recorder import INDEX, ScoreboardLog, ScoreboardRecorder, open_night, redate
+
+NBA_URL = "http://espn.test/basketball/nba/scoreboard"
+
+
+def test_seek_after_torn_write(tmp_path):
+    log = ScoreboardLog(tmp_path, "nba")
+    for i in range(5):
+        log.append(f"frame {i}".encode(), timestamp=100.0 + i)
+    # a crash between the frame and a whole index entry
+    with open(log.log_path, "ab") as f:
+        f.write(b"\x00" * 11)
+    with open(log.index_path, "ab") as f:
+        f.write(INDEX.pack(105.0, 0, 0)[:7])
+
+    reader = ScoreboardLog(tmp_path, "nba")
+    reader.refresh()
+    assert len(reader) == 5
+    assert reader.at(103.5) == (3, 103.0, b"frame 3")
+    assert reader.at(99.0) is None
+
+    writer = ScoreboardLog(tmp_path, "nba")
+    writer.append(b"frame 6", timestamp=106.0)
+    reader.refresh()
+    assert len(reader) == 6
+    assert reader.at(1000.0) == (5, 106.0, b"frame 6")
+    assert reader.at(104.0)[2] == b"frame 4"
+
+
+def test_frames_after_midnight_stay_with_their_slate(tmp_path):
+    recorder = ScoreboardRecorder(tmp_path)
+    body = json.dumps({"day": {"date": "2025-10-18"}, "events": []}).encode()
+    recorder(NBA_URL, body, timestamp=datetime(2025, 10, 18, 22, 0).timestamp())
+    recorder(NBA_URL, body, timestamp=datetime(2025, 10, 19, 1, 30).timestamp())
+    recorder(NBA_URL + "?dates=20251017", b'{"events": []}', timestamp=datetime(2025, 10, 19, 2, 0).timestamp())
+    assert len(open_night(tmp_path / "2025-10-18")["nba"]) == 2
+    assert len(open_night(tmp_path / "2025-10-17")["nba"]) == 1
+    assert not (tmp_path / "2025-10-19").exists()
+
+
+def test_redate_moves_the_whole_slate():
+    body = json.dumps({"day": {"date": "2025-10-18"}, "events": [
+        {"date": "2025-10-18T23:00Z", "competitions": [{"date": "2025-10-18T23:00Z"}]},
+        {"date": "2025-10-19T02:30Z"},
+    ]}).encode()
+    data = json.loads(redate(body, "2025-10-18", "2026-03-01"))
+    assert data["day"]["date"] == "2026-03-01"
+    assert [e["date"] for e in data["events"]] == ["2026-03-01T23:00Z", "2026-03-02T02:30Z"]
+    assert data["events"][0]["competitions"][0]["date"] == "2026-03-01T23:00Z"
+    assert redate(body, "2025-10-18", "2025-10-18") == body
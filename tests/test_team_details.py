@@ -0,0 +1,29 @@
+from team_details import TeamDetailService
+
+
+def game(home, away):
+    return {"sport": "nba", "home_team": {"name": home}, "away_team": {"name": away}}
+
+
+def test_prefetch_does_not_count_as_cache_hits():
+    fetched = []
+    service = TeamDetailService(fetch=lambda league, team_id: fetched.append(team_id) or {"id": team_id})
+    slate = [game("Boston Celtics", "New York Knicks")]
+    for _ in range(5):
+        for future in service.prefetch(slate):
+            future.result(5)
+    assert sorted(fetched) == ["bos", "ny"]
+    assert service.fetches == 2
+    assert service.hits == 0
+    service.get("NBA", "bos", timeout=5)
+    assert service.hits == 1
+
+
+def test_detail_cache_is_bounded():
+    service = TeamDetailService(fetch=lambda league, team_id: {"id": team_id}, max_teams=3)
+    for team_id in ("a", "b", "c", "d"):
+        service.get("nba", team_id, timeout=5)
+    service.get("nba", "b", timeout=5)
+    service.get("nba", "e", timeout=5)
+    assert service.peek("nba", "a") is None and service.peek("nba", "c") is None
+    assert [service.peek("nba", t)["id"] for t in ("b", "d", "e")] == ["b", "d", "e"]
@@ -0,0 +1,10 @@
+from team_mapping import get_team_mapping
+
+
+def test_team_mapping_keeps_raw_names():
+    mapping = get_team_mapping("mlb")
+    for spelling in ("New York Yankees", "NYY", "NYA", "new york yankees", "yankees"):
+        assert mapping.get(spelling, spelling) == "New York Yankees"
+    assert mapping["Boston Red Sox"] == "Boston Red Sox"
+    assert mapping["Tampa Bay Devil Rays"] == "Tampa Bay Rays"
+    assert mapping.get("Team 001", "Team 001") == "Team 001"